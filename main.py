@@ -2,24 +2,13 @@
 """
 Expense Tracker - Main Entry Point
 
-A CLI application for tracking personal expenses.
+A CLI application for tracking personal expenses. The interface lives in
+src.ui.cli so that its bytecode is cached; Python recompiles the script it
+is started with on every run.
 """
-from src.storage.expense_storage import ExpenseStorage
-from src.ui.menu import ExpenseTrackerMenu
-
-
-def main():
-    """Main entry point for the expense tracker application."""
-    try:
-        storage = ExpenseStorage("data")
-        menu = ExpenseTrackerMenu(storage)
-        menu.run()
-    except KeyboardInterrupt:
-        print("\n\nApplication interrupted. Goodbye!")
-    except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
-        print("Please check your configuration and try again.")
+import sys
+from src.ui.cli import main
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
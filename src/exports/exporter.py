@@ -0,0 +1,145 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+
+FORMATS = ("csv", "jsonl")
+CSV_FIELDS = ("id", "date", "category", "amount", "description", "created_at")
+
+
+class ExportResult:
+    """Row count and timing of an export."""
+
+    def __init__(self):
+        """Initialize an empty result."""
+        self.rows = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        """float: Rows written per second."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return f"ExportResult(rows={self.rows}, elapsed={self.elapsed:.3f})"
+
+
+def export_expenses(storage, output, file_format=None, compress=None, cents=False, **filters):
+    """
+    Stream expenses from storage to a CSV or JSON lines file.
+
+    Records are pulled one at a time from storage.iter_expenses and written
+    straight out, so memory stays constant however many expenses match. A
+    file is written under a temporary name and renamed into place when
+    complete, so a failed export never leaves a truncated file behind.
+
+    Args:
+        storage: Storage backend exposing iter_expenses
+        output (str or Path or file): Destination path, "-" for standard
+            output, or an open text file
+        file_format (str, optional): "csv" or "jsonl"; guessed from the file
+            extension (ignoring ".gz") when omitted, else "csv"
+        compress (bool, optional): gzip the output. Defaults to True for
+            paths ending in ".gz"
+        cents (bool): Write amounts as an integer amount_cents field
+        **filters: Passed to iter_expenses (category, start_date, end_date,
+            min_amount, max_amount, created_from, created_to)
+
+    Returns:
+        ExportResult: Number of rows and time taken
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    path = None if hasattr(output, "write") or output == "-" else Path(output)
+    if file_format is None:
+        suffixes = [suffix for suffix in (path.suffixes if path else []) if suffix != ".gz"]
+        file_format = suffixes[-1].lstrip(".") if suffixes else "csv"
+    file_format = file_format.lower()
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+    if compress is None:
+        compress = path is not None and path.suffix == ".gz"
+
+    result = ExportResult()
+    started = time.perf_counter()
+    expenses = storage.iter_expenses(**filters)
+
+    if path is None:
+        stream = sys.stdout if output == "-" else output
+        result.rows = _write_records(stream, expenses, file_format, cents)
+    else:
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            if compress:
+                handle = gzip.open(tmp_path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+            else:
+                handle = open(tmp_path, 'w', encoding='utf-8', newline='')
+            with handle:
+                result.rows = _write_records(handle, expenses, file_format, cents)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _write_records(stream, expenses, file_format, cents):
+    rows = 0
+    if file_format == "jsonl":
+        dumps = json.dumps
+        for expense in expenses:
+            stream.write(dumps(expense.to_dict(cents)) + "\n")
+            rows += 1
+        return rows
+
+    fields = [("amount_cents" if cents and field == "amount" else field) for field in CSV_FIELDS]
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+    for expense in expenses:
+        data = expense.to_dict(cents)
+        writer.writerow([data[field] for field in fields])
+        rows += 1
+    return rows
+
+
+def main(argv=None):
+    """Export expenses to CSV or JSON lines."""
+    from src.storage.backends import STORAGE_BACKENDS, create_storage
+
+    parser = argparse.ArgumentParser(description="Stream expenses to CSV or JSON lines.")
+    parser.add_argument("output", help="output file (.csv, .jsonl, optionally .gz) or - for stdout")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the extension)")
+    parser.add_argument("--gzip", action="store_true", default=None, help="gzip the output")
+    parser.add_argument("--backend", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="storage backend to export from (default: json)")
+    parser.add_argument("--data-dir", default="data",
+                        help="directory holding the expense data (default: data)")
+    parser.add_argument("--category", help="only this category")
+    parser.add_argument("--start-date", help="earliest date, YYYY-MM-DD")
+    parser.add_argument("--end-date", help="latest date, YYYY-MM-DD")
+    parser.add_argument("--min-amount", type=float, help="smallest amount")
+    parser.add_argument("--max-amount", type=float, help="largest amount")
+    parser.add_argument("--cents", action="store_true", help="write amounts as integer cents")
+    args = parser.parse_args(argv)
+
+    storage = create_storage(args.backend, args.data_dir)
+    result = export_expenses(storage, args.output, args.format, args.gzip, cents=args.cents,
+                             category=args.category, start_date=args.start_date,
+                             end_date=args.end_date, min_amount=args.min_amount,
+                             max_amount=args.max_amount)
+    if args.output != "-":
+        print(f"Exported {result.rows:,} expenses to {args.output} in {result.elapsed:.1f}s "
+              f"({result.rows_per_second:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from src.imports.readers import read_csv, read_ofx
+from src.models.expense import Expense
+from src.models.id_generator import derive_expense_id
+from src.models.money import from_cents
+from src.utils.validators import validate_expense_rows
+
+
+FORMATS = ("csv", "ofx")
+
+
+class ImportResult:
+    """
+    Running totals of a statement import.
+
+    Only the first max_errors row errors are kept; error_count counts them all.
+    """
+
+    def __init__(self, max_errors=100):
+        """
+        Initialize an empty result.
+
+        Args:
+            max_errors (int): Number of row errors to keep for reporting
+        """
+        self.rows_read = 0
+        self.imported = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+        self.elapsed = 0.0
+        self.max_errors = max_errors
+
+    def add_error(self, row_number, field, message):
+        """
+        Record an invalid source row.
+
+        Args:
+            row_number (int): 1-based data row in the source file
+            field (str): Field that failed validation or storage
+            message (str): Why it failed
+        """
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row_number, field, message))
+
+    @property
+    def rows_per_second(self):
+        """float: Source rows processed per second so far."""
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f"ImportResult(rows_read={self.rows_read}, imported={self.imported}, "
+                f"skipped={self.skipped}, errors={self.error_count})")
+
+
+class StatementImporter:
+    """
+    Streaming import of bank statements into any storage backend.
+
+    Rows are read lazily and processed in chunks. Each chunk is validated
+    column by column with validate_expense_rows, mapped onto expenses and
+    written with one save_expenses call, so memory is bounded by the chunk
+    size whatever the file size. After every chunk a checkpoint records the
+    byte offset reached; an interrupted import started again with the same
+    checkpoint continues from there. Expense IDs are derived from the source
+    file, the time the import started (kept in the checkpoint) and the row
+    number, so a chunk replayed after a crash between its write and its
+    checkpoint overwrites the same expenses instead of duplicating them.
+    """
+
+    def __init__(self, storage, chunk_size=1000, default_category="Uncategorized",
+                 date_format=None, cents=False, progress=None):
+        """
+        Initialize the importer.
+
+        Args:
+            storage: Storage backend exposing save_expenses
+            chunk_size (int): Rows validated and written together
+            default_category (str): Category for rows without one
+            date_format (str, optional): strptime format of the source dates
+                when they are not YYYY-MM-DD, e.g. "%m/%d/%Y"
+            cents (bool): Validate amounts to whole cents
+            progress (callable, optional): Called with the ImportResult after
+                every chunk
+        """
+        self.storage = storage
+        self.chunk_size = max(1, chunk_size)
+        self.default_category = default_category
+        self.date_format = date_format
+        self.cents = cents
+        self.progress = progress
+        self._dates = {}
+
+    def import_file(self, path, file_format=None, column_map=None, debits_negative=None,
+                    checkpoint_path=None):
+        """
+        Import a CSV or OFX statement.
+
+        Args:
+            path (str or Path): Statement file
+            file_format (str, optional): "csv" or "ofx"; guessed from the
+                extension when omitted
+            column_map (dict, optional): Expense field to CSV column name
+            debits_negative (bool, optional): Amounts below zero are expenses
+                and everything else is skipped as a credit. Defaults to True
+                for OFX and False for CSV.
+            checkpoint_path (str or Path, optional): File recording progress.
+                It is removed once the import completes.
+
+        Returns:
+            ImportResult: Counts, timing and the first row errors
+
+        Raises:
+            ValueError: If the format is unknown or a mapped column is missing
+        """
+        path = Path(path)
+        file_format = (file_format or path.suffix.lstrip(".")).lower()
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown import format: {file_format}")
+        if debits_negative is None:
+            debits_negative = file_format == "ofx"
+
+        result = ImportResult()
+        offset, started_ms = self._resume(path, checkpoint_path, result)
+        if started_ms is None:
+            started_ms = int(time.time() * 1000)
+            # Record the start before any row is written, so a crash in the
+            # first chunk is replayed with the same IDs.
+            self._checkpoint(path, checkpoint_path, 0, result, started_ms)
+        ids = (started_ms, json.dumps(self._source_signature(path)))
+        if file_format == "csv":
+            rows = read_csv(path, column_map, offset=offset)
+        else:
+            rows = read_ofx(path, offset=offset)
+
+        started = time.perf_counter() - result.elapsed
+        chunk = []
+        for row, next_offset in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, debits_negative, result, ids)
+                result.elapsed = time.perf_counter() - started
+                self._report(result)
+                self._checkpoint(path, checkpoint_path, next_offset, result, started_ms)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, debits_negative, result, ids)
+            result.elapsed = time.perf_counter() - started
+            self._report(result)
+        result.elapsed = time.perf_counter() - started
+
+        if checkpoint_path is not None and Path(checkpoint_path).exists():
+            os.remove(checkpoint_path)
+        return result
+
+    def _import_chunk(self, chunk, debits_negative, result, ids):
+        first_row = result.rows_read + 1
+        result.rows_read += len(chunk)
+
+        rows, row_numbers = [], []
+        for number, row in enumerate(chunk, first_row):
+            if debits_negative:
+                amount = (row.get("amount") or "").strip()
+                if not amount.startswith("-"):
+                    result.skipped += 1
+                    continue
+                row["amount"] = amount[1:]
+            if not (row.get("category") or "").strip():
+                row["category"] = self.default_category
+            if self.date_format and row.get("date"):
+                row["date"] = self._convert_date(row["date"])
+            rows.append(row)
+            row_numbers.append(number)
+
+        report = validate_expense_rows(rows, self.cents)
+        for index, field, message in report.errors:
+            result.add_error(row_numbers[index], field, message)
+
+        started_ms, source = ids
+        created_at = datetime.fromtimestamp(started_ms / 1000).isoformat()
+        valid = []
+        for number, values in zip(row_numbers, report.values):
+            if values is None:
+                continue
+            if self.cents:
+                values["amount"] = from_cents(values["amount"])
+            values["id"] = derive_expense_id(started_ms, number, source)
+            values["created_at"] = created_at
+            valid.append(values)
+        expenses = Expense.from_dicts(valid)
+
+        if expenses:
+            saved = self.storage.save_expenses(expenses)
+            result.imported += len(saved.saved)
+            for expense_id, message in saved.failed:
+                result.add_error(None, "storage", f"{expense_id}: {message}")
+
+    def _report(self, result):
+        if self.progress is not None:
+            self.progress(result)
+
+    def _convert_date(self, value):
+        converted = self._dates.get(value)
+        if converted is None:
+            try:
+                converted = datetime.strptime(value.strip(), self.date_format).strftime("%Y-%m-%d")
+            except ValueError:
+                converted = value
+            self._dates[value] = converted
+        return converted
+
+    def _resume(self, path, checkpoint_path, result):
+        if checkpoint_path is None or not Path(checkpoint_path).exists():
+            return 0, None
+
+        try:
+            with open(checkpoint_path, 'r') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Ignoring unreadable checkpoint {checkpoint_path}: {e}", file=sys.stderr)
+            return 0, None
+
+        if state.get("source") != self._source_signature(path):
+            print(f"Warning: Checkpoint {checkpoint_path} is for a different file; starting over", file=sys.stderr)
+            return 0, None
+
+        result.rows_read = state["rows_read"]
+        result.imported = state["imported"]
+        result.skipped = state["skipped"]
+        result.error_count = state["error_count"]
+        result.elapsed = state["elapsed"]
+        return state["offset"], state.get("started_ms")
+
+    def _checkpoint(self, path, checkpoint_path, offset, result, started_ms):
+        if checkpoint_path is None:
+            return
+
+        state = {
+            "source": self._source_signature(path),
+            "offset": offset,
+            "rows_read": result.rows_read,
+            "imported": result.imported,
+            "skipped": result.skipped,
+            "error_count": result.error_count,
+            "elapsed": result.elapsed,
+            "started_ms": started_ms,
+        }
+        checkpoint_path = Path(checkpoint_path)
+        tmp_path = checkpoint_path.with_name(f".{checkpoint_path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+
+    @staticmethod
+    def _source_signature(path):
+        stat = os.stat(path)
+        return [str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns]
+
+
+def _parse_column_map(pairs):
+    column_map = {}
+    for pair in pairs or []:
+        field, separator, column = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Column mapping must look like field=Column: {pair}")
+        column_map[field.strip()] = column
+    return column_map
+
+
+def main(argv=None):
+    """Import a CSV or OFX bank statement."""
+    from src.storage.backends import STORAGE_BACKENDS, create_storage
+
+    parser = argparse.ArgumentParser(description="Import a CSV or OFX bank statement.")
+    parser.add_argument("path", help="statement file")
+    parser.add_argument("--format", choices=FORMATS, help="file format (default: from the extension)")
+    parser.add_argument("--backend", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="storage backend to import into (default: json)")
+    parser.add_argument("--data-dir", default="data",
+                        help="directory holding the expense data (default: data)")
+    parser.add_argument("--map", action="append", metavar="FIELD=COLUMN",
+                        help="CSV column for amount, category, description or date (repeatable)")
+    parser.add_argument("--date-format", help="strptime format of the source dates, e.g. %%m/%%d/%%Y")
+    parser.add_argument("--debits-negative", action="store_true", default=None,
+                        help="treat negative amounts as expenses and skip credits (always on for OFX)")
+    parser.add_argument("--category", default="Uncategorized",
+                        help="category for rows without one (default: Uncategorized)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="rows validated and written together (default: 1000)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: PATH.checkpoint)")
+    args = parser.parse_args(argv)
+
+    def report_progress(result):
+        print(f"{result.rows_read:,} rows read, {result.imported:,} imported "
+              f"({result.rows_per_second:,.0f} rows/s)")
+
+    storage = create_storage(args.backend, args.data_dir)
+    importer = StatementImporter(storage, chunk_size=args.chunk_size, default_category=args.category,
+                                 date_format=args.date_format, progress=report_progress)
+    try:
+        result = importer.import_file(args.path, args.format, _parse_column_map(args.map),
+                                      debits_negative=args.debits_negative,
+                                      checkpoint_path=args.checkpoint or f"{args.path}.checkpoint")
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Imported {result.imported:,} of {result.rows_read:,} rows in {result.elapsed:.1f}s "
+          f"({result.rows_per_second:,.0f} rows/s); {result.skipped:,} credits skipped, "
+          f"{result.error_count:,} invalid")
+    for row_number, field, message in result.errors:
+        print(f"  row {row_number}: {field}: {message}")
+
+
+if __name__ == "__main__":
+    main()
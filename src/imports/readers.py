@@ -0,0 +1,124 @@
+import csv
+import re
+
+
+EXPENSE_FIELDS = ("amount", "category", "description", "date")
+OFX_TAG_PATTERN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def read_csv(path, column_map=None, offset=0, delimiter=",", encoding="utf-8"):
+    """
+    Stream rows of a CSV statement as expense field dictionaries.
+
+    The file is read one record at a time and every row is yielded together
+    with the byte offset just past it, so an import can be resumed by passing
+    that offset back in. The header is always read from the start of the file.
+
+    Args:
+        path (str or Path): CSV file with a header row
+        column_map (dict, optional): Expense field to CSV column name. Fields
+            not mapped are looked up by their own name, case-insensitively.
+        offset (int): Byte offset to resume from; 0 starts after the header
+        delimiter (str): Field delimiter
+        encoding (str): Text encoding; a UTF-8 byte order mark is ignored
+
+    Yields:
+        tuple: (row, next_offset) where row maps EXPENSE_FIELDS to raw strings
+        or None
+
+    Raises:
+        ValueError: If a mapped column is missing from the header
+    """
+    with open(path, 'rb') as f:
+        position = [0]
+        reader = csv.reader(_tracked_lines(f, position, encoding), delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        header[0] = header[0].lstrip("\ufeff")
+        columns = _resolve_columns(header, column_map or {})
+
+        if offset > position[0]:
+            f.seek(offset)
+            position[0] = offset
+
+        for record in reader:
+            if not any(field.strip() for field in record):
+                continue
+            row = {field: (record[index] if index is not None and index < len(record) else None)
+                   for field, index in columns.items()}
+            yield row, position[0]
+
+
+def read_ofx(path, offset=0, encoding="latin-1"):
+    """
+    Stream the transactions of an OFX statement as expense field dictionaries.
+
+    Both SGML (OFX 1.x, unclosed leaf tags) and XML (OFX 2.x) files are
+    understood. Each <STMTTRN> block becomes one row: DTPOSTED gives the
+    date, TRNAMT the signed amount and NAME (or MEMO) the description. OFX
+    has no category, so the category is left empty.
+
+    Args:
+        path (str or Path): OFX file
+        offset (int): Byte offset to resume from
+        encoding (str): Text encoding of the file
+
+    Yields:
+        tuple: (row, next_offset) where row maps EXPENSE_FIELDS to raw strings
+        or None
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        position = offset
+        transaction = None
+        for raw in iter(f.readline, b""):
+            line = raw.decode(encoding)
+            line_start = position
+            position += len(raw)
+
+            for match in OFX_TAG_PATTERN.finditer(line):
+                closing, tag, value = match.group(1), match.group(2).upper(), match.group(3).strip()
+                if tag == "STMTTRN":
+                    if not closing:
+                        transaction = {}
+                    elif transaction is not None:
+                        end = line_start + len(line[:match.end()].encode(encoding))
+                        yield _ofx_row(transaction), end
+                        transaction = None
+                elif transaction is not None and not closing:
+                    transaction[tag] = value
+
+
+def _ofx_row(transaction):
+    posted = transaction.get("DTPOSTED", "")
+    date = f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else posted
+    return {
+        "amount": transaction.get("TRNAMT"),
+        "category": None,
+        "description": transaction.get("NAME") or transaction.get("MEMO"),
+        "date": date,
+    }
+
+
+def _tracked_lines(f, position, encoding):
+    for raw in iter(f.readline, b""):
+        position[0] += len(raw)
+        yield raw.decode(encoding)
+
+
+def _resolve_columns(header, column_map):
+    lookup = {name.strip().lower(): index for index, name in enumerate(header)}
+    unknown = set(column_map) - set(EXPENSE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown expense field in column map: {', '.join(sorted(unknown))}")
+    columns = {}
+    for field in EXPENSE_FIELDS:
+        name = column_map.get(field)
+        if name is None:
+            columns[field] = lookup.get(field)
+            continue
+        if name.strip().lower() not in lookup:
+            raise ValueError(f"Column '{name}' mapped to {field} is not in the CSV header")
+        columns[field] = lookup[name.strip().lower()]
+    return columns
@@ -1,9 +1,11 @@
 from datetime import datetime
-import random
-import string
+from src.models.id_generator import generate_expense_id
+from src.models.money import amount_from_dict, to_cents
 
 
 class Expense:
+    __slots__ = ("amount", "category", "description", "date", "id", "created_at")
+
     def __init__(self, amount, category, description, date=None, expense_id=None, created_at=None):
         """
         Initialize an Expense instance.
@@ -31,26 +33,36 @@ class Expense:
         """
         Generate a unique expense ID.
 
-        Format: exp_YYYYMMDD_HHMMSS_<6char_hash>
+        Format: exp_YYYYMMDD_HHMMSS_<mmm><4char_counter><4char_random>
+
+        IDs are monotonic within a process, so sorting them as strings
+        sorts them by creation time.
 
         Returns:
             str: Unique expense ID
         """
-        now = datetime.now()
-        timestamp = now.strftime("%Y%m%d_%H%M%S")
-        random_hash = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-        return f"exp_{timestamp}_{random_hash}"
+        return generate_expense_id()
+
+    @property
+    def amount_cents(self):
+        """int: The amount as an exact whole number of cents."""
+        return to_cents(self.amount)
 
-    def to_dict(self):
+    def to_dict(self, cents=False):
         """
         Convert expense to dictionary for JSON serialization.
 
+        Args:
+            cents (bool): Store the amount as an integer "amount_cents" field
+                instead of a float "amount"
+
         Returns:
             dict: Dictionary representation of the expense
         """
+        amount_field, amount = ("amount_cents", self.amount_cents) if cents else ("amount", self.amount)
         return {
             "id": self.id,
-            "amount": self.amount,
+            amount_field: amount,
             "category": self.category,
             "description": self.description,
             "date": self.date,
@@ -58,18 +70,30 @@ class Expense:
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, strict=True):
         """
         Create an Expense instance from a dictionary.
 
+        Either amount format is accepted: a float "amount" or an integer
+        "amount_cents".
+
         Args:
             data (dict): Dictionary containing expense data
+            strict (bool): Validate through __init__. Pass False for records the
+                storage layer wrote itself to skip validation.
 
         Returns:
             Expense: New Expense instance
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If strict and the amount is not positive
         """
+        if not strict:
+            return cls._from_trusted(data, None)
+
         return cls(
-            amount=data["amount"],
+            amount=amount_from_dict(data),
             category=data["category"],
             description=data["description"],
             date=data.get("date"),
@@ -77,6 +101,53 @@ class Expense:
             created_at=data.get("created_at")
         )
 
+    @classmethod
+    def from_dicts(cls, records, strict=False):
+        """
+        Create Expense instances from many dictionaries.
+
+        Trusted by default: amounts are not re-validated and a single clock
+        reading is shared by every record that lacks a date or created_at.
+
+        Args:
+            records (iterable[dict]): Dictionaries containing expense data
+            strict (bool): Validate every record through __init__, for input
+                that did not come from storage
+
+        Returns:
+            list[Expense]: New Expense instances, in input order
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If strict and an amount is not positive
+        """
+        if strict:
+            return [cls.from_dict(data) for data in records]
+
+        expenses = []
+        now = None
+        for data in records:
+            if now is None and not (data.get("date") and data.get("created_at")):
+                now = datetime.now()
+            expenses.append(cls._from_trusted(data, now))
+        return expenses
+
+    @classmethod
+    def _from_trusted(cls, data, now):
+        expense = cls.__new__(cls)
+        expense.amount = float(amount_from_dict(data))
+        expense.category = data["category"]
+        expense.description = data["description"]
+
+        date = data.get("date")
+        created_at = data.get("created_at")
+        if now is None and not (date and created_at):
+            now = datetime.now()
+        expense.date = date or now.strftime("%Y-%m-%d")
+        expense.id = data.get("id") or cls.generate_id()
+        expense.created_at = created_at or now.isoformat()
+        return expense
+
     def __str__(self):
         """
         String representation for display.
@@ -0,0 +1,305 @@
+import sys
+from array import array
+from datetime import datetime
+from src.models.expense import Expense
+from src.models.money import amount_from_dict, from_cents, to_cents
+
+
+class ExpenseBatch:
+    """
+    Columnar container holding many expenses in parallel arrays.
+
+    Amounts live in a packed ``array('d')``, or an ``array('q')`` of whole
+    cents in cents mode so sums are exact integer arithmetic. Categories are stored as
+    ``array('I')`` codes into a table of interned names. Dates are interned
+    too, so the thousands of rows sharing a day share one string. IDs,
+    descriptions and creation timestamps are plain lists. Rows are handed out
+    as lightweight ExpenseRow views that read from the columns on demand.
+    """
+
+    __slots__ = ("cents", "amounts", "category_codes", "categories", "dates", "ids",
+                 "descriptions", "created_ats", "_category_lookup", "_dates")
+
+    def __init__(self, cents=False):
+        """
+        Initialize an empty batch.
+
+        Args:
+            cents (bool): Keep amounts as int64 cents instead of float64
+        """
+        self.cents = cents
+        self.amounts = array('q' if cents else 'd')
+        self.category_codes = array('I')
+        self.categories = []
+        self.dates = []
+        self.ids = []
+        self.descriptions = []
+        self.created_ats = []
+        self._category_lookup = {}
+        self._dates = {}
+
+    @classmethod
+    def from_expenses(cls, expenses, cents=False):
+        """
+        Build a batch from Expense objects.
+
+        Args:
+            expenses (iterable[Expense]): Expenses to copy into the batch
+            cents (bool): Keep amounts as int64 cents
+
+        Returns:
+            ExpenseBatch: New batch
+        """
+        batch = cls(cents)
+        for expense in expenses:
+            batch.append(expense)
+        return batch
+
+    @classmethod
+    def from_dicts(cls, records, cents=False):
+        """
+        Build a batch from expense dictionaries without creating Expense objects.
+
+        Args:
+            records (iterable[dict]): Dictionaries as produced by Expense.to_dict
+            cents (bool): Keep amounts as int64 cents
+
+        Returns:
+            ExpenseBatch: New batch
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If an amount is not positive
+        """
+        batch = cls(cents)
+        for data in records:
+            batch.append_dict(data)
+        return batch
+
+    def append(self, expense):
+        """
+        Add an expense to the end of the batch.
+
+        Args:
+            expense (Expense): The expense to add
+        """
+        amount = expense.amount_cents if self.cents else expense.amount
+        self._append_row(expense.id, amount, expense.category, expense.description,
+                         expense.date, expense.created_at)
+
+    def append_dict(self, data):
+        """
+        Add an expense dictionary, applying the same rules as Expense.from_dict.
+
+        Args:
+            data (dict): Dictionary as produced by Expense.to_dict
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If the amount is not positive
+        """
+        amount = amount_from_dict(data)
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero")
+        if self.cents:
+            amount = data["amount_cents"] if "amount_cents" in data else to_cents(amount)
+
+        now = None
+        date = data.get("date")
+        created_at = data.get("created_at")
+        if not date or not created_at:
+            now = datetime.now()
+
+        self._append_row(
+            data.get("id") or Expense.generate_id(),
+            amount,
+            data["category"],
+            data["description"],
+            date or now.strftime("%Y-%m-%d"),
+            created_at or now.isoformat()
+        )
+
+    def _append_row(self, expense_id, amount, category, description, date, created_at):
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(sys.intern(category))
+            self._category_lookup[category] = code
+
+        self.ids.append(expense_id)
+        self.amounts.append(amount)
+        self.category_codes.append(code)
+        self.descriptions.append(description)
+        self.dates.append(self._dates.setdefault(date, date))
+        self.created_ats.append(created_at)
+
+    def amount(self, row):
+        """
+        Get the amount of a row.
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            float: Amount in currency units
+        """
+        amount = self.amounts[row]
+        return from_cents(amount) if self.cents else amount
+
+    def category(self, row):
+        """
+        Get the category name of a row.
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            str: Category name
+        """
+        return self.categories[self.category_codes[row]]
+
+    def total(self):
+        """
+        Sum every amount.
+
+        Returns:
+            float: Grand total
+        """
+        if self.cents:
+            return from_cents(self.total_cents())
+        return sum(self.amounts)
+
+    def total_cents(self):
+        """
+        Sum every amount exactly in cents.
+
+        Returns:
+            int: Grand total in cents
+        """
+        if self.cents:
+            return sum(self.amounts)
+        return sum(to_cents(amount) for amount in self.amounts)
+
+    def category_totals(self):
+        """
+        Count and sum amounts per category.
+
+        Returns:
+            dict: Mapping of category to (count, total), ordered by category
+        """
+        counts = [0] * len(self.categories)
+        sums = [0] * len(self.categories)
+        for code, amount in zip(self.category_codes, self.amounts):
+            counts[code] += 1
+            sums[code] += amount
+
+        if self.cents:
+            sums = [from_cents(total) for total in sums]
+        else:
+            sums = [float(total) for total in sums]
+
+        return {
+            category: (counts[code], sums[code])
+            for code, category in sorted(enumerate(self.categories), key=lambda item: item[1])
+        }
+
+    def to_expenses(self):
+        """
+        Materialize every row as an Expense object.
+
+        Returns:
+            list[Expense]: Expenses in batch order
+        """
+        return [row.to_expense() for row in self]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("batch index out of range")
+        return ExpenseRow(self, row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield ExpenseRow(self, row)
+
+
+class ExpenseRow:
+    """
+    Read-only view of one row in an ExpenseBatch.
+
+    Exposes the same attributes as Expense so display code can use either.
+    """
+
+    __slots__ = ("_batch", "_row")
+
+    def __init__(self, batch, row):
+        """
+        Initialize the view.
+
+        Args:
+            batch (ExpenseBatch): The batch holding the data
+            row (int): Row number in the batch
+        """
+        self._batch = batch
+        self._row = row
+
+    @property
+    def id(self):
+        return self._batch.ids[self._row]
+
+    @property
+    def amount(self):
+        return self._batch.amount(self._row)
+
+    @property
+    def amount_cents(self):
+        amount = self._batch.amounts[self._row]
+        return amount if self._batch.cents else to_cents(amount)
+
+    @property
+    def category(self):
+        return self._batch.category(self._row)
+
+    @property
+    def description(self):
+        return self._batch.descriptions[self._row]
+
+    @property
+    def date(self):
+        return self._batch.dates[self._row]
+
+    @property
+    def created_at(self):
+        return self._batch.created_ats[self._row]
+
+    def to_dict(self):
+        """
+        Convert the row to the Expense dictionary format.
+
+        Returns:
+            dict: Dictionary representation of the expense
+        """
+        return {
+            "id": self.id,
+            "amount": self.amount,
+            "category": self.category,
+            "description": self.description,
+            "date": self.date,
+            "created_at": self.created_at
+        }
+
+    def to_expense(self):
+        """
+        Materialize the row as an Expense object.
+
+        Returns:
+            Expense: New Expense instance
+        """
+        return Expense.from_dict(self.to_dict(), strict=False)
+
+    def __str__(self):
+        return f"{self.date} | {self.category:15} | ${self.amount:8.2f} | {self.description}"
@@ -0,0 +1,117 @@
+import hashlib
+import random
+import string
+import threading
+import time
+from datetime import datetime, timezone
+
+
+ALPHABET = string.digits + string.ascii_lowercase
+COUNTER_WIDTH = 4
+RANDOM_WIDTH = 4
+MAX_COUNTER = len(ALPHABET) ** COUNTER_WIDTH - 1
+
+
+class ExpenseIdGenerator:
+    """
+    Thread-safe generator of monotonic, lexicographically sortable expense IDs.
+
+    Format: exp_YYYYMMDD_HHMMSS_<mmm><counter><random>
+
+    - YYYYMMDD_HHMMSS: creation time in UTC, so local clock changes such as
+      the end of daylight saving time never move IDs backwards
+    - mmm: milliseconds, three digits
+    - counter: four base-36 digits that increase within the same millisecond
+    - random: four base-36 characters separating IDs made by other processes
+
+    Within one generator every ID sorts after the previous one, even when the
+    clock stands still or steps backwards: the last timestamp is then reused
+    and the counter incremented, and a full counter carries into the next
+    millisecond. Because base-36 digits sort in ASCII order, sorting IDs as
+    strings sorts them by creation time.
+    """
+
+    def __init__(self, clock=time.time):
+        """
+        Initialize the generator.
+
+        Args:
+            clock (callable, optional): Returns the current time in seconds
+                since the epoch. Defaults to time.time.
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def generate(self):
+        """
+        Generate the next expense ID.
+
+        Returns:
+            str: Unique expense ID
+        """
+        with self._lock:
+            now_ms = int(self._clock() * 1000)
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._counter = 0
+            elif self._counter < MAX_COUNTER:
+                self._counter += 1
+            else:
+                self._last_ms += 1
+                self._counter = 0
+            ms, counter = self._last_ms, self._counter
+
+        return _format_id(ms, counter, ''.join(random.choices(ALPHABET, k=RANDOM_WIDTH)))
+
+
+def derive_expense_id(ms, sequence, source):
+    """
+    Build an expense ID from fixed inputs instead of the clock.
+
+    The same inputs always give the same ID, so a record written again, e.g.
+    an imported chunk replayed after a crash, overwrites itself instead of
+    being duplicated. The ID has the usual format: ms gives the timestamp,
+    sequence the counter (carrying into later milliseconds when it is full)
+    and a hash of source the last characters, so IDs sort by ms and then
+    sequence.
+
+    Args:
+        ms (int): Creation time in milliseconds since the epoch
+        sequence (int): Position of the record among those sharing ms and source
+        source (str): Identifies where the records come from
+
+    Returns:
+        str: Expense ID
+    """
+    carry, counter = divmod(sequence, MAX_COUNTER + 1)
+    digest = int.from_bytes(hashlib.sha1(source.encode("utf-8")).digest()[:8], "big")
+    return _format_id(ms + carry, counter, _encode(digest, RANDOM_WIDTH))
+
+
+def _format_id(ms, counter, suffix):
+    moment = datetime.fromtimestamp(ms / 1000, timezone.utc)
+    return (f"exp_{moment.strftime('%Y%m%d_%H%M%S')}_{ms % 1000:03d}"
+            f"{_encode(counter, COUNTER_WIDTH)}{suffix}")
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, remainder = divmod(value, len(ALPHABET))
+        digits.append(ALPHABET[remainder])
+    return "".join(reversed(digits))
+
+
+_default_generator = ExpenseIdGenerator()
+
+
+def generate_expense_id():
+    """
+    Generate an expense ID from the shared process-wide generator.
+
+    Returns:
+        str: Unique expense ID
+    """
+    return _default_generator.generate()
@@ -0,0 +1,77 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+
+CENT = Decimal("0.01")
+
+
+def to_cents(amount):
+    """
+    Convert an amount to a whole number of cents.
+
+    The amount is rounded half-up through its decimal string form, so a float
+    such as 0.29 becomes exactly 29 instead of 28.999... cents.
+
+    Args:
+        amount (float, int, str or Decimal): Amount in currency units
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        ValueError: If the amount is not a number
+    """
+    if isinstance(amount, float):
+        amount = repr(amount)
+    try:
+        return int(Decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+    except (InvalidOperation, TypeError):
+        raise ValueError("Amount must be a valid number")
+
+
+def from_cents(cents):
+    """
+    Convert cents back to a float amount.
+
+    Args:
+        cents (int): Amount in cents
+
+    Returns:
+        float: Amount in currency units
+    """
+    return cents / 100
+
+
+def amount_from_dict(data):
+    """
+    Read the amount of an expense dictionary in either JSON format.
+
+    Args:
+        data (dict): Expense dictionary with "amount" or "amount_cents"
+
+    Returns:
+        float or int: Amount in currency units
+
+    Raises:
+        KeyError: If neither field is present
+    """
+    if "amount" in data:
+        return data["amount"]
+    return from_cents(data["amount_cents"])
+
+
+def cents_from_dict(data):
+    """
+    Read the amount of an expense dictionary in either JSON format as cents.
+
+    Args:
+        data (dict): Expense dictionary with "amount" or "amount_cents"
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        KeyError: If neither field is present
+    """
+    if "amount" in data:
+        return to_cents(data["amount"])
+    return data["amount_cents"]
@@ -0,0 +1,208 @@
+import argparse
+import json
+from pathlib import Path
+from src.models.money import cents_from_dict, from_cents
+from src.storage.atomic_file import file_signature, replace_file
+
+
+class CategoryAggregates:
+    """
+    Persisted per-category count, sum, min, max and latest date.
+
+    Amounts are kept in integer cents, so totals never drift however many
+    saves and deletes are applied. Adding an expense updates its category in
+    O(1). Removing one does too, except that removing the current minimum,
+    maximum or latest date leaves that category's extremes unknown; the
+    category is then marked stale until the owner recomputes it from its
+    expenses with replace().
+
+    The whole state is a single small JSON file rewritten atomically by save().
+    """
+
+    def __init__(self, path):
+        """
+        Initialize aggregates backed by a file.
+
+        Args:
+            path (str or Path): Path to the aggregates file
+        """
+        self.path = Path(path)
+        self.categories = None
+        self.stale = set()
+        self._signature = None
+
+    @property
+    def loaded(self):
+        """bool: True once the aggregates have been read or rebuilt."""
+        return self.categories is not None
+
+    def load(self):
+        """
+        Read the aggregates file.
+
+        Returns:
+            bool: True if it was read, False if it is missing or corrupted and
+            needs to be rebuilt
+        """
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+                signature = file_signature(f.fileno())
+            categories = state["categories"]
+            stale = set(state["stale"])
+        except FileNotFoundError:
+            return False
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        self.categories = categories
+        self.stale = stale
+        self._signature = signature
+        return True
+
+    def changed_on_disk(self):
+        """
+        Check whether another writer replaced the file since it was last read or saved.
+
+        Returns:
+            bool: True if the file on disk is not the version held in memory
+        """
+        return file_signature(self.path) != self._signature
+
+    def rebuild(self, records):
+        """
+        Recompute every category from scratch.
+
+        Args:
+            records (iterable[dict]): Expense dictionaries in either amount format
+        """
+        self.categories = {}
+        self.stale = set()
+        for data in records:
+            self.add(data)
+
+    def add(self, data):
+        """
+        Count an expense.
+
+        Args:
+            data (dict): Expense dictionary with category, date and amount
+        """
+        cents = cents_from_dict(data)
+        date = data.get("date") or ""
+        entry = self.categories.get(data["category"])
+        if entry is None:
+            self.categories[data["category"]] = {
+                "count": 1, "total_cents": cents, "min_cents": cents,
+                "max_cents": cents, "latest_date": date,
+            }
+            return
+
+        entry["count"] += 1
+        entry["total_cents"] += cents
+        entry["min_cents"] = min(entry["min_cents"], cents)
+        entry["max_cents"] = max(entry["max_cents"], cents)
+        entry["latest_date"] = max(entry["latest_date"], date)
+
+    def remove(self, data):
+        """
+        Stop counting an expense.
+
+        Args:
+            data (dict): Expense dictionary as it was counted
+        """
+        category = data["category"]
+        entry = self.categories.get(category)
+        if entry is None:
+            return
+
+        cents = cents_from_dict(data)
+        entry["count"] -= 1
+        entry["total_cents"] -= cents
+        if entry["count"] <= 0:
+            del self.categories[category]
+            self.stale.discard(category)
+        elif cents in (entry["min_cents"], entry["max_cents"]) or \
+                (data.get("date") or "") == entry["latest_date"]:
+            self.stale.add(category)
+
+    def replace(self, category, records):
+        """
+        Recompute one category from its expenses and clear its stale mark.
+
+        Args:
+            category (str): The category to recompute
+            records (iterable[dict]): Every expense dictionary in that category
+        """
+        self.categories.pop(category, None)
+        self.stale.discard(category)
+        for data in records:
+            self.add(data)
+
+    def summary(self):
+        """
+        Describe every category.
+
+        Returns:
+            dict: Category to a dict with count, total_cents, total, min, max
+            (floats) and latest_date, ordered by category
+        """
+        return {
+            category: {
+                "count": entry["count"],
+                "total_cents": entry["total_cents"],
+                "total": from_cents(entry["total_cents"]),
+                "min": from_cents(entry["min_cents"]),
+                "max": from_cents(entry["max_cents"]),
+                "latest_date": entry["latest_date"],
+            }
+            for category, entry in sorted(self.categories.items())
+        }
+
+    def save(self):
+        """Write the aggregates to disk atomically."""
+        replace_file(self.path, json.dumps({"categories": self.categories, "stale": sorted(self.stale)}))
+        self._signature = file_signature(self.path)
+
+
+def diff_summaries(expected, actual):
+    """
+    List the categories whose summaries differ.
+
+    Args:
+        expected (dict): Summary recomputed from the expenses
+        actual (dict): Summary that was maintained incrementally
+
+    Returns:
+        list[str]: Categories that are missing, extra or different, sorted
+    """
+    return sorted(category for category in set(expected) | set(actual)
+                  if expected.get(category) != actual.get(category))
+
+
+def main(argv=None):
+    """Check the per-category aggregates of a JSON data directory for drift."""
+    from src.storage.expense_storage import ExpenseStorage
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild the per-category aggregates.")
+    parser.add_argument("data_dir", nargs="?", default="data",
+                        help="data directory holding the expense files (default: data)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the aggregates if they drifted")
+    args = parser.parse_args(argv)
+
+    storage = ExpenseStorage(args.data_dir)
+    drifted = storage.verify_aggregates()
+    if not drifted:
+        print("Aggregates are consistent")
+        return 0
+
+    print(f"Aggregates drifted for: {', '.join(drifted)}")
+    if args.rebuild:
+        storage.rebuild_aggregates()
+        print("Aggregates rebuilt")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+_UMASK = None
+
+
+def open_temp_file(path, mode='w'):
+    """
+    Create a uniquely named temporary file next to the file it will replace.
+
+    Every call gets its own name from tempfile.mkstemp, so writers in
+    different processes never write to, or rename, each other's temporary
+    file. The name starts with a dot and ends in .tmp, so directory scans
+    never take it for an expense file. mkstemp creates owner-only files, so
+    the temporary file is given the mode of the file it replaces, or the
+    mode open() would create a new file with, before anything is written.
+
+    Args:
+        path (str or Path): File the temporary file will replace
+        mode (str): Mode to open the temporary file with
+
+    Returns:
+        tuple: (Path of the temporary file, open file object)
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, _target_mode(path))
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_name)
+        raise
+    return Path(tmp_name), os.fdopen(fd, mode)
+
+
+def replace_file(path, text):
+    """
+    Atomically replace a file with new text.
+
+    Args:
+        path (str or Path): File to replace
+        text (str): The new contents
+    """
+    tmp_path, f = open_temp_file(path)
+    try:
+        with f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def file_signature(file):
+    """
+    Identify the version of a file on disk.
+
+    Files replaced through a rename get a new inode and appended journals
+    grow, so a different signature means another writer changed the file.
+
+    Args:
+        file (str, Path or int): Path of the file, or an open file descriptor
+
+    Returns:
+        tuple or None: (inode, size, mtime_ns), or None if the file is missing
+    """
+    try:
+        stat = os.fstat(file) if isinstance(file, int) else os.stat(file)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _target_mode(path):
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+def _umask():
+    global _UMASK
+    if _UMASK is None:
+        # The umask can only be read by setting it, so read it once.
+        _UMASK = os.umask(0o022)
+        os.umask(_UMASK)
+    return _UMASK
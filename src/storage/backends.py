@@ -0,0 +1,48 @@
+from importlib import import_module
+
+
+# Backends are imported on first use, so choosing one does not pay for
+# importing the others.
+STORAGE_BACKENDS = {
+    "json": ("src.storage.expense_storage", "ExpenseStorage"),
+    "log": ("src.storage.log_storage", "LogExpenseStorage"),
+    "sqlite": ("src.storage.sqlite_storage", "SQLiteExpenseStorage"),
+}
+
+
+def get_storage_class(backend="json"):
+    """
+    Import and return the storage class for a backend.
+
+    Args:
+        backend (str): Backend name, one of STORAGE_BACKENDS
+
+    Returns:
+        type: The storage class
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    try:
+        module_name, class_name = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return getattr(import_module(module_name), class_name)
+
+
+def create_storage(backend="json", data_dir="data", **options):
+    """
+    Create a storage instance for the named backend.
+
+    Args:
+        backend (str): Backend name, one of STORAGE_BACKENDS
+        data_dir (str): Path to the data directory
+        **options: Extra keyword arguments for the backend constructor
+
+    Returns:
+        Storage instance exposing save_expense, load_all_expenses and delete_expense
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    return get_storage_class(backend)(data_dir, **options)
@@ -0,0 +1,169 @@
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from src.models.money import from_cents, to_cents
+from src.storage.atomic_file import file_signature, replace_file
+
+
+class BudgetLimits:
+    """
+    Persisted monthly spending limit per category.
+
+    Limits are kept in integer cents in a single small JSON file rewritten
+    atomically by save(); a file replaced by another process is read again
+    on the next access. Spending is not stored here: each backend already
+    keeps per-category month totals (the JSON backend in its rollups, updated
+    in O(1) on every save and delete), and status() only compares those
+    totals against the limits.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize limits backed by a file.
+
+        Args:
+            path (str or Path): Path to the budgets file
+        """
+        self.path = Path(path)
+        self._limits = None
+        self._signature = None
+
+    @property
+    def limits(self):
+        """dict: Category to monthly limit in cents, read on first use and after outside changes."""
+        if self._limits is None or file_signature(self.path) != self._signature:
+            self.load()
+        return self._limits
+
+    def load(self):
+        """
+        Read the budgets file.
+
+        A missing file means no budgets; a corrupted one is reported and
+        treated the same way.
+
+        Returns:
+            dict: Category to monthly limit in cents
+        """
+        signature = None
+        try:
+            with open(self.path, 'r') as f:
+                signature = file_signature(f.fileno())
+                limits = {category: int(cents) for category, cents in json.load(f)["limits"].items()}
+        except FileNotFoundError:
+            limits = {}
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as e:
+            print(f"Warning: Could not load {self.path.name}: {e}", file=sys.stderr)
+            limits = {}
+        self._limits = limits
+        self._signature = signature
+        return limits
+
+    def set(self, category, amount):
+        """
+        Set the monthly limit of a category.
+
+        Args:
+            category (str): The category
+            amount (float or str): Limit in currency units
+
+        Raises:
+            ValueError: If the amount is not a positive number
+        """
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Budget must be greater than zero")
+        self.limits[category] = cents
+
+    def remove(self, category):
+        """
+        Remove the limit of a category.
+
+        Args:
+            category (str): The category
+
+        Returns:
+            bool: True if the category had a limit
+        """
+        return self.limits.pop(category, None) is not None
+
+    def status(self, spending):
+        """
+        Compare one month's spending with the limits.
+
+        Args:
+            spending (dict): Category to ``{"count", "total_cents", ...}`` for
+                the month, as in a month bucket of get_spending_rollup()
+
+        Returns:
+            dict: Budgeted category to a dict with count, limit_cents,
+            spent_cents, remaining_cents (negative when over), limit, spent,
+            remaining and over, ordered by category
+        """
+        return {category: budget_entry(limit, spending.get(category))
+                for category, limit in sorted(self.limits.items())}
+
+    def save(self):
+        """Write the limits to disk atomically."""
+        replace_file(self.path, json.dumps({"limits": self.limits}, sort_keys=True))
+        self._signature = file_signature(self.path)
+
+
+def budget_entry(limit_cents, spent):
+    """
+    Describe one category's budget for a month.
+
+    Args:
+        limit_cents (int): Monthly limit in cents
+        spent (dict, optional): ``{"count", "total_cents", ...}`` for the
+            category, or None if nothing was spent
+
+    Returns:
+        dict: count, limit_cents, spent_cents, remaining_cents, limit, spent,
+        remaining and over
+    """
+    count = spent["count"] if spent else 0
+    spent_cents = spent["total_cents"] if spent else 0
+    remaining_cents = limit_cents - spent_cents
+    return {
+        "count": count,
+        "limit_cents": limit_cents,
+        "spent_cents": spent_cents,
+        "remaining_cents": remaining_cents,
+        "limit": from_cents(limit_cents),
+        "spent": from_cents(spent_cents),
+        "remaining": from_cents(remaining_cents),
+        "over": remaining_cents < 0,
+    }
+
+
+def current_month():
+    """
+    Get the month budgets apply to by default.
+
+    Returns:
+        str: Today's month as YYYY-MM
+    """
+    return date.today().strftime("%Y-%m")
+
+
+def month_bounds(month):
+    """
+    Get the first and last date strings that can fall in a month.
+
+    The last one is day 31 whatever the month; dates compare as strings,
+    so it bounds every real date of the month.
+
+    Args:
+        month (str): Month as YYYY-MM
+
+    Returns:
+        tuple[str, str]: (first, last) dates as YYYY-MM-DD
+
+    Raises:
+        ValueError: If the month is not in YYYY-MM format
+    """
+    if len(month) != 7 or month[4] != "-" or not (month[:4] + month[5:]).isdigit():
+        raise ValueError("Month must be in YYYY-MM format")
+    return f"{month}-01", f"{month}-31"
@@ -0,0 +1,57 @@
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class DirectoryLock:
+    """
+    Exclusive lock that serializes writers of one data directory.
+
+    Several processes, e.g. scripts running ``main.py add`` at the same
+    time, may update the same index journals and summary files. Holding this
+    lock around each load-modify-save keeps their updates from overwriting
+    each other. Across processes it is an fcntl.flock on a lock file, which
+    the operating system releases if a process dies; within a process it is
+    re-entrant, so locked methods can call each other. Where fcntl is not
+    available (Windows) only threads of one process are serialized.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the lock.
+
+        Args:
+            path (str or Path): Lock file, created on first use
+        """
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._file = open(self.path, 'a')
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            # Closing the file releases the flock.
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+        return False
@@ -1,19 +1,93 @@
+import argparse
+import heapq
 import json
 import os
+import re
+import sys
+from functools import partial
 from pathlib import Path
 from src.models.expense import Expense
+from src.models.expense_batch import ExpenseBatch
+from src.models.money import cents_from_dict, from_cents
+from src.storage.aggregates import CategoryAggregates, diff_summaries
+from src.storage.atomic_file import open_temp_file
+from src.storage.budgets import BudgetLimits, current_month, month_bounds
+from src.storage.directory_lock import DirectoryLock
+from src.storage.filters import ExpenseFilter
+from src.storage.id_index import ExpenseIndex
+from src.storage.manifest import ExpenseManifest, manifest_record
+from src.storage.ordered_index import OrderedIndex
+from src.storage.rollups import ExpenseRollups, diff_rollups
+from src.storage.save_result import SaveResult
+from src.storage.search_index import SearchIndex
+from src.storage.snapshot import ExpenseSnapshot, write_snapshot
+
+
+SHARD_ID_PATTERN = re.compile(r"^exp_(\d{4})(\d{2})\d{2}_")
+SHARD_DATE_PATTERN = re.compile(r"^(\d{4})-(\d{2})-\d{2}")
 
 
 class ExpenseStorage:
-    def __init__(self, data_dir="data"):
+    INDEX_FILENAME = ".index.jsonl"
+    LAYOUT_FILENAME = ".layout"
+    SNAPSHOT_FILENAME = ".snapshot.bin"
+    MANIFEST_FILENAME = ".manifest.jsonl"
+    AGGREGATES_FILENAME = ".aggregates.json"
+    ROLLUPS_FILENAME = ".rollups.json"
+    SEARCH_INDEX_FILENAME = ".search.jsonl"
+    BUDGETS_FILENAME = ".budgets.json"
+    LOCK_FILENAME = ".lock"
+    LAYOUTS = ("flat", "sharded")
+
+    def __init__(self, data_dir="data", load_workers=1, load_chunk_size=256,
+                 process_pool_threshold=None, layout=None, use_manifest=False,
+                 strict=False, cents=False):
         """
         Initialize ExpenseStorage with data directory path.
 
         Args:
             data_dir (str): Path to directory for storing expense JSON files
+            load_workers (int): Number of workers used to read and decode files.
+                1 loads sequentially.
+            load_chunk_size (int): Number of files handed to a worker at a time
+            process_pool_threshold (int, optional): Use a process pool instead of
+                a thread pool once this many files need parsing
+            layout (str, optional): "flat" keeps every file in data_dir,
+                "sharded" stores them under data_dir/YYYY/MM/. Defaults to the
+                layout recorded in the data directory, or "flat".
+            use_manifest (bool): Maintain a single manifest file and serve
+                load_all_expenses from it instead of opening every file
+            strict (bool): Validate every file through Expense.__init__ when
+                loading. By default files are trusted as written by this class.
+            cents (bool): Write amounts as integer "amount_cents" fields.
+                Files in either format are always readable.
+
+        Raises:
+            ValueError: If the layout is unknown or contradicts the recorded one
         """
         self.data_dir = Path(data_dir)
+        self.load_workers = load_workers
+        self.load_chunk_size = load_chunk_size
+        self.process_pool_threshold = process_pool_threshold
+        self.strict = strict
+        self.cents = cents
         self.ensure_data_directory()
+        self.layout = self._resolve_layout(layout)
+        self.index = ExpenseIndex(self.data_dir / self.INDEX_FILENAME)
+        self.snapshot_path = self.data_dir / self.SNAPSHOT_FILENAME
+        self.use_manifest = use_manifest
+        self.manifest = ExpenseManifest(self.data_dir / self.MANIFEST_FILENAME)
+        self.aggregates = CategoryAggregates(self.data_dir / self.AGGREGATES_FILENAME)
+        self.rollups = ExpenseRollups(self.data_dir / self.ROLLUPS_FILENAME)
+        self.search_index = SearchIndex(self.data_dir / self.SEARCH_INDEX_FILENAME)
+        self.budgets = BudgetLimits(self.data_dir / self.BUDGETS_FILENAME)
+        self._lock = DirectoryLock(self.data_dir / self.LOCK_FILENAME)
+        self.by_date = OrderedIndex("date")
+        self.by_created = OrderedIndex("created_at")
+        self._load_cache = {}
+        self._snapshot = None
+        self._ordered = None
+        self._ordered_mtime = None
 
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist."""
@@ -23,62 +97,1084 @@ class ExpenseStorage:
         """
         Save a single expense to its own JSON file.
 
+        The file is written under a temporary name, fsynced and renamed into
+        place, so a crash never leaves a half-written expense behind.
+
         Args:
             expense (Expense): The expense to save
 
         Returns:
             str: Path to the saved file
+
+        Raises:
+            ValueError: If the amount cannot be counted in cents
         """
+        with self._lock:
+            relpath = self.get_expense_path(expense)
+            filepath = self.data_dir / relpath
+            record = _summary_record(expense)
+            self._prepare_write()
+            previous = self._previous_records([expense.id])
 
-        filename = self.get_expense_filename(expense)
-        filepath = self.data_dir / filename
+            tmp_path, handle = self._write_temp_file(relpath, expense.to_dict(self.cents))
+            self._commit_temp_file(tmp_path, handle, relpath)
+            for directory in self._parent_directories(relpath):
+                self._fsync_directory(directory)
+
+            self._record_saved([(expense, relpath, record)], previous)
+
+            return str(filepath)
+
+    def append_expense(self, expense):
+        """
+        Save a new expense without reading the ID index or the manifest.
+
+        save_expense loads both journals to detect overwrites and drift, which
+        costs O(n) in a fresh process. A caller that has just created the
+        expense knows it is new, so this appends one line to each journal
+        instead and only reads the small aggregate files, keeping a one-shot
+        ``add`` fast however many expenses exist. It falls back to
+        save_expense when a journal is missing or already loaded, or when the
+        directory changed since the manifest last matched it.
+
+        Args:
+            expense (Expense): A new expense
+
+        Returns:
+            str: Path to the saved file
+
+        Raises:
+            ValueError: If a file for the expense already exists or the amount
+                cannot be counted in cents
+        """
+        with self._lock:
+            relpath = self.get_expense_path(expense)
+            filepath = self.data_dir / relpath
+            if filepath.exists():
+                raise ValueError(f"Expense already exists: {expense.id}")
+            record = _summary_record(expense)
+            if self.index.loaded or self._ordered is not None or not self.index.index_path.exists():
+                return self.save_expense(expense)
+
+            signature = None
+            if self.use_manifest:
+                signature = None if self.manifest.loaded else self.manifest.read_signature()
+                # Adding, removing or renaming any file changes the directory
+                # mtime, so a matching mtime means the file count is still right.
+                if signature is None or signature[1] != self._directory_mtime():
+                    return self.save_expense(expense)
+
+            self._load_aggregates()
+            tmp_path, handle = self._write_temp_file(relpath, expense.to_dict(self.cents))
+            self._commit_temp_file(tmp_path, handle, relpath)
+            for directory in self._parent_directories(relpath):
+                self._fsync_directory(directory)
+
+            self.index.put_many([(expense.id, relpath)])
+            for summary in (self.aggregates, self.rollups):
+                summary.add(record)
+                summary.save()
+            if self.use_manifest:
+                self.manifest.put_many([record], lambda: (signature[0] + 1, self._directory_mtime()))
+            self.search_index.put_many([record])
+            return str(filepath)
+
+    def save_expenses(self, expenses, durable=True, sync_chunk_size=256):
+        """
+        Save many expenses with atomic write-and-rename and grouped fsyncs.
+
+        Expenses are written to temporary files in chunks. Each chunk is
+        fsynced back to back (so the filesystem can merge the journal commits)
+        and renamed into place, and each touched directory is fsynced once at
+        the end of the batch. A record that cannot be serialized or written is
+        reported in the result instead of aborting the batch. When an ID occurs
+        more than once only its last expense is written, as if the saves had
+        run one after another.
 
-        with open(filepath, 'w') as f:
-            json.dump(expense.to_dict(), f, indent=2)
+        Args:
+            expenses (iterable[Expense]): The expenses to save
+            durable (bool): fsync files and the directory. Disable for
+                throwaway data where speed matters more than crash safety.
+            sync_chunk_size (int): Number of files fsynced and renamed together
 
-        return str(filepath)
+        Returns:
+            SaveResult: IDs that were saved and (ID, error) pairs that failed
+        """
+        with self._lock:
+            result = SaveResult()
+            chunk = []
+            directories = set()
+            self._prepare_write()
+            previous = {}
+            latest = {}
+            for expense in expenses:
+                latest[expense.id] = expense
+
+            for expense in latest.values():
+                relpath = self.get_expense_path(expense)
+                previous.update(self._previous_records([expense.id]))
+                try:
+                    record = _summary_record(expense)
+                    tmp_path, handle = self._write_temp_file(relpath, expense.to_dict(self.cents))
+                except (OSError, TypeError, ValueError) as e:
+                    result.add_failure(expense.id, e)
+                    continue
+
+                chunk.append((expense, relpath, record, tmp_path, handle))
+                directories.update(self._parent_directories(relpath))
+
+                if len(chunk) >= sync_chunk_size:
+                    self._commit_chunk(chunk, result, durable, previous)
+                    chunk = []
+
+            if chunk:
+                self._commit_chunk(chunk, result, durable, previous)
+            if durable and result.saved:
+                for directory in sorted(directories):
+                    self._fsync_directory(directory)
+
+            return result
 
     def load_all_expenses(self):
         """
         Load all expenses from JSON files in data directory.
 
+        Parsed files are cached under their name together with their
+        (mtime, size, inode) signature. A repeat call re-parses only files
+        that are new or changed and drops files that were removed, so an
+        unchanged directory is served from memory after one scandir pass.
+        Cached Expense objects are shared between calls.
+
+        Files that do need parsing are spread over a worker pool when
+        load_workers is greater than one. Expenses are returned in path
+        order (shard, then filename) either way.
+
+        With use_manifest enabled the expenses are built from the manifest
+        alone after a consistency check; corrupted files are then reported
+        once, when the manifest is rebuilt.
+
         Returns:
             list[Expense]: List of all Expense objects
         """
-        expenses = []
+        if self.use_manifest:
+            return Expense.from_dicts(self.load_manifest().records.values())
+        return self._load_expense_files()
 
-        for filepath in self.get_all_expense_files():
+    def load_expense_batch(self):
+        """
+        Load all expenses into a columnar ExpenseBatch.
+
+        With use_manifest enabled the batch is filled straight from the
+        manifest records and no Expense objects are created at all.
+
+        Returns:
+            ExpenseBatch: Every expense, in the same order as load_all_expenses,
+            holding cents when the storage writes cents
+        """
+        if self.use_manifest:
+            return ExpenseBatch.from_dicts(self.load_manifest().records.values(), self.cents)
+        return ExpenseBatch.from_expenses(self._load_expense_files(), self.cents)
+
+    def _load_expense_files(self):
+        cache = {}
+        pending = []
+
+        for relpath, entry in sorted(self._iter_expense_entries(), key=lambda item: item[0]):
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    expenses.append(Expense.from_dict(data))
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                print(f"Warning: Could not load {filepath.name}: {e}")
+                stat = entry.stat()
+            except FileNotFoundError:
                 continue
 
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            cached = self._load_cache.get(relpath)
+            if cached is not None and cached[0] == signature:
+                cache[relpath] = cached
+            else:
+                cache[relpath] = None
+                pending.append((relpath, signature, entry.path))
+
+        parsed = self._parse_expense_files([path for _, _, path in pending])
+        for (name, signature, _), (expense, error) in zip(pending, parsed):
+            cache[name] = (signature, expense, error)
+
+        expenses = []
+        for name, (_, expense, error) in cache.items():
+            if expense is None:
+                print(f"Warning: Could not load {name}: {error}", file=sys.stderr)
+                continue
+            expenses.append(expense)
+
+        self._load_cache = cache
         return expenses
 
+    def iter_expenses(self, category=None, start_date=None, end_date=None,
+                      min_amount=None, max_amount=None, created_from=None, created_to=None):
+        """
+        Lazily yield expenses that match the given filters.
+
+        The directory is streamed with os.scandir and nothing is accumulated,
+        so memory stays flat regardless of how many files exist. In the
+        sharded layout only the YYYY/MM shards overlapping the date range are
+        walked. Files whose ID timestamp falls outside the created_at bounds
+        are skipped without being opened; the remaining filters are checked on the decoded JSON
+        before an Expense is built. Unchanged files already in the load cache
+        are reused without re-reading them. Order follows the directory.
+
+        Args:
+            category (str, optional): Only expenses in this category
+            start_date (str, optional): Earliest expense date (YYYY-MM-DD)
+            end_date (str, optional): Latest expense date (YYYY-MM-DD)
+            min_amount (float, optional): Smallest amount
+            max_amount (float, optional): Largest amount
+            created_from (str, optional): Earliest created_at (ISO format)
+            created_to (str, optional): Latest created_at (ISO format)
+
+        Yields:
+            Expense: Each matching expense
+        """
+        expense_filter = ExpenseFilter(category, start_date, end_date, min_amount,
+                                       max_amount, created_from, created_to)
+
+        for relpath, entry in self._iter_expense_entries(start_date, end_date):
+            if not expense_filter.may_match_id(entry.name[:-5]):
+                continue
+
+            expense = self._read_filtered(relpath, entry, expense_filter)
+            if expense is not None:
+                yield expense
+
+    def load_newest_expenses(self, limit, offset=0):
+        """
+        Load the most recently created expenses.
+
+        Once the in-memory indexes are built (see load_ordered_indexes), a
+        page is sliced off the end of the created_at index without sorting or
+        reading any other expense; ties on created_at come back in ID order.
+
+        Until then, expense IDs sort by creation time, so the newest files are
+        picked from the filenames with a heap bounded to offset + limit
+        entries and only those files are opened; the rest are never sorted.
+        If some of them cannot be read, the heap is widened until the page is
+        full or the directory runs out. Expenses with legacy IDs created
+        within the same second come back in ID order.
+
+        Args:
+            limit (int): Maximum number of expenses to return
+            offset (int): Number of newest expenses to skip, for paging
+
+        Returns:
+            list[Expense]: Up to limit expenses, newest first
+        """
+        if self._ordered is not None:
+            expenses = self._load_ordered()
+            return [expenses[expense_id] for expense_id in self.by_created.last(limit, offset)]
+
+        wanted = offset + limit
+        size = wanted
+        expense_filter = ExpenseFilter()
+        while True:
+            entries = heapq.nlargest(size, self._iter_expense_entries(), key=lambda item: item[1].name)
+            expenses = []
+            for relpath, entry in entries:
+                expense = self._read_filtered(relpath, entry, expense_filter)
+                if expense is not None:
+                    expenses.append(expense)
+            if len(expenses) >= wanted or len(entries) < size:
+                return expenses[offset:wanted]
+            size += wanted - len(expenses)
+
+    def load_ordered_indexes(self):
+        """
+        Build the in-memory by_date and by_created indexes now.
+
+        Building them loads every expense once, which a one-shot command
+        never earns back, so only date-range queries build them on their own.
+        A long-lived caller such as the interactive menu calls this before
+        paging, after which load_newest_expenses slices pages from memory.
+        """
+        self._load_ordered()
+
+    def load_expenses_by_date_range(self, start_date=None, end_date=None):
+        """
+        Load expenses whose date falls in an inclusive range, newest first.
+
+        The first call loads every expense once and builds two sorted
+        in-memory indexes, by_date and by_created. Saves and deletes through
+        this instance update them in place, so later calls only bisect for
+        the range bounds. If the directory changes behind our back the
+        indexes are rebuilt on the next call.
+
+        Args:
+            start_date (str, optional): First date (YYYY-MM-DD) to include
+            end_date (str, optional): Last date (YYYY-MM-DD) to include
+
+        Returns:
+            list[Expense]: Matching expenses ordered by date descending, newest
+            created first within a date
+        """
+        expenses = self._load_ordered()
+        return [expenses[expense_id]
+                for expense_id in self.by_date.range(start_date, end_date, reverse=True)]
+
     def delete_expense(self, expense_id):
         """
         Delete an expense file by ID.
 
+        The file is located through the ID index, so no other expense file is
+        opened. If the index has no usable entry, the places a file for this
+        ID could be written to are checked; only if one exists, i.e. it was
+        added behind our back, is the index rebuilt. An unknown ID therefore
+        costs a few stat calls instead of a full scan.
+
         Args:
             expense_id (str): The ID of the expense to delete
 
         Returns:
             bool: True if deleted, False if not found
         """
-        for filepath in self.get_all_expense_files():
+        with self._lock:
+            self._prepare_write()
+            filepath = self._find_expense_file(expense_id)
+            if filepath is None:
+                if not self._expense_file_exists(expense_id):
+                    return False
+                self.rebuild_index()
+                filepath = self._find_expense_file(expense_id)
+                if filepath is None:
+                    return False
+
+            previous = self._previous_records([expense_id])
+            filepath.unlink()
+            self._load_cache.pop(self.index.get(expense_id), None)
+            self.index.remove(expense_id)
+            if expense_id in previous:
+                for summary in (self.aggregates, self.rollups):
+                    summary.remove(previous[expense_id])
+                    summary.save()
+            if self.use_manifest:
+                self.manifest.remove(expense_id, self._manifest_signature(-1))
+            self.search_index.remove(expense_id)
+            if self._ordered is not None:
+                self._ordered.pop(expense_id, None)
+                self.by_date.remove(expense_id)
+                self.by_created.remove(expense_id)
+                self._ordered_mtime = self._directory_mtime()
+            return True
+
+    def load_index(self):
+        """
+        Load the ID index, rebuilding it if it is missing or unreadable.
+
+        The index is read from disk the first time it is needed, and again
+        when another process has appended to or compacted the journal since.
+
+        Returns:
+            ExpenseIndex: The loaded index
+        """
+        with self._lock:
+            if not self.index.loaded:
+                if not self.index.load():
+                    self.rebuild_index()
+                self._sync_manifest()
+            elif self.index.changed_on_disk() and not self.index.load():
+                self.rebuild_index()
+            return self.index
+
+    def rebuild_index(self):
+        """
+        Rebuild the ID index by scanning every expense file.
+
+        Returns:
+            ExpenseIndex: The rebuilt index
+        """
+        with self._lock:
+            entries = {}
+            for relpath, entry in self._iter_expense_entries():
+                try:
+                    with open(entry.path, 'r') as f:
+                        entries[json.load(f)["id"]] = relpath
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+            self.index.write(entries)
+            self._sync_manifest()
+            return self.index
+
+    def snapshot_is_stale(self):
+        """
+        Check whether the columnar snapshot lags behind the expense files.
+
+        The snapshot records how many files it was built from and the newest
+        file mtime; any difference means files were added, changed or removed.
+
+        Returns:
+            bool: True if the snapshot is missing, unreadable or out of date
+        """
+        try:
+            with ExpenseSnapshot(self.snapshot_path) as snapshot:
+                recorded = (snapshot.source_count, snapshot.source_mtime_ns)
+        except (OSError, ValueError):
+            return True
+        return recorded != self._source_signature()
+
+    def regenerate_snapshot(self, force=False):
+        """
+        Rebuild the columnar snapshot if the expense files are newer.
+
+        Args:
+            force (bool): Rebuild even if the snapshot looks current
+
+        Returns:
+            bool: True if the snapshot was rebuilt
+        """
+        with self._lock:
+            if not force and not self.snapshot_is_stale():
+                return False
+
+            source_count, source_mtime_ns = self._source_signature()
+            write_snapshot(self.load_all_expenses(), self.snapshot_path, source_count, source_mtime_ns)
+            self._sync_manifest()
+
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+            return True
+
+    def open_snapshot(self):
+        """
+        Get the memory-mapped snapshot, regenerating it first if it is stale.
+
+        Returns:
+            ExpenseSnapshot: The mapped snapshot, owned by this storage
+        """
+        if self.regenerate_snapshot() or self._snapshot is None:
+            if self._snapshot is not None:
+                self._snapshot.close()
+            self._snapshot = ExpenseSnapshot(self.snapshot_path)
+        return self._snapshot
+
+    def get_category_totals(self, start_date=None, end_date=None):
+        """
+        Count and sum expenses per category from the columnar snapshot.
+
+        Args:
+            start_date (str, optional): Earliest date (YYYY-MM-DD) to include
+            end_date (str, optional): Latest date (YYYY-MM-DD) to include
+
+        Returns:
+            dict: Mapping of category to (count, total), ordered by category
+        """
+        return self.open_snapshot().category_totals(start_date, end_date)
+
+    def load_manifest(self):
+        """
+        Load the manifest, rebuilding it if it is missing or has drifted.
+
+        The manifest is checked against the directory on every call: if the
+        number of expense files or the directory mtime differs from what the
+        manifest last recorded, it is rebuilt from the files.
+
+        Returns:
+            ExpenseManifest: The consistent manifest
+        """
+        with self._lock:
+            if not self.manifest.loaded and not self.manifest.load():
+                return self.rebuild_manifest()
+            if self.manifest.signature != self._directory_signature():
+                return self.rebuild_manifest()
+            if self.manifest.needs_compaction:
+                self.manifest.write(self.manifest.records, self._directory_signature)
+            return self.manifest
+
+    def rebuild_manifest(self):
+        """
+        Rebuild the manifest by reading every expense file.
+
+        Returns:
+            ExpenseManifest: The rebuilt manifest
+        """
+        with self._lock:
+            records = {expense.id: manifest_record(expense) for expense in self._load_expense_files()}
+            self.manifest.write(records, self._directory_signature)
+            return self.manifest
+
+    def get_category_summary(self):
+        """
+        Get count, total, min, max and latest date per category.
+
+        The figures are maintained incrementally by every save and delete and
+        persisted next to the expenses, so this is O(number of categories).
+        A category whose minimum, maximum or latest expense was deleted is
+        recomputed from its own expenses first.
+
+        Returns:
+            dict: Category to a dict with count, total_cents, total, min, max
+            and latest_date, ordered by category
+        """
+        with self._lock:
+            self._load_aggregates()
+            if self.aggregates.stale:
+                for category in sorted(self.aggregates.stale):
+                    self.aggregates.replace(category, self._category_records(category))
+                self._save_aggregates()
+            return self.aggregates.summary()
+
+    def get_spending_rollup(self, start_date=None, end_date=None, granularity="month"):
+        """
+        Get per-category spending per day or month in a date range.
+
+        Answered from the day and month rollups maintained by every save and
+        delete, without reading any expense.
+
+        Args:
+            start_date (str, optional): First date included (YYYY-MM-DD)
+            end_date (str, optional): Last date included (YYYY-MM-DD)
+            granularity (str): "day" or "month"
+
+        Returns:
+            dict: Bucket key (YYYY-MM-DD or YYYY-MM) to
+            ``{category: {"count", "total_cents", "total"}}``, ordered by key
+
+        Raises:
+            ValueError: If the granularity is not supported
+        """
+        self._load_aggregates()
+        return self.rollups.query(start_date, end_date, granularity)
+
+    def get_budgets(self):
+        """
+        Get the monthly budget of every category that has one.
+
+        Returns:
+            dict: Category to monthly limit, ordered by category
+        """
+        return {category: from_cents(cents) for category, cents in sorted(self.budgets.limits.items())}
+
+    def set_budget(self, category, amount):
+        """
+        Set the monthly budget of a category.
+
+        Args:
+            category (str): The category
+            amount (float): Monthly limit
+
+        Raises:
+            ValueError: If the amount is not a positive number
+        """
+        with self._lock:
+            self.budgets.set(category, amount)
+            self._save_budgets()
+
+    def remove_budget(self, category):
+        """
+        Remove the monthly budget of a category.
+
+        Args:
+            category (str): The category
+
+        Returns:
+            bool: True if the category had a budget
+        """
+        with self._lock:
+            if not self.budgets.remove(category):
+                return False
+            self._save_budgets()
+            return True
+
+    def get_budget_status(self, month=None):
+        """
+        Get spending against the budget of every budgeted category in a month.
+
+        Month-to-date spending comes from the month bucket of the rollups,
+        which every save and delete updates in O(1), so this costs one
+        lookup per budgeted category however many expenses exist.
+
+        Args:
+            month (str, optional): Month as YYYY-MM. Defaults to this month.
+
+        Returns:
+            dict: Category to a dict with count, limit, spent, remaining (and
+            their *_cents forms) and over, ordered by category
+
+        Raises:
+            ValueError: If the month is not in YYYY-MM format
+        """
+        month = month or current_month()
+        month_bounds(month)
+        self._load_aggregates()
+        return self.budgets.status(self.rollups.month_totals(month))
+
+    def search_expenses(self, query, limit=None):
+        """
+        Find expenses whose description or category contains every query word.
+
+        Served from a persisted inverted index (data/.search.jsonl) that every
+        save and delete appends to, so only the matching expense files are
+        opened. The index is built from all expenses on the first search.
+        A matching file that was removed by hand is skipped with a warning
+        and dropped from the search and ID indexes.
+
+        Args:
+            query (str): Words that must all appear, case-insensitively; a
+                trailing "*" matches any word starting with it (e.g. "ub*")
+            limit (int, optional): Return only this many of the newest matches
+
+        Returns:
+            list[Expense]: Matching expenses, newest first
+
+        Raises:
+            ValueError: If the query has no searchable word
+        """
+        with self._lock:
+            if not self.search_index.loaded:
+                if not self.search_index.load():
+                    self.search_index.rebuild(self._all_records())
+                self._sync_manifest()
+            elif self.search_index.changed_on_disk() and not self.search_index.load():
+                self.search_index.rebuild(self._all_records())
+
+        index = self.load_index()
+        found = [(expense_id, index.get(expense_id)) for expense_id in self.search_index.search(query, limit)]
+        found = [(expense_id, relpath) for expense_id, relpath in found if relpath is not None]
+        parsed = self._parse_expense_files([self.data_dir / relpath for _, relpath in found])
+
+        expenses = []
+        missing = []
+        for (expense_id, relpath), (expense, error) in zip(found, parsed):
+            if expense is None:
+                print(f"Warning: Could not load {relpath}: {error}", file=sys.stderr)
+                if not (self.data_dir / relpath).exists():
+                    missing.append(expense_id)
+                continue
+            expenses.append(expense)
+
+        if missing:
+            with self._lock:
+                for expense_id in missing:
+                    self.index.remove(expense_id)
+                    self.search_index.remove(expense_id)
+        return expenses
+
+    def rebuild_search_index(self):
+        """
+        Re-index every expense, e.g. after files were edited by hand.
+
+        Returns:
+            SearchIndex: The rebuilt index
+        """
+        with self._lock:
+            self.search_index.rebuild(self._all_records())
+            self._sync_manifest()
+            return self.search_index
+
+    def verify_aggregates(self):
+        """
+        Compare the maintained aggregates and rollups with a full recomputation.
+
+        Returns:
+            list[str]: Categories whose figures have drifted, e.g. because
+            files were edited by hand; empty if everything matches
+        """
+        maintained = self.get_category_summary()
+        records = self._all_records()
+        expected = CategoryAggregates(self.aggregates.path)
+        expected.rebuild(records)
+        expected_rollups = ExpenseRollups(self.rollups.path)
+        expected_rollups.rebuild(records)
+        drifted = set(diff_summaries(expected.summary(), maintained))
+        drifted.update(diff_rollups(expected_rollups, self.rollups))
+        return sorted(drifted)
+
+    def rebuild_aggregates(self):
+        """
+        Recompute the per-category aggregates and rollups from every expense.
+
+        Returns:
+            CategoryAggregates: The rebuilt aggregates
+        """
+        with self._lock:
+            records = self._all_records()
+            self.aggregates.rebuild(records)
+            self.rollups.rebuild(records)
+            self._save_aggregates()
+            return self.aggregates
+
+    def _save_aggregates(self):
+        # Renaming the files into place touches the directory mtime, which the
+        # manifest would otherwise read as drift.
+        self.aggregates.save()
+        self.rollups.save()
+        self._sync_manifest()
+
+    def _save_budgets(self):
+        # Same as _save_aggregates: the manifest must be current before the
+        # rename touches the directory mtime.
+        if self.use_manifest:
+            self.load_manifest()
+        self.budgets.save()
+        self._sync_manifest()
+
+    def _load_aggregates(self):
+        # Read the summaries again if another process saved them since, so
+        # that its changes are neither missed nor overwritten by ours.
+        with self._lock:
+            for summary in (self.aggregates, self.rollups):
+                if (not summary.loaded or summary.changed_on_disk()) and not summary.load():
+                    self.rebuild_aggregates()
+
+    def _all_records(self):
+        if self.use_manifest:
+            return list(_countable_records(self.load_manifest().records.values()))
+        return list(_countable_records(manifest_record(expense) for expense in self._load_expense_files()))
+
+    def _category_records(self, category):
+        if self.use_manifest:
+            return list(_countable_records(record for record in self.load_manifest().records.values()
+                                           if record["category"] == category))
+        return list(_countable_records(manifest_record(expense)
+                                       for expense in self.iter_expenses(category=category)))
+
+    def migrate_to_sharded(self):
+        """
+        Move flat-layout files into YYYY/MM shards and switch to the sharded layout.
+
+        Each file is renamed into the shard for its expense date. Files that
+        cannot be parsed are left in place with a warning; they are still
+        found by scans. The ID index is rebuilt afterwards.
+
+        Returns:
+            int: Number of files moved
+        """
+        with self._lock:
+            self.layout = "sharded"
+            self._write_layout_marker()
+
+            moved = 0
+            with os.scandir(self.data_dir) as entries:
+                flat_entries = [e for e in entries if self._is_expense_entry(e)]
+
+            for entry in flat_entries:
+                try:
+                    with open(entry.path, 'r') as f:
+                        expense = Expense.from_dict(json.load(f), strict=self.strict)
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    print(f"Warning: Could not migrate {entry.name}: {e}", file=sys.stderr)
+                    continue
+
+                target = self.data_dir / self._shard_directory(expense) / entry.name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(entry.path, target)
+                moved += 1
+
+            for directory in self._shard_directories():
+                self._fsync_directory(directory)
+            self._fsync_directory(self.data_dir)
+
+            self._load_cache = {}
+            self.rebuild_index()
+            if self.use_manifest:
+                self.rebuild_manifest()
+            return moved
+
+    def _source_signature(self):
+        count = 0
+        newest = 0
+        for _, entry in self._iter_expense_entries():
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    if data.get("id") == expense_id:
-                        filepath.unlink()
-                        return True
-            except (json.JSONDecodeError, KeyError):
+                mtime_ns = entry.stat().st_mtime_ns
+            except FileNotFoundError:
                 continue
+            count += 1
+            newest = max(newest, mtime_ns)
+        return count, newest
 
-        return False
+    def _prepare_write(self):
+        # Load the index and manifest before touching the directory, so our
+        # own write is neither indexed twice nor mistaken for drift.
+        self.load_index()
+        if self.use_manifest and not self.manifest.loaded:
+            self.load_manifest()
+        self._load_aggregates()
+        if self._ordered is not None and self._directory_mtime() != self._ordered_mtime:
+            self._ordered = None
+
+    def _load_ordered(self):
+        if self._ordered is None or self._directory_mtime() != self._ordered_mtime:
+            expenses = self.load_all_expenses()
+            self._ordered = {expense.id: expense for expense in expenses}
+            self.by_date.build(expenses)
+            self.by_created.build(expenses)
+            self._ordered_mtime = self._directory_mtime()
+        return self._ordered
+
+    def _sync_manifest(self):
+        if self.use_manifest and self.manifest.loaded:
+            self.manifest.sync(self._manifest_signature(0))
+
+    def _manifest_signature(self, delta):
+        return lambda: (self.manifest.signature[0] + delta, self._directory_mtime())
+
+    def _directory_signature(self):
+        count = sum(1 for _ in self._iter_expense_entries())
+        return count, self._directory_mtime()
+
+    def _directory_mtime(self):
+        directories = [self.data_dir]
+        if self.layout == "sharded":
+            for year_dir in self._list_digit_dirs(self.data_dir, 4):
+                directories.append(year_dir)
+                directories.extend(self._list_digit_dirs(year_dir, 2))
+        return max(os.stat(directory).st_mtime_ns for directory in directories)
+
+    def _resolve_layout(self, layout):
+        marker = self.data_dir / self.LAYOUT_FILENAME
+        recorded = marker.read_text().strip() if marker.exists() else None
+
+        if layout is None:
+            layout = recorded or "flat"
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown storage layout: {layout}")
+        if recorded == "sharded" and layout == "flat":
+            raise ValueError("Data directory uses the sharded layout")
+
+        if layout == "sharded" and recorded != "sharded":
+            marker.write_text("sharded\n")
+        return layout
+
+    def _write_layout_marker(self):
+        (self.data_dir / self.LAYOUT_FILENAME).write_text(f"{self.layout}\n")
+
+    def _shard_directory(self, expense):
+        match = SHARD_DATE_PATTERN.match(expense.date or "") or SHARD_ID_PATTERN.match(expense.id)
+        if match is None:
+            return ""
+        year, month = match.groups()
+        return f"{year}/{month}"
+
+    def _shard_directories(self, start_date=None, end_date=None):
+        start_month = start_date[:7] if start_date else None
+        end_month = end_date[:7] if end_date else None
+
+        directories = []
+        for year_dir in sorted(self._list_digit_dirs(self.data_dir, 4)):
+            year = year_dir.name
+            if start_month and year < start_month[:4]:
+                continue
+            if end_month and year > end_month[:4]:
+                continue
+            for month_dir in sorted(self._list_digit_dirs(year_dir, 2)):
+                month = f"{year}-{month_dir.name}"
+                if start_month and month < start_month:
+                    continue
+                if end_month and month > end_month:
+                    continue
+                directories.append(month_dir)
+        return directories
+
+    @staticmethod
+    def _list_digit_dirs(path, width):
+        with os.scandir(path) as entries:
+            return [Path(e.path) for e in entries
+                    if len(e.name) == width and e.name.isdigit() and e.is_dir()]
+
+    @staticmethod
+    def _is_expense_entry(entry):
+        return entry.name.startswith('exp_') and entry.name.endswith('.json')
+
+    def _iter_expense_entries(self, start_date=None, end_date=None):
+        if not self.data_dir.exists():
+            return
+
+        directories = [(self.data_dir, "")]
+        if self.layout == "sharded":
+            directories.extend(
+                (directory, directory.relative_to(self.data_dir).as_posix() + "/")
+                for directory in self._shard_directories(start_date, end_date)
+            )
+
+        for directory, prefix in directories:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if self._is_expense_entry(entry):
+                        yield prefix + entry.name, entry
+
+    def _parent_directories(self, relpath):
+        directory = (self.data_dir / relpath).parent
+        directories = [directory]
+        while directory != self.data_dir:
+            directory = directory.parent
+            directories.append(directory)
+        return directories
+
+    def _record_saved(self, saved, previous_records):
+        index = self.load_index()
+        added = 0
+        for expense, relpath, _ in saved:
+            previous = index.get(expense.id)
+            if previous is None:
+                added += 1
+            elif previous != relpath:
+                try:
+                    (self.data_dir / previous).unlink()
+                except FileNotFoundError:
+                    pass
+                self._load_cache.pop(previous, None)
+            self._load_cache.pop(relpath, None)
+        index.put_many([(expense.id, relpath) for expense, relpath, _ in saved])
+        if not saved:
+            return
+
+        records = [record for _, _, record in saved]
+        for summary in (self.aggregates, self.rollups):
+            for record in records:
+                old = previous_records.get(record["id"])
+                if old is not None:
+                    summary.remove(old)
+                summary.add(record)
+            summary.save()
+
+        if self.use_manifest:
+            self.manifest.put_many(records, self._manifest_signature(added))
+        self.search_index.put_many(records)
+
+        if self._ordered is not None:
+            for expense, _, _ in saved:
+                self._ordered[expense.id] = expense
+                self.by_date.add(expense)
+                self.by_created.add(expense)
+            self._ordered_mtime = self._directory_mtime()
+
+    def _previous_records(self, expense_ids):
+        # Records of expenses about to be overwritten or deleted, taken from
+        # the manifest when it is in memory and otherwise from their files.
+        records = {}
+        for expense_id in expense_ids:
+            relpath = self.index.get(expense_id)
+            if relpath is None:
+                continue
+            if self.use_manifest and self.manifest.loaded:
+                record = self.manifest.records.get(expense_id)
+            else:
+                try:
+                    with open(self.data_dir / relpath, 'r') as f:
+                        record = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    record = None
+            # A record that could not be counted was never added to the summaries.
+            if record is not None and _is_countable(record):
+                records[expense_id] = record
+        return records
+
+    def _write_temp_file(self, relpath, data):
+        target = self.data_dir / relpath
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path, handle = open_temp_file(target)
+        try:
+            json.dump(data, handle, indent=2)
+            handle.flush()
+        except BaseException:
+            handle.close()
+            tmp_path.unlink()
+            raise
+        return tmp_path, handle
+
+    def _commit_temp_file(self, tmp_path, handle, relpath, durable=True):
+        try:
+            if durable:
+                os.fsync(handle.fileno())
+            handle.close()
+            os.replace(tmp_path, self.data_dir / relpath)
+        except OSError:
+            handle.close()
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def _commit_chunk(self, chunk, result, durable, previous):
+        committed = []
+        for expense, relpath, record, tmp_path, handle in chunk:
+            try:
+                self._commit_temp_file(tmp_path, handle, relpath, durable)
+            except OSError as e:
+                result.add_failure(expense.id, e)
+                continue
+            committed.append((expense, relpath, record))
+            result.add_saved(expense.id)
+
+        self._record_saved(committed, previous)
+
+    def _fsync_directory(self, directory):
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _read_filtered(self, relpath, entry, expense_filter):
+        cached = self._load_cache.get(relpath)
+        if cached is not None:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                return None
+            if cached[0] == (stat.st_mtime_ns, stat.st_size, stat.st_ino):
+                _, expense, error = cached
+                if expense is None:
+                    print(f"Warning: Could not load {relpath}: {error}", file=sys.stderr)
+                    return None
+                return expense if expense_filter.matches(expense.to_dict()) else None
+
+        try:
+            with open(entry.path, 'r') as f:
+                data = json.load(f)
+            if not expense_filter.matches(data):
+                return None
+            return Expense.from_dict(data, strict=self.strict)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            print(f"Warning: Could not load {relpath}: {e}", file=sys.stderr)
+            return None
+
+    def _parse_expense_files(self, paths):
+        chunk_size = max(1, self.load_chunk_size)
+        if self.load_workers <= 1 or len(paths) <= chunk_size:
+            return _parse_expense_chunk(paths, self.strict)
+
+        # Imported here because concurrent.futures roughly doubles the import
+        # time of this module, and most commands never load in parallel.
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.process_pool_threshold is not None and len(paths) >= self.process_pool_threshold:
+            executor_class = ProcessPoolExecutor
+        else:
+            executor_class = ThreadPoolExecutor
+
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        parse_chunk = partial(_parse_expense_chunk, strict=self.strict)
+        results = []
+        with executor_class(max_workers=self.load_workers) as executor:
+            for chunk_result in executor.map(parse_chunk, chunks):
+                results.extend(chunk_result)
+        return results
+
+    def _find_expense_file(self, expense_id):
+        filename = self.load_index().get(expense_id)
+        if filename is None:
+            return None
+
+        filepath = self.data_dir / filename
+        return filepath if filepath.exists() else None
+
+    def _expense_file_exists(self, expense_id):
+        # Files are always named after their ID, in data_dir or in a shard.
+        filename = f"{expense_id}.json"
+        directories = [self.data_dir]
+        if self.layout == "sharded":
+            directories.extend(self._shard_directories())
+        return any((directory / filename).exists() for directory in directories)
 
     def get_expense_filename(self, expense):
         """
@@ -94,14 +1190,110 @@ class ExpenseStorage:
         """
         return f"{expense.id}.json"
 
+    def get_expense_path(self, expense):
+        """
+        Get the path of an expense file relative to the data directory.
+
+        In the sharded layout files live under YYYY/MM/ taken from the
+        expense date, falling back to the timestamp in the ID.
+
+        Args:
+            expense (Expense): The expense object
+
+        Returns:
+            str: Relative path using "/" separators
+        """
+        filename = self.get_expense_filename(expense)
+        if self.layout != "sharded":
+            return filename
+
+        shard = self._shard_directory(expense)
+        return f"{shard}/{filename}" if shard else filename
+
     def get_all_expense_files(self):
         """
-        Get list of all expense JSON files.
+        Get list of all expense JSON files, including files in shards.
 
         Returns:
             list[Path]: List of Path objects for expense files
         """
-        if not self.data_dir.exists():
-            return []
+        return [Path(entry.path) for _, entry in self._iter_expense_entries()]
+
+
+def _summary_record(expense):
+    """
+    Build the record an expense is counted by in the aggregates and rollups.
+
+    Called before the expense file is written, so an amount the summaries
+    cannot count is rejected instead of leaving a file that no index or
+    summary knows about.
+
+    Args:
+        expense (Expense): The expense about to be saved
+
+    Returns:
+        dict: The manifest record of the expense
+
+    Raises:
+        ValueError: If the amount cannot be converted to cents
+    """
+    record = manifest_record(expense)
+    cents_from_dict(record)
+    return record
+
+
+def _is_countable(record):
+    try:
+        cents_from_dict(record)
+    except (KeyError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _countable_records(records):
+    # Files written by hand or before amounts were checked can hold an
+    # amount such as NaN; skip them like the loaders skip unreadable files,
+    # so one bad file does not make every summary rebuild fail.
+    for record in records:
+        if _is_countable(record):
+            yield record
+        else:
+            print(f"Warning: Could not count expense {record.get('id')}: amount is not a valid number", file=sys.stderr)
+
+
+def _parse_expense_chunk(paths, strict=False):
+    """
+    Read and decode a batch of expense files.
+
+    Kept at module level so it can be shipped to a process pool.
+
+    Args:
+        paths (list[str]): Paths of the files to parse
+        strict (bool): Validate each expense through Expense.__init__
+
+    Returns:
+        list[tuple]: (Expense, None) or (None, error message) per path, in order
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                results.append((Expense.from_dict(json.load(f), strict=strict), None))
+        except (OSError, json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            results.append((None, str(e)))
+    return results
+
+
+def main(argv=None):
+    """Migrate a flat data directory to the sharded YYYY/MM layout."""
+    parser = argparse.ArgumentParser(description="Move exp_*.json files into YYYY/MM shards.")
+    parser.add_argument("data_dir", nargs="?", default="data",
+                        help="data directory to migrate (default: data)")
+    args = parser.parse_args(argv)
+
+    moved = ExpenseStorage(args.data_dir).migrate_to_sharded()
+    print(f"Moved {moved} expense files into shards under {args.data_dir}")
+
 
-        return [f for f in self.data_dir.iterdir() if f.suffix == '.json' and f.name.startswith('exp_')]
+if __name__ == "__main__":
+    main()
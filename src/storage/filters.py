@@ -0,0 +1,120 @@
+import re
+from datetime import datetime, timedelta, timezone
+from src.models.money import amount_from_dict
+
+
+ID_TIMESTAMP_PATTERN = re.compile(r"^exp_(\d{8}_\d{6})_")
+ID_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+class ExpenseFilter:
+    """
+    Predicate over raw expense dictionaries used by the streaming APIs.
+
+    Filters are checked against the decoded JSON dictionary before an
+    Expense object is built, and the created_at bounds can also be checked
+    against the timestamp embedded in an expense ID so that whole files are
+    skipped without being opened. All bounds are inclusive.
+    """
+
+    def __init__(self, category=None, start_date=None, end_date=None,
+                 min_amount=None, max_amount=None, created_from=None, created_to=None):
+        """
+        Initialize the filter.
+
+        Args:
+            category (str, optional): Only expenses in this category
+            start_date (str, optional): Earliest expense date (YYYY-MM-DD)
+            end_date (str, optional): Latest expense date (YYYY-MM-DD)
+            min_amount (float, optional): Smallest amount
+            max_amount (float, optional): Largest amount
+            created_from (str, optional): Earliest created_at (ISO format)
+            created_to (str, optional): Latest created_at (ISO format)
+        """
+        self.category = category
+        self.start_date = start_date
+        self.end_date = end_date
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.created_from = created_from
+        self.created_to = created_to
+
+        # created_at is taken a moment after the ID timestamp, so it can roll
+        # into the next second; allow one second of slack on the lower bound.
+        self._id_lower = None
+        self._id_upper = None
+        if created_from:
+            lower = datetime.fromisoformat(created_from) - timedelta(seconds=1)
+            self._id_lower = min(_id_timestamps(lower))
+        if created_to:
+            self._id_upper = max(_id_timestamps(datetime.fromisoformat(created_to)))
+
+    def may_match_id(self, expense_id):
+        """
+        Check whether an expense ID could satisfy the created_at bounds.
+
+        IDs that do not carry a timestamp always pass.
+
+        Args:
+            expense_id (str): Expense ID or filename stem
+
+        Returns:
+            bool: False only if the ID proves the expense is out of range
+        """
+        if self._id_lower is None and self._id_upper is None:
+            return True
+
+        match = ID_TIMESTAMP_PATTERN.match(expense_id)
+        if not match:
+            return True
+
+        timestamp = match.group(1)
+        if self._id_lower is not None and timestamp < self._id_lower:
+            return False
+        if self._id_upper is not None and timestamp > self._id_upper:
+            return False
+        return True
+
+    def matches(self, data):
+        """
+        Check a decoded expense dictionary against every filter.
+
+        Args:
+            data (dict): Expense dictionary as produced by Expense.to_dict
+
+        Returns:
+            bool: True if the expense passes all filters
+        """
+        if self.category is not None and data["category"] != self.category:
+            return False
+
+        date = data.get("date")
+        if self.start_date is not None and (date is None or date < self.start_date):
+            return False
+        if self.end_date is not None and (date is None or date > self.end_date):
+            return False
+
+        amount = amount_from_dict(data)
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        if self.max_amount is not None and amount > self.max_amount:
+            return False
+
+        created_at = data.get("created_at")
+        if self.created_from is not None and (created_at is None or created_at < self.created_from):
+            return False
+        if self.created_to is not None and (created_at is None or created_at > self.created_to):
+            return False
+
+        return True
+
+
+def _id_timestamps(moment):
+    # created_at is local time while IDs carry UTC, and IDs written before
+    # that carried local time too, so a bound covers every reading: the
+    # local wall clock and both UTC instants of an ambiguous local time.
+    timestamps = [moment.strftime(ID_TIMESTAMP_FORMAT)]
+    for fold in (0, 1):
+        utc = moment.replace(fold=fold).astimezone(timezone.utc)
+        timestamps.append(utc.strftime(ID_TIMESTAMP_FORMAT))
+    return timestamps
@@ -0,0 +1,157 @@
+import json
+import os
+from pathlib import Path
+from src.storage.atomic_file import file_signature, open_temp_file
+
+
+class ExpenseIndex:
+    """
+    Persistent mapping of expense IDs to the files that hold them.
+
+    The index lives in a single journal file inside the data directory. Every
+    change is appended as one JSON line, so updates cost a single small write
+    regardless of how many expenses exist. The journal is compacted whenever
+    it is rebuilt or grows well past the number of live entries.
+    """
+
+    COMPACT_RATIO = 2
+
+    def __init__(self, index_path):
+        """
+        Initialize the index for a journal file.
+
+        Args:
+            index_path (str or Path): Path to the index journal file
+        """
+        self.index_path = Path(index_path)
+        self._entries = None
+        self._signature = None
+
+    @property
+    def loaded(self):
+        """bool: True once the index has been read or rebuilt."""
+        return self._entries is not None
+
+    def load(self):
+        """
+        Read the journal from disk.
+
+        Returns:
+            bool: True if the journal was read, False if it is missing or
+            corrupted and needs to be rebuilt
+        """
+        if not self.index_path.exists():
+            return False
+
+        entries = {}
+        line_count = 0
+        try:
+            with open(self.index_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    line_count += 1
+                    if record["file"] is None:
+                        entries.pop(record["id"], None)
+                    else:
+                        entries[record["id"]] = record["file"]
+                signature = file_signature(f.fileno())
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        self._entries = entries
+        self._signature = signature
+        if line_count > self.COMPACT_RATIO * max(len(entries), 1):
+            self.write(entries)
+        return True
+
+    def changed_on_disk(self):
+        """
+        Check whether another writer changed the journal since it was last read or written.
+
+        Returns:
+            bool: True if the journal on disk is not the version held in memory
+        """
+        return file_signature(self.index_path) != self._signature
+
+    def get(self, expense_id):
+        """
+        Look up the filename for an expense ID.
+
+        Args:
+            expense_id (str): The ID of the expense
+
+        Returns:
+            str or None: Filename relative to the data directory, or None
+        """
+        return self._entries.get(expense_id)
+
+    def put(self, expense_id, filename):
+        """
+        Record that an expense is stored in the given file.
+
+        Args:
+            expense_id (str): The ID of the expense
+            filename (str): Filename relative to the data directory
+        """
+        self.put_many([(expense_id, filename)])
+
+    def put_many(self, items):
+        """
+        Record several expense files with a single journal write.
+
+        Only the journal is touched when the index has not been loaded, so
+        the caller must know that the journal exists and the IDs are new.
+
+        Args:
+            items (iterable[tuple]): (expense_id, filename) pairs
+        """
+        records = []
+        for expense_id, filename in items:
+            if self._entries is not None:
+                if self._entries.get(expense_id) == filename:
+                    continue
+                self._entries[expense_id] = filename
+            records.append({"id": expense_id, "file": filename})
+        self._append(*records)
+
+    def remove(self, expense_id):
+        """
+        Remove an expense ID from the index.
+
+        Args:
+            expense_id (str): The ID of the expense
+        """
+        if self._entries.pop(expense_id, None) is not None:
+            self._append({"id": expense_id, "file": None})
+
+    def write(self, entries):
+        """
+        Replace the index with the given entries and compact the journal.
+
+        Args:
+            entries (dict): Mapping of expense ID to filename
+        """
+        tmp_path, f = open_temp_file(self.index_path)
+        with f:
+            for expense_id, filename in entries.items():
+                f.write(json.dumps({"id": expense_id, "file": filename}) + "\n")
+        os.replace(tmp_path, self.index_path)
+        self._entries = dict(entries)
+        self._signature = file_signature(self.index_path)
+
+    def __len__(self):
+        return len(self._entries) if self._entries is not None else 0
+
+    def _append(self, *records):
+        if not records:
+            return
+        # Only vouch for the new version if we held the previous one; otherwise
+        # another writer's lines are still unread and the index must reload.
+        current = self._entries is not None and not self.changed_on_disk()
+        with open(self.index_path, 'a') as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+            if current:
+                f.flush()
+                self._signature = file_signature(f.fileno())
@@ -0,0 +1,600 @@
+import heapq
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from src.models.expense import Expense
+from src.models.expense_batch import ExpenseBatch
+from src.models.money import from_cents
+from src.storage.aggregates import CategoryAggregates
+from src.storage.atomic_file import file_signature, open_temp_file
+from src.storage.budgets import BudgetLimits, current_month, month_bounds
+from src.storage.directory_lock import DirectoryLock
+from src.storage.filters import ExpenseFilter
+from src.storage.rollups import ExpenseRollups
+from src.storage.search_index import matches, parse_query
+from src.storage.save_result import SaveResult
+
+
+class LogExpenseStorage:
+    """
+    Append-only storage backend that keeps expenses in JSONL segment files.
+
+    Saves append a record line and deletes append a tombstone line to the
+    active segment, so no per-expense file is ever created. Loading replays
+    the segments in order with one sequential read per segment. Once the share
+    of dead records (overwritten puts and tombstones) crosses
+    ``compact_threshold``, the sealed segments are rewritten into a single
+    fresh segment holding only live records.
+
+    Processes sharing a data directory take turns through a DirectoryLock on
+    data/.lock around every append, replay and compaction swap. A writer
+    whose segments were appended to or compacted by another process since it
+    last read them replays the log again before it appends.
+    """
+
+    SEGMENT_PREFIX = "seg_"
+    SEGMENT_SUFFIX = ".jsonl"
+    BUDGETS_FILENAME = ".budgets.json"
+    LOCK_FILENAME = ".lock"
+
+    def __init__(self, data_dir="data", compact_threshold=0.5, min_compact_records=1000,
+                 max_segment_bytes=64 * 1024 * 1024, background=True, cents=False):
+        """
+        Initialize LogExpenseStorage with data directory path.
+
+        Args:
+            data_dir (str): Path to directory for storing segment files
+            compact_threshold (float): Dead-record ratio that triggers compaction
+            min_compact_records (int): Minimum number of records before compacting
+            max_segment_bytes (int): Size at which the active segment is rolled over
+            background (bool): Run compaction in a background thread
+            cents (bool): Write amounts as integer "amount_cents" fields.
+                Records in either format are always readable.
+        """
+        self.data_dir = Path(data_dir)
+        self.compact_threshold = compact_threshold
+        self.min_compact_records = min_compact_records
+        self.max_segment_bytes = max_segment_bytes
+        self.background = background
+        self.cents = cents
+
+        self._lock = DirectoryLock(self.data_dir / self.LOCK_FILENAME)
+        self._compactor = None
+        self._active = None
+        self._live_ids = None
+        self._record_count = 0
+        self._signature = None
+
+        self.ensure_data_directory()
+        self.budgets = BudgetLimits(self.data_dir / self.BUDGETS_FILENAME)
+
+    def ensure_data_directory(self):
+        """Create data directory if it doesn't exist."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+    def save_expense(self, expense):
+        """
+        Append an expense record to the active segment.
+
+        Args:
+            expense (Expense): The expense to save
+
+        Returns:
+            str: Path to the segment the record was written to
+        """
+        with self._lock:
+            self._ensure_state()
+            segment = self._append({"op": "put", "expense": expense.to_dict(self.cents)})
+            self._live_ids.add(expense.id)
+
+        self._maybe_compact()
+        return str(segment)
+
+    def save_expenses(self, expenses, durable=True):
+        """
+        Append many expense records with a single write and fsync.
+
+        Args:
+            expenses (iterable[Expense]): The expenses to save
+            durable (bool): fsync the segment once the batch is written
+
+        Returns:
+            SaveResult: IDs that were saved and (ID, error) pairs that failed
+        """
+        result = SaveResult()
+        lines = []
+        for expense in expenses:
+            try:
+                lines.append((expense.id, json.dumps({"op": "put", "expense": expense.to_dict(self.cents)})))
+            except (TypeError, ValueError) as e:
+                result.add_failure(expense.id, e)
+
+        with self._lock:
+            self._ensure_state()
+            self._append_lines([line for _, line in lines], durable)
+            for expense_id, _ in lines:
+                self._live_ids.add(expense_id)
+                result.add_saved(expense_id)
+
+        self._maybe_compact()
+        return result
+
+    def load_all_expenses(self):
+        """
+        Load all live expenses by replaying every segment in order.
+
+        Returns:
+            list[Expense]: List of all Expense objects
+        """
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        expenses = []
+        for expense_id, data in records.items():
+            try:
+                expenses.append(Expense.from_dict(data, strict=False))
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Warning: Could not load expense {expense_id}: {e}", file=sys.stderr)
+
+        return expenses
+
+    def load_expense_batch(self):
+        """
+        Load all live expenses into a columnar ExpenseBatch.
+
+        Replayed records go straight into the batch columns without
+        building Expense objects.
+
+        Returns:
+            ExpenseBatch: Every live expense, in the same order as load_all_expenses,
+            holding cents when the storage writes cents
+        """
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        batch = ExpenseBatch(self.cents)
+        for expense_id, data in records.items():
+            try:
+                batch.append_dict(data)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Warning: Could not load expense {expense_id}: {e}", file=sys.stderr)
+
+        return batch
+
+    def iter_expenses(self, category=None, start_date=None, end_date=None,
+                      min_amount=None, max_amount=None, created_from=None, created_to=None):
+        """
+        Yield live expenses that match the given filters.
+
+        Tombstones can appear anywhere after a record, so the segments are
+        replayed before yielding; filters are applied to the raw records so
+        only matching expenses are turned into Expense objects.
+
+        Args:
+            category (str, optional): Only expenses in this category
+            start_date (str, optional): Earliest expense date (YYYY-MM-DD)
+            end_date (str, optional): Latest expense date (YYYY-MM-DD)
+            min_amount (float, optional): Smallest amount
+            max_amount (float, optional): Largest amount
+            created_from (str, optional): Earliest created_at (ISO format)
+            created_to (str, optional): Latest created_at (ISO format)
+
+        Yields:
+            Expense: Each matching expense
+        """
+        expense_filter = ExpenseFilter(category, start_date, end_date, min_amount,
+                                       max_amount, created_from, created_to)
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        for expense_id, data in records.items():
+            try:
+                if expense_filter.matches(data):
+                    yield Expense.from_dict(data, strict=False)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Warning: Could not load expense {expense_id}: {e}", file=sys.stderr)
+
+    def load_newest_expenses(self, limit, offset=0):
+        """
+        Load the most recently created expenses, ordered by ID.
+
+        The newest IDs are picked with a heap bounded to offset + limit
+        entries, so the rest of the log is never sorted.
+
+        Args:
+            limit (int): Maximum number of expenses to return
+            offset (int): Number of newest expenses to skip, for paging
+
+        Returns:
+            list[Expense]: Up to limit expenses, newest first
+        """
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        expenses = []
+        for expense_id in heapq.nlargest(offset + limit, records)[offset:]:
+            try:
+                expenses.append(Expense.from_dict(records[expense_id], strict=False))
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Warning: Could not load expense {expense_id}: {e}", file=sys.stderr)
+        return expenses
+
+    def load_expenses_by_date_range(self, start_date=None, end_date=None):
+        """
+        Load expenses whose date falls in an inclusive range, newest first.
+
+        Args:
+            start_date (str, optional): First date (YYYY-MM-DD) to include
+            end_date (str, optional): Last date (YYYY-MM-DD) to include
+
+        Returns:
+            list[Expense]: Matching expenses ordered by date descending
+        """
+        return sorted(self.iter_expenses(start_date=start_date, end_date=end_date),
+                      key=lambda e: (e.date, e.id), reverse=True)
+
+    def search_expenses(self, query, limit=None):
+        """
+        Find expenses whose description or category contains every query word.
+
+        Scans a replay of the log with the same matching rules as the JSON
+        backend's inverted index.
+
+        Args:
+            query (str): Words that must all appear; a trailing "*" makes a
+                word a prefix
+            limit (int, optional): Return only this many of the newest matches
+
+        Returns:
+            list[Expense]: Matching expenses, newest first
+
+        Raises:
+            ValueError: If the query has no searchable word
+        """
+        terms = parse_query(query)
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        expense_ids = [expense_id for expense_id, data in records.items()
+                       if matches(terms, data.get("description"), data.get("category"))]
+        if limit is None:
+            expense_ids.sort(reverse=True)
+        else:
+            expense_ids = heapq.nlargest(limit, expense_ids)
+        return [Expense.from_dict(records[expense_id], strict=False) for expense_id in expense_ids]
+
+    def get_category_summary(self):
+        """
+        Get count, total, min, max and latest date per category.
+
+        Computed from a replay of the segments, so unlike the JSON backend
+        this is O(number of records).
+
+        Returns:
+            dict: Category to a dict with count, total_cents, total, min, max
+            and latest_date, ordered by category
+        """
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        aggregates = CategoryAggregates(os.devnull)
+        aggregates.rebuild(records.values())
+        return aggregates.summary()
+
+    def get_spending_rollup(self, start_date=None, end_date=None, granularity="month"):
+        """
+        Get per-category spending per day or month in a date range.
+
+        Computed from a replay of the segments, so unlike the JSON backend
+        this is O(number of records).
+
+        Args:
+            start_date (str, optional): First date included (YYYY-MM-DD)
+            end_date (str, optional): Last date included (YYYY-MM-DD)
+            granularity (str): "day" or "month"
+
+        Returns:
+            dict: Bucket key (YYYY-MM-DD or YYYY-MM) to
+            ``{category: {"count", "total_cents", "total"}}``, ordered by key
+
+        Raises:
+            ValueError: If the granularity is not supported
+        """
+        with self._lock:
+            records, _ = self._replay(self.get_segment_files())
+
+        rollups = ExpenseRollups(os.devnull)
+        rollups.rebuild(records.values())
+        return rollups.query(start_date, end_date, granularity)
+
+    def get_budgets(self):
+        """
+        Get the monthly budget of every category that has one.
+
+        Returns:
+            dict: Category to monthly limit, ordered by category
+        """
+        return {category: from_cents(cents) for category, cents in sorted(self.budgets.limits.items())}
+
+    def set_budget(self, category, amount):
+        """
+        Set the monthly budget of a category in data/.budgets.json.
+
+        Args:
+            category (str): The category
+            amount (float): Monthly limit
+
+        Raises:
+            ValueError: If the amount is not a positive number
+        """
+        with self._lock:
+            self.budgets.set(category, amount)
+            self.budgets.save()
+
+    def remove_budget(self, category):
+        """
+        Remove the monthly budget of a category.
+
+        Args:
+            category (str): The category
+
+        Returns:
+            bool: True if the category had a budget
+        """
+        with self._lock:
+            if not self.budgets.remove(category):
+                return False
+            self.budgets.save()
+            return True
+
+    def get_budget_status(self, month=None):
+        """
+        Get spending against the budget of every budgeted category in a month.
+
+        Month-to-date spending comes from get_spending_rollup, so unlike the
+        JSON backend this is O(number of records).
+
+        Args:
+            month (str, optional): Month as YYYY-MM. Defaults to this month.
+
+        Returns:
+            dict: Category to a dict with count, limit, spent, remaining (and
+            their *_cents forms) and over, ordered by category
+
+        Raises:
+            ValueError: If the month is not in YYYY-MM format
+        """
+        month = month or current_month()
+        first, last = month_bounds(month)
+        if not self.budgets.limits:
+            return {}
+        spending = self.get_spending_rollup(first, last)
+        return self.budgets.status(spending.get(month, {}))
+
+    def delete_expense(self, expense_id):
+        """
+        Delete an expense by appending a tombstone record.
+
+        Args:
+            expense_id (str): The ID of the expense to delete
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        with self._lock:
+            self._ensure_state()
+            if expense_id not in self._live_ids:
+                return False
+
+            self._append({"op": "delete", "id": expense_id})
+            self._live_ids.discard(expense_id)
+
+        self._maybe_compact()
+        return True
+
+    def dead_ratio(self):
+        """
+        Get the share of records in the log that no longer hold live data.
+
+        Returns:
+            float: Dead records divided by total records (0.0 for an empty log)
+        """
+        with self._lock:
+            self._ensure_state()
+            if not self._record_count:
+                return 0.0
+            return (self._record_count - len(self._live_ids)) / self._record_count
+
+    def compact(self):
+        """
+        Rewrite all sealed segments into one segment of live records.
+
+        The active segment is sealed first and new writes go to a fresh
+        segment, so saves and deletes can continue while the rewrite runs.
+        Another process may still append to a sealed segment meanwhile; the
+        swap checks for that under the lock and rewrites the segments again,
+        and gives up if another process compacted them first.
+        """
+        with self._lock:
+            self._ensure_state()
+            sealed = self.get_segment_files()
+            if not sealed:
+                return
+            last_number = self._segment_number(sealed[-1])
+            target = self._segment_path(last_number + 1)
+            self._close_active()
+            self._active_path = self._segment_path(last_number + 2)
+            sealed_signature = self._segments_signature(sealed)
+            records, sealed_count = self._replay(sealed)
+
+        tmp_path = self._write_segment(target, records)
+
+        with self._lock:
+            try:
+                if target.exists() or not all(segment.exists() for segment in sealed):
+                    tmp_path.unlink()
+                    return
+                if self._segments_signature(sealed) != sealed_signature:
+                    tmp_path.unlink()
+                    records, sealed_count = self._replay(sealed)
+                    tmp_path = self._write_segment(target, records)
+                current = self._live_ids is not None and not self._state_changed()
+                os.replace(tmp_path, target)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            for segment in sealed:
+                segment.unlink()
+            if not current or self._active_path in sealed:
+                # Our view included records we never read; replay on next use.
+                self._reset_state()
+            else:
+                self._record_count -= sealed_count - len(records)
+                self._signature = self._segments_signature()
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self):
+        """Wait for compaction and close the active segment."""
+        self.wait_for_compaction()
+        with self._lock:
+            self._close_active()
+
+    def get_segment_files(self):
+        """
+        Get list of all segment files in replay order.
+
+        Returns:
+            list[Path]: Segment paths sorted by segment number
+        """
+        if not self.data_dir.exists():
+            return []
+
+        segments = [
+            f for f in self.data_dir.iterdir()
+            if f.name.startswith(self.SEGMENT_PREFIX) and f.suffix == self.SEGMENT_SUFFIX
+        ]
+        return sorted(segments, key=self._segment_number)
+
+    def _ensure_state(self):
+        if self._live_ids is not None:
+            if not self._state_changed():
+                return
+            # Another process appended to or compacted the log since we read it.
+            self._reset_state()
+
+        segments = self.get_segment_files()
+        records, self._record_count = self._replay(segments)
+        self._live_ids = set(records)
+        last_number = self._segment_number(segments[-1]) if segments else 0
+        self._active_path = self._segment_path(max(last_number, 1))
+        self._signature = self._segments_signature(segments)
+
+    def _reset_state(self):
+        self._close_active()
+        self._live_ids = None
+        self._signature = None
+
+    def _state_changed(self):
+        if self._active is not None:
+            # A compaction elsewhere may have unlinked the segment our handle writes to.
+            on_disk = file_signature(self._active_path)
+            if on_disk is None or on_disk[0] != file_signature(self._active.fileno())[0]:
+                return True
+        return self._segments_signature() != self._signature
+
+    def _segments_signature(self, segments=None):
+        if segments is None:
+            segments = self.get_segment_files()
+        return tuple((segment.name, file_signature(segment)) for segment in segments)
+
+    def _write_segment(self, target, records):
+        tmp_path, f = open_temp_file(target)
+        try:
+            with f:
+                for data in records.values():
+                    f.write(json.dumps({"op": "put", "expense": data}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path
+
+    def _replay(self, segments):
+        records = {}
+        count = 0
+        for segment in segments:
+            with open(segment, 'r') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if record["op"] == "put":
+                            data = record["expense"]
+                            records[data["id"]] = data
+                        else:
+                            records.pop(record["id"], None)
+                        count += 1
+                    except (json.JSONDecodeError, KeyError, TypeError) as e:
+                        print(f"Warning: Could not load {segment.name} line {line_number}: {e}", file=sys.stderr)
+
+        return records, count
+
+    def _append(self, record):
+        return self._append_raw(json.dumps(record) + "\n", 1)
+
+    def _append_raw(self, text, record_count):
+        if self._active is None:
+            self._active = open(self._active_path, 'a')
+        elif self._active.tell() >= self.max_segment_bytes:
+            self._close_active()
+            self._active_path = self._segment_path(self._segment_number(self._active_path) + 1)
+            self._active = open(self._active_path, 'a')
+
+        self._active.write(text)
+        self._active.flush()
+        self._record_count += record_count
+        self._signature = self._segments_signature()
+        return self._active_path
+
+    def _append_lines(self, lines, durable):
+        if not lines:
+            return
+        self._append_raw("".join(line + "\n" for line in lines), len(lines))
+        if durable:
+            os.fsync(self._active.fileno())
+
+    def _close_active(self):
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+    def _maybe_compact(self):
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if self._record_count < self.min_compact_records:
+                return
+            if self.dead_ratio() < self.compact_threshold:
+                return
+
+            if self.background:
+                self._compactor = threading.Thread(target=self.compact, daemon=True)
+                self._compactor.start()
+                return
+
+        self.compact()
+
+    def _segment_path(self, number):
+        return self.data_dir / f"{self.SEGMENT_PREFIX}{number:06d}{self.SEGMENT_SUFFIX}"
+
+    def _segment_number(self, path):
+        return int(Path(path).stem[len(self.SEGMENT_PREFIX):])
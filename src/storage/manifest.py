@@ -0,0 +1,182 @@
+import json
+import os
+from pathlib import Path
+from src.storage.atomic_file import open_temp_file
+
+
+MANIFEST_FIELDS = ("id", "date", "category", "amount", "created_at", "description")
+
+
+class ExpenseManifest:
+    """
+    Single-file summary of every expense in a data directory.
+
+    The manifest is a JSON lines journal. ``put`` and ``delete`` lines record
+    changes and a ``sync`` line records the directory signature (expense file
+    count and directory mtime) the manifest was known to match at that point.
+    Reading it replays the journal; a signature that no longer matches the
+    directory means files were changed behind our back and the manifest must
+    be rebuilt.
+    """
+
+    COMPACT_RATIO = 2
+    TAIL_BYTES = 4096
+
+    def __init__(self, manifest_path):
+        """
+        Initialize the manifest for a journal file.
+
+        Args:
+            manifest_path (str or Path): Path to the manifest journal file
+        """
+        self.manifest_path = Path(manifest_path)
+        self.records = None
+        self.signature = None
+        self._line_count = 0
+
+    @property
+    def loaded(self):
+        """bool: True once the manifest has been read or rebuilt."""
+        return self.records is not None
+
+    def load(self):
+        """
+        Read the journal from disk.
+
+        Returns:
+            bool: True if the journal was read, False if it is missing or
+            corrupted and needs to be rebuilt
+        """
+        if not self.manifest_path.exists():
+            return False
+
+        records = {}
+        signature = None
+        line_count = 0
+        try:
+            with open(self.manifest_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    line_count += 1
+                    if entry["op"] == "put":
+                        records[entry["expense"]["id"]] = entry["expense"]
+                    elif entry["op"] == "delete":
+                        records.pop(entry["id"], None)
+                    else:
+                        signature = (entry["count"], entry["mtime_ns"])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        if signature is None:
+            return False
+
+        self.records = records
+        self.signature = signature
+        self._line_count = line_count
+        return True
+
+    def read_signature(self):
+        """
+        Read the last recorded directory signature without loading the journal.
+
+        Every append ends with a sync line, so only the tail of the file is
+        read.
+
+        Returns:
+            tuple or None: (count, mtime_ns), or None if the journal is missing
+            or does not end with a sync line
+        """
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(size - self.TAIL_BYTES, 0))
+                entry = json.loads(f.read().splitlines()[-1])
+            if entry["op"] != "sync":
+                return None
+            return entry["count"], entry["mtime_ns"]
+        except (OSError, IndexError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    @property
+    def needs_compaction(self):
+        """bool: True when the journal holds far more lines than live records."""
+        return self._line_count > self.COMPACT_RATIO * (len(self.records or ()) + 1)
+
+    def put_many(self, records, signature_fn):
+        """
+        Add or replace expense summaries.
+
+        Only the journal is touched when the manifest has not been loaded.
+
+        Args:
+            records (list[dict]): Expense summaries keyed by MANIFEST_FIELDS
+            signature_fn (callable): Returns the directory signature after the change
+        """
+        if self.records is not None:
+            for record in records:
+                self.records[record["id"]] = record
+        self._append([{"op": "put", "expense": record} for record in records], signature_fn)
+
+    def remove(self, expense_id, signature_fn):
+        """
+        Remove an expense summary.
+
+        Args:
+            expense_id (str): The ID of the expense
+            signature_fn (callable): Returns the directory signature after the change
+        """
+        self.records.pop(expense_id, None)
+        self._append([{"op": "delete", "id": expense_id}], signature_fn)
+
+    def sync(self, signature_fn):
+        """
+        Record a new directory signature without changing any expense.
+
+        Args:
+            signature_fn (callable): Returns the current directory signature
+        """
+        self._append([], signature_fn)
+
+    def write(self, records, signature_fn):
+        """
+        Replace the manifest with the given summaries and compact the journal.
+
+        The signature is taken after the new file is renamed into place, so the
+        rename itself does not count as drift.
+
+        Args:
+            records (dict): Mapping of expense ID to summary
+            signature_fn (callable): Returns the directory signature
+        """
+        tmp_path, f = open_temp_file(self.manifest_path)
+        with f:
+            for record in records.values():
+                f.write(json.dumps({"op": "put", "expense": record}) + "\n")
+        os.replace(tmp_path, self.manifest_path)
+        self.records = dict(records)
+        self._line_count = len(records)
+        self._append([], signature_fn)
+
+    def _append(self, entries, signature_fn):
+        self.signature = signature_fn()
+        count, mtime_ns = self.signature
+        entries = entries + [{"op": "sync", "count": count, "mtime_ns": mtime_ns}]
+        with open(self.manifest_path, 'a') as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        self._line_count += len(entries)
+
+
+def manifest_record(expense):
+    """
+    Build the manifest summary for an expense.
+
+    Args:
+        expense (Expense): The expense to summarize
+
+    Returns:
+        dict: Summary keyed by MANIFEST_FIELDS
+    """
+    data = expense.to_dict()
+    return {field: data[field] for field in MANIFEST_FIELDS}
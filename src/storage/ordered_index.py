@@ -0,0 +1,108 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+# Sorts after every expense ID, so (key, _HIGHEST) bounds all entries for key.
+_HIGHEST = "\U0010ffff"
+
+
+class OrderedIndex:
+    """
+    In-memory secondary index keeping expense IDs sorted by one field.
+
+    Entries are ``(value, expense_id)`` pairs held in a sorted list, so ties
+    on the field are broken by ID, which is itself ordered by creation time.
+    Lookups and range bounds are found by bisection in O(log n); inserting
+    or removing one expense shifts the list once instead of re-sorting it.
+    Ordered iteration in either direction needs no sort at all. The value
+    each ID was indexed under is remembered, so an expense object mutated
+    after it was added can still be removed or re-added correctly.
+    """
+
+    def __init__(self, field):
+        """
+        Initialize an empty index.
+
+        Args:
+            field (str): Expense attribute to order by, e.g. "date" or "created_at"
+        """
+        self.field = field
+        self._entries = []
+        self._values = {}
+
+    def build(self, expenses):
+        """
+        Replace the contents with the given expenses, sorting once.
+
+        Args:
+            expenses (iterable[Expense]): Every expense to index
+        """
+        self._values = {expense.id: getattr(expense, self.field) for expense in expenses}
+        self._entries = sorted((value, expense_id) for expense_id, value in self._values.items())
+
+    def add(self, expense):
+        """
+        Insert an expense in order, replacing any entry with the same ID.
+
+        Args:
+            expense (Expense): The expense to index
+        """
+        self.remove(expense.id)
+        value = getattr(expense, self.field)
+        self._values[expense.id] = value
+        insort(self._entries, (value, expense.id))
+
+    def remove(self, expense_id):
+        """
+        Remove an expense from the index.
+
+        Args:
+            expense_id (str): The ID of the expense
+
+        Returns:
+            bool: True if it was indexed
+        """
+        value = self._values.pop(expense_id, None)
+        if value is None:
+            return False
+        del self._entries[bisect_left(self._entries, (value, expense_id))]
+        return True
+
+    def range(self, low=None, high=None, reverse=False):
+        """
+        Get the IDs whose field value falls in an inclusive range.
+
+        Args:
+            low (str, optional): Smallest value included
+            high (str, optional): Largest value included
+            reverse (bool): Return the largest values first
+
+        Returns:
+            list[str]: Matching expense IDs in field order
+        """
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        stop = len(self._entries) if high is None else bisect_right(self._entries, (high, _HIGHEST))
+        ids = [expense_id for _, expense_id in self._entries[start:stop]]
+        if reverse:
+            ids.reverse()
+        return ids
+
+    def last(self, limit, offset=0):
+        """
+        Get the IDs with the largest field values, largest first.
+
+        Args:
+            limit (int): Maximum number of IDs to return
+            offset (int): Number of largest values to skip first
+
+        Returns:
+            list[str]: Up to limit expense IDs
+        """
+        stop = max(len(self._entries) - offset, 0)
+        start = max(stop - limit, 0)
+        return [expense_id for _, expense_id in reversed(self._entries[start:stop])]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (expense_id for _, expense_id in self._entries)
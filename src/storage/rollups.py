@@ -0,0 +1,216 @@
+import calendar
+import json
+from pathlib import Path
+from src.models.money import cents_from_dict, from_cents
+from src.storage.atomic_file import file_signature, replace_file
+
+
+GRANULARITIES = ("day", "month")
+
+
+class ExpenseRollups:
+    """
+    Persisted day and month buckets of per-category spending.
+
+    Each bucket maps a category to ``[count, total_cents]``. Day buckets are
+    keyed by the expense date (``YYYY-MM-DD``) and month buckets by its month
+    (``YYYY-MM``); both are updated in O(1) when an expense is added or
+    removed. A range query reads whole months from the month buckets and only
+    falls back to day buckets for the partial months at either end, so it
+    never touches individual expenses.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize rollups backed by a file.
+
+        Args:
+            path (str or Path): Path to the rollups file
+        """
+        self.path = Path(path)
+        self.days = None
+        self.months = None
+        self._signature = None
+
+    @property
+    def loaded(self):
+        """bool: True once the rollups have been read or rebuilt."""
+        return self.days is not None
+
+    def load(self):
+        """
+        Read the rollups file.
+
+        Returns:
+            bool: True if it was read, False if it is missing or corrupted and
+            needs to be rebuilt
+        """
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+                signature = file_signature(f.fileno())
+            days = state["days"]
+            months = state["months"]
+        except FileNotFoundError:
+            return False
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        self.days = days
+        self.months = months
+        self._signature = signature
+        return True
+
+    def changed_on_disk(self):
+        """
+        Check whether another writer replaced the file since it was last read or saved.
+
+        Returns:
+            bool: True if the file on disk is not the version held in memory
+        """
+        return file_signature(self.path) != self._signature
+
+    def rebuild(self, records):
+        """
+        Recompute every bucket from scratch.
+
+        Args:
+            records (iterable[dict]): Expense dictionaries in either amount format
+        """
+        self.days = {}
+        self.months = {}
+        for data in records:
+            self.add(data)
+
+    def add(self, data):
+        """
+        Count an expense in its day and month buckets.
+
+        Args:
+            data (dict): Expense dictionary with category, date and amount
+        """
+        self._apply(data, 1)
+
+    def remove(self, data):
+        """
+        Stop counting an expense.
+
+        Args:
+            data (dict): Expense dictionary as it was counted
+        """
+        self._apply(data, -1)
+
+    def query(self, start_date=None, end_date=None, granularity="month"):
+        """
+        Get per-category spending for each bucket in a date range.
+
+        Args:
+            start_date (str, optional): First date included (YYYY-MM-DD)
+            end_date (str, optional): Last date included (YYYY-MM-DD)
+            granularity (str): "day" or "month"
+
+        Returns:
+            dict: Bucket key to ``{category: {"count", "total_cents", "total"}}``,
+            both ordered by key. Months cut by the range only count the days
+            inside it.
+
+        Raises:
+            ValueError: If the granularity is not supported
+        """
+        if granularity == "day":
+            buckets = ((day, self.days[day]) for day in sorted(self.days)
+                       if (start_date is None or day >= start_date)
+                       and (end_date is None or day <= end_date))
+        elif granularity == "month":
+            buckets = ((month, self._month_bucket(month, start_date, end_date))
+                       for month in sorted(self.months))
+        else:
+            raise ValueError(f"Granularity must be one of: {', '.join(GRANULARITIES)}")
+
+        return {key: _describe(bucket) for key, bucket in buckets if bucket}
+
+    def month_totals(self, month):
+        """
+        Get per-category spending of one month straight from its bucket.
+
+        Args:
+            month (str): Month as YYYY-MM
+
+        Returns:
+            dict: Category to ``{"count", "total_cents", "total"}``, ordered
+            by category; empty if nothing was spent
+        """
+        return _describe(self.months.get(month, {}))
+
+    def save(self):
+        """Write the rollups to disk atomically."""
+        # json.dumps encodes in C; json.dump streams through the Python encoder.
+        replace_file(self.path, json.dumps({"days": self.days, "months": self.months}))
+        self._signature = file_signature(self.path)
+
+    def _apply(self, data, sign):
+        date = data.get("date")
+        if not date:
+            return
+        cents = cents_from_dict(data)
+        for buckets, key in ((self.days, date), (self.months, date[:7])):
+            bucket = buckets.setdefault(key, {})
+            entry = bucket.setdefault(data["category"], [0, 0])
+            entry[0] += sign
+            entry[1] += sign * cents
+            if entry[0] <= 0:
+                del bucket[data["category"]]
+                if not bucket:
+                    del buckets[key]
+
+    def _month_bucket(self, month, start_date, end_date):
+        first = f"{month}-01"
+        last = f"{month}-{_days_in_month(month):02d}"
+        if (start_date is not None and start_date > last) or \
+                (end_date is not None and end_date < first):
+            return None
+        if (start_date is None or start_date <= first) and (end_date is None or end_date >= last):
+            return self.months[month]
+
+        low = int(start_date[8:10]) if start_date is not None and start_date > first else 1
+        high = int(end_date[8:10]) if end_date is not None and end_date < last else int(last[8:])
+        merged = {}
+        for day in range(low, high + 1):
+            for category, (count, cents) in self.days.get(f"{month}-{day:02d}", {}).items():
+                entry = merged.setdefault(category, [0, 0])
+                entry[0] += count
+                entry[1] += cents
+        return merged
+
+
+def diff_rollups(expected, actual):
+    """
+    List the categories whose day buckets differ.
+
+    Month buckets are sums of day buckets, so comparing days is enough.
+
+    Args:
+        expected (ExpenseRollups): Rollups recomputed from the expenses
+        actual (ExpenseRollups): Rollups that were maintained incrementally
+
+    Returns:
+        list[str]: Categories with a different count or total on any day, sorted
+    """
+    drifted = set()
+    for day in set(expected.days) | set(actual.days):
+        expected_day = expected.days.get(day, {})
+        actual_day = actual.days.get(day, {})
+        drifted.update(category for category in set(expected_day) | set(actual_day)
+                       if expected_day.get(category) != actual_day.get(category))
+    return sorted(drifted)
+
+
+def _describe(bucket):
+    return {
+        category: {"count": count, "total_cents": cents, "total": from_cents(cents)}
+        for category, (count, cents) in sorted(bucket.items())
+    }
+
+
+def _days_in_month(month):
+    return calendar.monthrange(int(month[:4]), int(month[5:7]))[1]
@@ -0,0 +1,40 @@
+class SaveResult:
+    """
+    Outcome of a bulk save.
+
+    Bulk saves keep going when a single record fails, so callers get the
+    IDs that were written together with an error message for each record
+    that was not.
+    """
+
+    def __init__(self):
+        """Initialize an empty result."""
+        self.saved = []
+        self.failed = []
+
+    def add_saved(self, expense_id):
+        """
+        Record a successfully written expense.
+
+        Args:
+            expense_id (str): The ID of the saved expense
+        """
+        self.saved.append(expense_id)
+
+    def add_failure(self, expense_id, error):
+        """
+        Record an expense that could not be written.
+
+        Args:
+            expense_id (str): The ID of the failed expense
+            error (Exception or str): What went wrong
+        """
+        self.failed.append((expense_id, str(error)))
+
+    @property
+    def ok(self):
+        """bool: True if every record was written."""
+        return not self.failed
+
+    def __repr__(self):
+        return f"SaveResult(saved={len(self.saved)}, failed={len(self.failed)})"
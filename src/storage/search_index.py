@@ -0,0 +1,301 @@
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left, insort
+from pathlib import Path
+from src.storage.atomic_file import file_signature, open_temp_file
+
+
+# Letters and digits of any script; "_" separates words like punctuation.
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+QUERY_TERM_PATTERN = re.compile(r"([^\W_]+)(\*?)")
+
+
+def tokenize(*texts):
+    """
+    Split text into case-folded tokens of letters and digits.
+
+    Args:
+        *texts (str): Text to split, e.g. a description and a category
+
+    Returns:
+        list[str]: Distinct tokens in first-seen order
+    """
+    tokens = {}
+    for text in texts:
+        for token in TOKEN_PATTERN.findall((text or "").casefold()):
+            tokens[token] = None
+    return list(tokens)
+
+
+def parse_query(query):
+    """
+    Split a search query into terms.
+
+    Args:
+        query (str): Words to find; a trailing "*" makes a word a prefix
+
+    Returns:
+        list[tuple]: (word, is_prefix) pairs
+
+    Raises:
+        ValueError: If the query has no searchable word
+    """
+    terms = [(word, bool(star)) for word, star in QUERY_TERM_PATTERN.findall(query.casefold())]
+    if not terms:
+        raise ValueError("Search query must contain a letter or digit")
+    return terms
+
+
+def matches(terms, description, category):
+    """
+    Check an expense against parsed query terms without an index.
+
+    Args:
+        terms (list[tuple]): Terms from parse_query
+        description (str): Expense description
+        category (str): Expense category
+
+    Returns:
+        bool: True if every term matches a token
+    """
+    tokens = tokenize(description, category)
+    return all(any(token.startswith(word) if prefix else token == word for token in tokens)
+               for word, prefix in terms)
+
+
+class SearchIndex:
+    """
+    Persisted inverted index from description and category tokens to expense IDs.
+
+    Like ExpenseIndex, the index is a JSON lines journal: every save appends
+    the new token list of an expense and every delete appends a tombstone,
+    so an update costs one small append however large the index is. Loading
+    replays the journal into postings (token to set of IDs) and a sorted
+    vocabulary used to expand prefix terms by bisection. The journal is
+    compacted when it grows well past the number of live expenses.
+
+    The first line records the tokenizer VERSION. A journal without it, or
+    from another version, does not load, so it is rebuilt with the current
+    tokens instead of silently missing words.
+    """
+
+    VERSION = 2
+    COMPACT_RATIO = 2
+    SCAN_RATIO = 8
+
+    def __init__(self, path):
+        """
+        Initialize the index for a journal file.
+
+        Args:
+            path (str or Path): Path to the journal file
+        """
+        self.path = Path(path)
+        self._documents = None
+        self._postings = None
+        self._vocabulary = None
+        self._signature = None
+
+    @property
+    def loaded(self):
+        """bool: True once the index has been read or rebuilt."""
+        return self._documents is not None
+
+    @property
+    def exists(self):
+        """bool: True if a journal is on disk to append to."""
+        return self.path.exists()
+
+    def load(self):
+        """
+        Read the journal from disk.
+
+        Returns:
+            bool: True if it was read, False if it is missing or corrupted and
+            needs to be rebuilt
+        """
+        if not self.path.exists():
+            return False
+
+        documents = {}
+        header = None
+        line_count = 0
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if header is None:
+                        header = record
+                        if header["version"] != self.VERSION:
+                            return False
+                        continue
+                    line_count += 1
+                    if record["tokens"] is None:
+                        documents.pop(record["id"], None)
+                    else:
+                        documents[record["id"]] = tuple(record["tokens"])
+                signature = file_signature(f.fileno())
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+
+        self._set_documents(documents)
+        self._signature = signature
+        if line_count > self.COMPACT_RATIO * max(len(documents), 1):
+            self.write()
+        return True
+
+    def changed_on_disk(self):
+        """
+        Check whether another writer changed the journal since it was last read or written.
+
+        Returns:
+            bool: True if the journal on disk is not the version held in memory
+        """
+        return file_signature(self.path) != self._signature
+
+    def rebuild(self, records):
+        """
+        Index every expense from scratch and rewrite the journal.
+
+        Args:
+            records (iterable[dict]): Expense dictionaries with id, description
+                and category
+        """
+        self._set_documents({data["id"]: tuple(tokenize(data.get("description"), data["category"]))
+                             for data in records})
+        self.write()
+
+    def put_many(self, records):
+        """
+        Index new or changed expenses with a single journal append.
+
+        Only the journal is touched when the index has not been loaded.
+
+        Args:
+            records (iterable[dict]): Expense dictionaries with id, description
+                and category
+        """
+        lines = []
+        for data in records:
+            tokens = tuple(tokenize(data.get("description"), data["category"]))
+            if self.loaded:
+                self._discard(data["id"])
+                self._index(data["id"], tokens)
+            lines.append({"id": data["id"], "tokens": list(tokens)})
+        self._append(lines)
+
+    def remove(self, expense_id):
+        """
+        Drop an expense from the index.
+
+        Args:
+            expense_id (str): The ID of the expense
+        """
+        if self.loaded:
+            self._discard(expense_id)
+        self._append([{"id": expense_id, "tokens": None}])
+
+    def search(self, query, limit=None):
+        """
+        Find the expenses matching every term of a query.
+
+        Exact terms are single dictionary lookups; prefix terms ("ub*") cover
+        the vocabulary tokens in a bisected range. Terms are applied most
+        selective first, by set intersection. A prefix term whose postings
+        far outnumber the remaining candidates is instead checked against
+        each candidate's indexed tokens, so a broad prefix costs little once
+        a narrow term is present.
+
+        Args:
+            query (str): Words that must all appear; a trailing "*" makes a
+                word a prefix
+            limit (int, optional): Return only this many of the newest matches
+
+        Returns:
+            list[str]: Matching expense IDs, newest first
+
+        Raises:
+            ValueError: If the query has no searchable word
+        """
+        terms = []
+        for word, prefix in parse_query(query):
+            tokens = self._term_tokens(word, prefix)
+            terms.append((sum(len(self._postings[token]) for token in tokens), tokens, word))
+        terms.sort(key=lambda term: term[0])
+
+        _, tokens, _ = terms[0]
+        matched = set().union(*(self._postings[token] for token in tokens))
+        for size, tokens, word in terms[1:]:
+            if not matched:
+                break
+            if len(tokens) == 1 or size <= self.SCAN_RATIO * len(matched):
+                matched.intersection_update(set().union(*(self._postings[token] for token in tokens)))
+            else:
+                matched = {expense_id for expense_id in matched
+                           if any(token.startswith(word) for token in self._documents[expense_id])}
+        if limit is None:
+            return sorted(matched, reverse=True)
+        return heapq.nlargest(limit, matched)
+
+    def write(self):
+        """Rewrite the journal with one line per live expense, atomically."""
+        tmp_path, f = open_temp_file(self.path)
+        with f:
+            f.write(json.dumps({"version": self.VERSION}) + "\n")
+            for expense_id, tokens in self._documents.items():
+                f.write(json.dumps({"id": expense_id, "tokens": list(tokens)}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._signature = file_signature(self.path)
+
+    def __len__(self):
+        return len(self._documents) if self._documents is not None else 0
+
+    def _term_tokens(self, word, prefix):
+        if not prefix:
+            return [word] if word in self._postings else []
+        start = position = bisect_left(self._vocabulary, word)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(word):
+            position += 1
+        return self._vocabulary[start:position]
+
+    def _set_documents(self, documents):
+        self._documents = {}
+        self._postings = {}
+        for expense_id, tokens in documents.items():
+            self._documents[expense_id] = tokens
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(expense_id)
+        self._vocabulary = sorted(self._postings)
+
+    def _index(self, expense_id, tokens):
+        self._documents[expense_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            postings.add(expense_id)
+
+    def _discard(self, expense_id):
+        for token in self._documents.pop(expense_id, ()):
+            postings = self._postings[token]
+            postings.discard(expense_id)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _append(self, lines):
+        if not lines or not self.path.exists():
+            return
+        # Lines another process appended since our last read keep the
+        # signature stale, so the next search reloads the journal.
+        current = self.loaded and not self.changed_on_disk()
+        with open(self.path, 'a') as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+            if current:
+                f.flush()
+                self._signature = file_signature(f.fileno())
@@ -0,0 +1,270 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+from src.storage.atomic_file import open_temp_file
+
+
+MAGIC = b"EXPSNAP1"
+VERSION = 1
+
+# magic, version, byte order, category count, row count, source file count,
+# source max mtime, then the offsets of the seven sections that follow.
+HEADER = struct.Struct("<8sHcxIQQQ7Q")
+
+
+class ExpenseSnapshot:
+    """
+    Read-only, memory-mapped columnar view of every expense.
+
+    Columns are exposed as memoryviews straight over the mapped file, so
+    aggregates walk packed arrays instead of building Expense objects:
+
+    - amounts: float64 per row
+    - dates: int32 day ordinal per row (0 for an unparseable date)
+    - category_codes: uint32 index into categories per row
+    - descriptions: UTF-8 string heap addressed by a uint64 offset array
+    """
+
+    def __init__(self, path):
+        """
+        Map a snapshot file into memory.
+
+        Args:
+            path (str or Path): Path to the snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot this code can read
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, byteorder, category_count, self.count, self.source_count,
+             self.source_mtime_ns, *offsets) = HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"{self.path.name} is not an expense snapshot")
+        if magic != MAGIC or version != VERSION or byteorder != sys.byteorder[0].encode():
+            self._mmap.close()
+            raise ValueError(f"{self.path.name} is not a compatible expense snapshot")
+
+        amounts_at, dates_at, codes_at, desc_index_at, cat_index_at, cat_heap_at, desc_heap_at = offsets
+        n = self.count
+        view = memoryview(self._mmap)
+        self._views = [view]
+
+        self.amounts = self._column(view, amounts_at, 8 * n, 'd')
+        self.dates = self._column(view, dates_at, 4 * n, 'i')
+        self.category_codes = self._column(view, codes_at, 4 * n, 'I')
+        self._description_offsets = self._column(view, desc_index_at, 8 * (n + 1), 'Q')
+        self._description_heap = self._slice(view, desc_heap_at, len(view))
+
+        category_offsets = self._column(view, cat_index_at, 8 * (category_count + 1), 'Q')
+        category_heap = self._slice(view, cat_heap_at, desc_heap_at)
+        self.categories = [
+            bytes(category_heap[category_offsets[i]:category_offsets[i + 1]]).decode('utf-8')
+            for i in range(category_count)
+        ]
+
+    def _slice(self, view, start, end):
+        part = view[start:end]
+        self._views.append(part)
+        return part
+
+    def _column(self, view, offset, length, typecode):
+        column = self._slice(view, offset, offset + length).cast(typecode)
+        self._views.append(column)
+        return column
+
+    def category(self, row):
+        """
+        Get the category of a row.
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            str: Category name
+        """
+        return self.categories[self.category_codes[row]]
+
+    def date(self, row):
+        """
+        Get the date of a row.
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            str or None: Date in ISO format, or None if it was unparseable
+        """
+        ordinal = self.dates[row]
+        return date.fromordinal(ordinal).isoformat() if ordinal else None
+
+    def description(self, row):
+        """
+        Get the description of a row from the string heap.
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            str: Description text
+        """
+        start = self._description_offsets[row]
+        end = self._description_offsets[row + 1]
+        return bytes(self._description_heap[start:end]).decode('utf-8')
+
+    def total(self):
+        """
+        Sum every amount.
+
+        Returns:
+            float: Grand total
+        """
+        return sum(self.amounts)
+
+    def category_totals(self, start_date=None, end_date=None):
+        """
+        Count and sum amounts per category, optionally within a date range.
+
+        Args:
+            start_date (str, optional): Earliest date (YYYY-MM-DD) to include
+            end_date (str, optional): Latest date (YYYY-MM-DD) to include
+
+        Returns:
+            dict: Mapping of category to (count, total), ordered by category
+        """
+        counts = [0] * len(self.categories)
+        sums = [0.0] * len(self.categories)
+
+        if start_date is None and end_date is None:
+            for code, amount in zip(self.category_codes, self.amounts):
+                counts[code] += 1
+                sums[code] += amount
+        else:
+            low = date.fromisoformat(start_date).toordinal() if start_date else 1
+            high = date.fromisoformat(end_date).toordinal() if end_date else date.max.toordinal()
+            for code, amount, ordinal in zip(self.category_codes, self.amounts, self.dates):
+                if low <= ordinal <= high:
+                    counts[code] += 1
+                    sums[code] += amount
+
+        return {
+            category: (counts[code], sums[code])
+            for code, category in sorted(enumerate(self.categories), key=lambda item: item[1])
+            if counts[code]
+        }
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_snapshot(expenses, path, source_count=0, source_mtime_ns=0):
+    """
+    Write expenses to a columnar snapshot file.
+
+    The file is written under a temporary name and renamed into place.
+
+    Args:
+        expenses (iterable[Expense]): Expenses to store
+        path (str or Path): Destination path
+        source_count (int): Number of source files the snapshot reflects
+        source_mtime_ns (int): Newest source file mtime the snapshot reflects
+
+    Returns:
+        int: Number of rows written
+    """
+    amounts = array('d')
+    dates = array('i')
+    codes = array('I')
+    description_offsets = array('Q', [0])
+    description_heap = bytearray()
+    category_codes = {}
+
+    for expense in expenses:
+        amounts.append(expense.amount)
+        dates.append(_date_ordinal(expense.date))
+        codes.append(category_codes.setdefault(expense.category, len(category_codes)))
+        description_heap += expense.description.encode('utf-8')
+        description_offsets.append(len(description_heap))
+
+    category_offsets = array('Q', [0])
+    category_heap = bytearray()
+    for category in category_codes:
+        category_heap += category.encode('utf-8')
+        category_offsets.append(len(category_heap))
+
+    sections = [amounts.tobytes(), dates.tobytes(), codes.tobytes(),
+                description_offsets.tobytes(), category_offsets.tobytes(),
+                bytes(category_heap), bytes(description_heap)]
+
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        position += -position % 8
+        offsets.append(position)
+        position += len(section)
+
+    header = HEADER.pack(MAGIC, VERSION, sys.byteorder[0].encode(), len(category_codes),
+                         len(amounts), source_count, source_mtime_ns, *offsets)
+
+    path = Path(path)
+    tmp_path, f = open_temp_file(path, 'wb')
+    with f:
+        f.write(header)
+        for offset, section in zip(offsets, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    return len(amounts)
+
+
+def _date_ordinal(value):
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def main(argv=None):
+    """Regenerate the columnar snapshot of a JSON data directory."""
+    from src.storage.expense_storage import ExpenseStorage
+
+    parser = argparse.ArgumentParser(description="Rebuild the expense snapshot when it is out of date.")
+    parser.add_argument("data_dir", nargs="?", default="data",
+                        help="data directory holding the expense files (default: data)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the snapshot is current")
+    args = parser.parse_args(argv)
+
+    storage = ExpenseStorage(args.data_dir)
+    if storage.regenerate_snapshot(force=args.force):
+        print(f"Snapshot rebuilt at {storage.snapshot_path}")
+    else:
+        print("Snapshot is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from src.models.expense import Expense
+from src.models.expense_batch import ExpenseBatch
+from src.models.money import from_cents, to_cents
+from src.storage.budgets import budget_entry, current_month, month_bounds
+from src.storage.rollups import GRANULARITIES
+from src.storage.search_index import matches, parse_query
+from src.storage.save_result import SaveResult
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id TEXT PRIMARY KEY,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    date TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses (category, date);
+CREATE INDEX IF NOT EXISTS idx_expenses_created_at ON expenses (created_at);
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    limit_cents INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "id, amount, category, description, date, created_at"
+FIELDS = tuple(COLUMNS.split(", "))
+
+
+class SQLiteExpenseStorage:
+    """
+    Storage backend that keeps expenses in a SQLite database.
+
+    The database runs in WAL mode and carries secondary indexes on date,
+    category and created_at, so deletes, date-range listings and category
+    grouping are answered by indexed queries.
+    """
+
+    DB_FILENAME = "expenses.db"
+
+    def __init__(self, data_dir="data", db_filename=None):
+        """
+        Initialize SQLiteExpenseStorage with data directory path.
+
+        Args:
+            data_dir (str): Path to directory holding the database file
+            db_filename (str, optional): Database filename. Defaults to expenses.db.
+        """
+        self.data_dir = Path(data_dir)
+        self.ensure_data_directory()
+        self.db_path = self.data_dir / (db_filename or self.DB_FILENAME)
+
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def ensure_data_directory(self):
+        """Create data directory if it doesn't exist."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+    def save_expense(self, expense):
+        """
+        Insert or replace a single expense row.
+
+        Args:
+            expense (Expense): The expense to save
+
+        Returns:
+            str: Path to the database file
+        """
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO expenses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                self._to_row(expense)
+            )
+        return str(self.db_path)
+
+    def save_expenses(self, expenses):
+        """
+        Insert or replace many expenses in a single transaction.
+
+        Rows that violate a constraint are reported in the result and the
+        rest of the batch is still committed.
+
+        Args:
+            expenses (iterable[Expense]): The expenses to save
+
+        Returns:
+            SaveResult: IDs that were saved and (ID, error) pairs that failed
+        """
+        result = SaveResult()
+        with self.connection:
+            for expense in expenses:
+                try:
+                    self.connection.execute(
+                        f"INSERT OR REPLACE INTO expenses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                        self._to_row(expense)
+                    )
+                except sqlite3.Error as e:
+                    result.add_failure(expense.id, e)
+                    continue
+                result.add_saved(expense.id)
+        return result
+
+    def load_all_expenses(self):
+        """
+        Load all expenses from the database.
+
+        Returns:
+            list[Expense]: List of all Expense objects
+        """
+        return self._query(f"SELECT {COLUMNS} FROM expenses")
+
+    def load_expense_batch(self):
+        """
+        Load all expenses into a columnar ExpenseBatch.
+
+        Rows go straight into the batch columns without building Expense
+        objects.
+
+        Returns:
+            ExpenseBatch: Every expense, in the same order as load_all_expenses
+        """
+        batch = ExpenseBatch()
+        for row in self.connection.execute(f"SELECT {COLUMNS} FROM expenses"):
+            try:
+                batch.append_dict(dict(zip(FIELDS, row)))
+            except ValueError as e:
+                print(f"Warning: Could not load expense {row[0]}: {e}", file=sys.stderr)
+        return batch
+
+    def load_expenses_by_date_range(self, start_date=None, end_date=None):
+        """
+        Load expenses whose date falls in an inclusive range, newest first.
+
+        Args:
+            start_date (str, optional): First date (YYYY-MM-DD) to include
+            end_date (str, optional): Last date (YYYY-MM-DD) to include
+
+        Returns:
+            list[Expense]: Matching expenses ordered by date descending
+        """
+        where, params = self._where(start_date=start_date, end_date=end_date)
+        return self._query(f"SELECT {COLUMNS} FROM expenses{where} ORDER BY date DESC", params)
+
+    def load_expenses_by_category(self, category):
+        """
+        Load expenses for one category, newest date first.
+
+        Args:
+            category (str): Category name
+
+        Returns:
+            list[Expense]: Matching expenses ordered by date descending
+        """
+        return self._query(
+            f"SELECT {COLUMNS} FROM expenses WHERE category = ? ORDER BY date DESC",
+            (category,)
+        )
+
+    def iter_expenses(self, category=None, start_date=None, end_date=None,
+                      min_amount=None, max_amount=None, created_from=None, created_to=None):
+        """
+        Lazily yield expenses that match the given filters.
+
+        Filters become a WHERE clause so the indexes do the work, and rows are
+        pulled from the cursor one at a time.
+
+        Args:
+            category (str, optional): Only expenses in this category
+            start_date (str, optional): Earliest expense date (YYYY-MM-DD)
+            end_date (str, optional): Latest expense date (YYYY-MM-DD)
+            min_amount (float, optional): Smallest amount
+            max_amount (float, optional): Largest amount
+            created_from (str, optional): Earliest created_at (ISO format)
+            created_to (str, optional): Latest created_at (ISO format)
+
+        Yields:
+            Expense: Each matching expense
+        """
+        where, params = self._where(category, start_date, end_date, min_amount,
+                                    max_amount, created_from, created_to)
+        for row in self.connection.execute(f"SELECT {COLUMNS} FROM expenses{where}", params):
+            try:
+                yield self._from_row(row)
+            except ValueError as e:
+                print(f"Warning: Could not load expense {row[0]}: {e}", file=sys.stderr)
+
+    def load_newest_expenses(self, limit, offset=0):
+        """
+        Load the most recently created expenses by walking the primary key backwards.
+
+        Args:
+            limit (int): Maximum number of expenses to return
+            offset (int): Number of newest expenses to skip, for paging
+
+        Returns:
+            list[Expense]: Up to limit expenses, newest first
+        """
+        return self._query(f"SELECT {COLUMNS} FROM expenses ORDER BY id DESC LIMIT ? OFFSET ?",
+                           (limit, offset))
+
+    def search_expenses(self, query, limit=None):
+        """
+        Find expenses whose description or category contains every query word.
+
+        Each ASCII word narrows the rows with a LIKE condition, and the
+        survivors are checked with the same word matching as the JSON backend.
+        Other words are left to that check, because LIKE only ignores the
+        case of ASCII letters.
+
+        Args:
+            query (str): Words that must all appear; a trailing "*" makes a
+                word a prefix
+            limit (int, optional): Return only this many of the newest matches
+
+        Returns:
+            list[Expense]: Matching expenses, newest first
+
+        Raises:
+            ValueError: If the query has no searchable word
+        """
+        terms = parse_query(query)
+        words = [word for word, _ in terms if word.isascii()]
+        where = " AND ".join(["(description LIKE ? OR category LIKE ?)"] * len(words)) or "1"
+        params = [f"%{word}%" for word in words for _ in range(2)]
+
+        expenses = []
+        for expense in self._query(f"SELECT {COLUMNS} FROM expenses WHERE {where} ORDER BY id DESC", params):
+            if matches(terms, expense.description, expense.category):
+                expenses.append(expense)
+                if limit is not None and len(expenses) >= limit:
+                    break
+        return expenses
+
+    def get_category_totals(self):
+        """
+        Sum expense amounts per category.
+
+        Returns:
+            dict: Mapping of category to (count, total), ordered by category
+        """
+        cursor = self.connection.execute(
+            "SELECT category, COUNT(*), SUM(amount) FROM expenses GROUP BY category ORDER BY category"
+        )
+        return {category: (count, total) for category, count, total in cursor}
+
+    def get_category_summary(self):
+        """
+        Get count, total, min, max and latest date per category.
+
+        Answered by one grouped query over the (category, date) index, with
+        totals summed in integer cents.
+
+        Returns:
+            dict: Category to a dict with count, total_cents, total, min, max
+            and latest_date, ordered by category
+        """
+        rows = self.connection.execute(
+            "SELECT category, COUNT(*), SUM(CAST(ROUND(amount * 100) AS INTEGER)), "
+            "MIN(amount), MAX(amount), MAX(date) FROM expenses GROUP BY category ORDER BY category"
+        )
+        return {
+            category: {"count": count, "total_cents": total_cents, "total": from_cents(total_cents),
+                       "min": low, "max": high, "latest_date": latest}
+            for category, count, total_cents, low, high, latest in rows
+        }
+
+    def get_spending_rollup(self, start_date=None, end_date=None, granularity="month"):
+        """
+        Get per-category spending per day or month in a date range.
+
+        Answered by one query grouped on the date (or its month) and category.
+
+        Args:
+            start_date (str, optional): First date included (YYYY-MM-DD)
+            end_date (str, optional): Last date included (YYYY-MM-DD)
+            granularity (str): "day" or "month"
+
+        Returns:
+            dict: Bucket key (YYYY-MM-DD or YYYY-MM) to
+            ``{category: {"count", "total_cents", "total"}}``, ordered by key
+
+        Raises:
+            ValueError: If the granularity is not supported
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of: {', '.join(GRANULARITIES)}")
+
+        bucket = "date" if granularity == "day" else "substr(date, 1, 7)"
+        where, params = self._where(start_date=start_date, end_date=end_date)
+        rows = self.connection.execute(
+            f"SELECT {bucket}, category, COUNT(*), SUM(CAST(ROUND(amount * 100) AS INTEGER)) "
+            f"FROM expenses{where} GROUP BY 1, 2 ORDER BY 1, 2",
+            params
+        )
+        rollup = {}
+        for key, category, count, total_cents in rows:
+            rollup.setdefault(key, {})[category] = {
+                "count": count, "total_cents": total_cents, "total": from_cents(total_cents),
+            }
+        return rollup
+
+    def get_budgets(self):
+        """
+        Get the monthly budget of every category that has one.
+
+        Returns:
+            dict: Category to monthly limit, ordered by category
+        """
+        rows = self.connection.execute("SELECT category, limit_cents FROM budgets ORDER BY category")
+        return {category: from_cents(limit_cents) for category, limit_cents in rows}
+
+    def set_budget(self, category, amount):
+        """
+        Set the monthly budget of a category.
+
+        Args:
+            category (str): The category
+            amount (float): Monthly limit
+
+        Raises:
+            ValueError: If the amount is not a positive number
+        """
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Budget must be greater than zero")
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO budgets VALUES (?, ?)", (category, cents))
+
+    def remove_budget(self, category):
+        """
+        Remove the monthly budget of a category.
+
+        Args:
+            category (str): The category
+
+        Returns:
+            bool: True if the category had a budget
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM budgets WHERE category = ?", (category,))
+        return cursor.rowcount > 0
+
+    def get_budget_status(self, month=None):
+        """
+        Get spending against the budget of every budgeted category in a month.
+
+        Answered by one query over the month's rows of the date index,
+        grouped by category.
+
+        Args:
+            month (str, optional): Month as YYYY-MM. Defaults to this month.
+
+        Returns:
+            dict: Category to a dict with count, limit, spent, remaining (and
+            their *_cents forms) and over, ordered by category
+
+        Raises:
+            ValueError: If the month is not in YYYY-MM format
+        """
+        first, last = month_bounds(month or current_month())
+        rows = self.connection.execute(
+            "SELECT b.category, b.limit_cents, COUNT(e.id), "
+            "COALESCE(SUM(CAST(ROUND(e.amount * 100) AS INTEGER)), 0) "
+            "FROM budgets b LEFT JOIN expenses e "
+            "ON e.category = b.category AND e.date >= ? AND e.date <= ? "
+            "GROUP BY b.category ORDER BY b.category",
+            (first, last)
+        )
+        return {category: budget_entry(limit_cents, {"count": count, "total_cents": total_cents})
+                for category, limit_cents, count, total_cents in rows}
+
+    def delete_expense(self, expense_id):
+        """
+        Delete an expense row by ID.
+
+        Args:
+            expense_id (str): The ID of the expense to delete
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+        return cursor.rowcount > 0
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    @staticmethod
+    def _where(category=None, start_date=None, end_date=None, min_amount=None,
+               max_amount=None, created_from=None, created_to=None):
+        conditions = [
+            ("category = ?", category),
+            ("date >= ?", start_date),
+            ("date <= ?", end_date),
+            ("amount >= ?", min_amount),
+            ("amount <= ?", max_amount),
+            ("created_at >= ?", created_from),
+            ("created_at <= ?", created_to),
+        ]
+        clauses = [clause for clause, value in conditions if value is not None]
+        params = [value for _, value in conditions if value is not None]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _query(self, sql, params=()):
+        expenses = []
+        for row in self.connection.execute(sql, params):
+            try:
+                expenses.append(self._from_row(row))
+            except ValueError as e:
+                print(f"Warning: Could not load expense {row[0]}: {e}", file=sys.stderr)
+        return expenses
+
+    @staticmethod
+    def _to_row(expense):
+        return (expense.id, expense.amount, expense.category, expense.description,
+                expense.date, expense.created_at)
+
+    @staticmethod
+    def _from_row(row):
+        return Expense.from_dict(dict(zip(FIELDS, row)), strict=False)
+
+
+def import_json_directory(storage, source_dir):
+    """
+    Copy every expense from a per-file JSON data directory into SQLite.
+
+    Files are found the way ExpenseStorage finds them, so the YYYY/MM
+    shards of a sharded directory are included. Corrupted files are skipped
+    with a warning, matching ExpenseStorage.load_all_expenses. The whole
+    import runs in one transaction, so re-running it simply replaces the
+    same rows.
+
+    Args:
+        storage (SQLiteExpenseStorage): Destination storage
+        source_dir (str): Directory containing exp_*.json files
+
+    Returns:
+        int: Number of expenses imported
+    """
+    from src.storage.expense_storage import ExpenseStorage
+
+    expenses = []
+    for filepath in sorted(ExpenseStorage(source_dir).get_all_expense_files()):
+        try:
+            with open(filepath, 'r') as f:
+                expenses.append(Expense.from_dict(json.load(f)))
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            print(f"Warning: Could not load {filepath.name}: {e}", file=sys.stderr)
+
+    return len(storage.save_expenses(expenses).saved)
+
+
+def main(argv=None):
+    """Import a JSON data directory into a SQLite database."""
+    parser = argparse.ArgumentParser(description="Import exp_*.json files into SQLite.")
+    parser.add_argument("source_dir", help="directory containing exp_*.json files")
+    parser.add_argument("--data-dir", default="data",
+                        help="directory for the SQLite database (default: data)")
+    args = parser.parse_args(argv)
+
+    storage = SQLiteExpenseStorage(args.data_dir)
+    try:
+        count = import_json_directory(storage, args.source_dir)
+    finally:
+        storage.close()
+    print(f"Imported {count} expenses into {storage.db_path}")
+
+
+if __name__ == "__main__":
+    main()
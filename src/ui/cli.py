@@ -0,0 +1,344 @@
+"""
+Command-line interface: the interactive menu, or one command for scripts.
+
+Without a command the interactive menu starts; the add, list, by-category,
+budget, delete and export commands run once and print machine-readable
+output.
+
+Only argparse and the backend registry are imported up front. The storage
+backend, the menu and the exporter are imported by the code path that
+needs them, so a scripted ``add`` does not pay for modules it never uses.
+"""
+import argparse
+import json
+import sys
+from src.storage.backends import STORAGE_BACKENDS, create_storage
+
+
+LIST_FORMATS = ("jsonl", "table")
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line options.
+
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Parsed options; command is None for the
+        interactive menu
+    """
+    parser = argparse.ArgumentParser(description="Track personal expenses.")
+    parser.add_argument("--backend", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="storage backend to use (default: json)")
+    parser.add_argument("--data-dir", default="data",
+                        help="directory holding the expense data (default: data)")
+    parser.add_argument("--load-workers", type=int, default=1,
+                        help="parallel file readers for the json backend (default: 1)")
+    parser.add_argument("--no-manifest", dest="use_manifest", action="store_false",
+                        help="read every expense file instead of the json backend's manifest")
+    parser.add_argument("--layout", choices=["flat", "sharded"],
+                        help="file layout for the json backend (default: as recorded in the data directory)")
+    parser.add_argument("--cents", action="store_true",
+                        help="store amounts as integer cents and total them exactly (json and log backends)")
+
+    commands = parser.add_subparsers(dest="command", metavar="command",
+                                     help="run once instead of starting the menu")
+
+    add = commands.add_parser("add", help="add an expense and print its ID")
+    add.add_argument("amount", help="amount, e.g. 12.50")
+    add.add_argument("category", help="category, e.g. Food")
+    add.add_argument("description", nargs="?", default="", help="description")
+    add.add_argument("--date", default="", help="date as YYYY-MM-DD (default: today)")
+
+    list_parser = commands.add_parser("list", help="print expenses, newest first")
+    list_parser.add_argument("--limit", type=int, help="print only this many")
+    list_parser.add_argument("--offset", type=int, default=0, help="skip this many newest first")
+    list_parser.add_argument("--format", choices=LIST_FORMATS, default="jsonl",
+                             help="one JSON object per line or a table (default: jsonl)")
+
+    commands.add_parser("by-category", help="print count and totals per category as JSON lines")
+
+    budget = commands.add_parser("budget", help="print, set or remove monthly category budgets")
+    budget.add_argument("category", nargs="?", help="category to print, set or remove (default: all)")
+    budget.add_argument("amount", nargs="?", help="monthly budget to set")
+    budget.add_argument("--remove", action="store_true", help="remove the category's budget")
+    budget.add_argument("--month", help="month to report as YYYY-MM (default: this month)")
+
+    delete = commands.add_parser("delete", help="delete expenses by ID")
+    delete.add_argument("ids", nargs="+", metavar="id", help="expense ID")
+
+    export = commands.add_parser("export", help="stream expenses to CSV or JSON lines")
+    export.add_argument("output", help="output file (.csv, .jsonl, optionally .gz) or - for stdout")
+    export.add_argument("--format", choices=("csv", "jsonl"),
+                        help="output format (default: from the extension)")
+    export.add_argument("--gzip", action="store_true", default=None, help="gzip the output")
+    export.add_argument("--category", help="only this category")
+    export.add_argument("--start-date", help="earliest date, YYYY-MM-DD")
+    export.add_argument("--end-date", help="latest date, YYYY-MM-DD")
+    export.add_argument("--min-amount", type=float, help="smallest amount")
+    export.add_argument("--max-amount", type=float, help="largest amount")
+    return parser.parse_args(argv)
+
+
+def open_storage(args):
+    """
+    Create the storage backend selected on the command line.
+
+    Args:
+        args (argparse.Namespace): Parsed options
+
+    Returns:
+        Storage instance for args.backend
+    """
+    options = {}
+    if args.backend == "json":
+        options = {
+            "load_workers": args.load_workers,
+            "layout": args.layout,
+            "use_manifest": args.use_manifest,
+        }
+    if args.cents and args.backend in ("json", "log"):
+        options["cents"] = True
+    return create_storage(args.backend, args.data_dir, **options)
+
+
+def add_command(storage, args):
+    """
+    Validate and save one expense, then print its ID.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed add options
+
+    Returns:
+        int: Exit status
+
+    Raises:
+        ValueError: If the amount, category or date is invalid
+    """
+    from src.models.expense import Expense
+    from src.models.money import from_cents
+    from src.utils.validators import validate_amount, validate_amount_cents, validate_category, validate_date
+
+    if args.cents:
+        amount = from_cents(validate_amount_cents(args.amount))
+    else:
+        amount = validate_amount(args.amount)
+    expense = Expense(amount, validate_category(args.category), args.description.strip(),
+                      validate_date(args.date.strip()))
+    # The JSON backend can append a new expense without loading its indexes.
+    save = getattr(storage, "append_expense", storage.save_expense)
+    save(expense)
+    print(expense.id)
+
+    # The expense is saved; a failed budget check must not make a script retry it.
+    month = expense.date[:7]
+    try:
+        entry = storage.get_budget_status(month).get(expense.category)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not check the {month} budget: {e}", file=sys.stderr)
+        return 0
+    if entry is not None and entry["over"]:
+        print(f"Warning: {expense.category} is ${-entry['remaining']:.2f} over its {month} budget "
+              f"(${entry['spent']:.2f} of ${entry['limit']:.2f})", file=sys.stderr)
+    return 0
+
+
+def list_command(storage, args):
+    """
+    Print expenses newest first as JSON lines or a table.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed list options
+
+    Returns:
+        int: Exit status
+    """
+    if args.limit is not None:
+        expenses = storage.load_newest_expenses(args.limit, offset=args.offset)
+    else:
+        expenses = sorted(storage.load_all_expenses(), key=lambda e: e.created_at, reverse=True)
+        expenses = expenses[args.offset:]
+
+    if args.format == "table":
+        from src.ui.renderer import render_expenses
+
+        render_expenses(expenses, stream=True)
+        return 0
+
+    write_lines(json.dumps(expense.to_dict(args.cents)) for expense in expenses)
+    return 0
+
+
+def by_category_command(storage, args):
+    """
+    Print one JSON object per category with its count and totals.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed options
+
+    Returns:
+        int: Exit status
+    """
+    write_lines(json.dumps(dict(category=category, **entry))
+                for category, entry in storage.get_category_summary().items())
+    return 0
+
+
+def budget_command(storage, args):
+    """
+    Set or remove a budget, or print budget status as JSON lines.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed budget options
+
+    Returns:
+        int: Exit status; 1 if a budget to remove did not exist
+
+    Raises:
+        ValueError: If the category, amount or month is invalid
+    """
+    from src.models.money import from_cents
+    from src.utils.validators import validate_amount, validate_amount_cents, validate_category
+
+    category = None
+    if args.category is not None:
+        category = validate_category(args.category)
+        if args.remove:
+            if not storage.remove_budget(category):
+                print(f"Error: No budget set for {category}", file=sys.stderr)
+                return 1
+            print(category)
+            return 0
+        if args.cents and args.amount is not None:
+            storage.set_budget(category, from_cents(validate_amount_cents(args.amount)))
+        elif args.amount is not None:
+            storage.set_budget(category, validate_amount(args.amount))
+
+    write_lines(json.dumps(dict(category=name, **entry))
+                for name, entry in storage.get_budget_status(args.month).items()
+                if category is None or name == category)
+    return 0
+
+
+def delete_command(storage, args):
+    """
+    Delete expenses by ID and print each deleted ID.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed delete options
+
+    Returns:
+        int: 0 if every expense was deleted, 1 if any ID was not found
+    """
+    status = 0
+    for expense_id in args.ids:
+        if storage.delete_expense(expense_id):
+            print(expense_id)
+        else:
+            print(f"Error: Expense not found: {expense_id}", file=sys.stderr)
+            status = 1
+    return status
+
+
+def export_command(storage, args):
+    """
+    Stream matching expenses to a file or standard output.
+
+    Args:
+        storage: Storage backend
+        args (argparse.Namespace): Parsed export options
+
+    Returns:
+        int: Exit status
+    """
+    from src.exports.exporter import export_expenses
+
+    result = export_expenses(storage, args.output, args.format, args.gzip, cents=args.cents,
+                             category=args.category, start_date=args.start_date,
+                             end_date=args.end_date, min_amount=args.min_amount,
+                             max_amount=args.max_amount)
+    if args.output != "-":
+        print(f"Exported {result.rows:,} expenses to {args.output} in {result.elapsed:.1f}s",
+              file=sys.stderr)
+    return 0
+
+
+COMMANDS = {
+    "add": add_command,
+    "list": list_command,
+    "by-category": by_category_command,
+    "budget": budget_command,
+    "delete": delete_command,
+    "export": export_command,
+}
+
+
+def write_lines(lines):
+    """
+    Write lines to standard output, stopping quietly if the reader goes away.
+
+    Args:
+        lines (iterable[str]): Lines without line endings
+    """
+    try:
+        for line in lines:
+            sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        pass
+
+
+def run_command(args):
+    """
+    Run one non-interactive command.
+
+    Errors are reported on standard error instead of being printed with the
+    output, so scripts can rely on the exit status.
+
+    Args:
+        args (argparse.Namespace): Parsed options with a command
+
+    Returns:
+        int: Exit status; 2 for invalid input
+    """
+    try:
+        storage = open_storage(args)
+        return COMMANDS[args.command](storage, args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+def main(argv=None):
+    """
+    Main entry point for the expense tracker application.
+
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status
+    """
+    args = parse_args(argv)
+    if args.command is not None:
+        return run_command(args)
+
+    try:
+        from src.ui.menu import ExpenseTrackerMenu
+
+        storage = open_storage(args)
+        menu = ExpenseTrackerMenu(storage, cents=args.cents)
+        menu.run()
+    except KeyboardInterrupt:
+        print("\n\nApplication interrupted. Goodbye!")
+    except Exception as e:
+        print(f"\nAn unexpected error occurred: {e}")
+        print("Please check your configuration and try again.")
+    return 0
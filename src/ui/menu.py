@@ -1,17 +1,29 @@
 import os
 from src.models.expense import Expense
-from src.utils.validators import validate_amount, validate_category, validate_date, get_valid_input
+from src.models.money import from_cents
+from src.ui.renderer import TableRenderer
+from src.utils.validators import (validate_amount, validate_amount_cents, validate_category,
+                                  validate_date, get_valid_input)
 
 
 class ExpenseTrackerMenu:
-    def __init__(self, storage):
+    PAGE_SIZE = 20
+
+    def __init__(self, storage, cents=False, page_size=PAGE_SIZE):
         """
         Initialize menu with storage instance.
 
         Args:
             storage (ExpenseStorage): Storage instance for managing expenses
+            cents (bool): Validate amounts to whole cents and compute totals
+                with exact integer arithmetic
+            page_size (int): Number of expenses shown per page when listing
+                or deleting
         """
         self.storage = storage
+        self.cents = cents
+        self.page_size = page_size
+        self.renderer = TableRenderer()
 
     def run(self):
         """Main menu loop."""
@@ -28,12 +40,18 @@ class ExpenseTrackerMenu:
             elif choice == '4':
                 self.delete_expense()
             elif choice == '5':
+                self.spending_report()
+            elif choice == '6':
+                self.search_expenses()
+            elif choice == '7':
+                self.manage_budgets()
+            elif choice == '8':
                 print("\nThank you for using Expense Tracker. Goodbye!")
                 break
             else:
-                print("\nInvalid choice. Please select 1-5.")
+                print("\nInvalid choice. Please select 1-8.")
 
-            if choice in ['1', '2', '3', '4']:
+            if choice in ['1', '2', '3', '4', '5', '6', '7']:
                 input("\nPress Enter to continue...")
 
     def display_menu(self):
@@ -46,7 +64,10 @@ class ExpenseTrackerMenu:
         print("2. List All Expenses")
         print("3. View Expenses by Category")
         print("4. Delete Expense")
-        print("5. Exit")
+        print("5. Spending Report")
+        print("6. Search Expenses")
+        print("7. Budgets")
+        print("8. Exit")
         print("\n" + "=" * 50)
 
     def add_expense(self):
@@ -54,7 +75,10 @@ class ExpenseTrackerMenu:
         print("\n--- Add New Expense ---\n")
 
         try:
-            amount = get_valid_input("Enter amount: $", validate_amount)
+            if self.cents:
+                amount = from_cents(get_valid_input("Enter amount: $", validate_amount_cents))
+            else:
+                amount = get_valid_input("Enter amount: $", validate_amount)
             category = get_valid_input("Enter category (e.g., Food, Transport, Entertainment): ", validate_category)
             description = input("Enter description: ").strip()
             date_input = input("Enter date (YYYY-MM-DD, or press Enter for today): ").strip()
@@ -66,6 +90,7 @@ class ExpenseTrackerMenu:
             print("\n✓ Expense added successfully!")
             print(f"  ID: {expense.id}")
             print(f"  {expense}")
+            self._show_budget(expense)
 
         except ValueError as e:
             print(f"\n✗ Error: {e}")
@@ -73,81 +98,253 @@ class ExpenseTrackerMenu:
             print("\n\nOperation cancelled.")
 
     def list_expenses(self):
-        """Display all expenses with total."""
+        """Display expenses a page at a time, newest first, with the overall total."""
         print("\n--- All Expenses ---\n")
 
-        expenses = self.storage.load_all_expenses()
+        page = 0
+        while True:
+            expenses, has_next = self._load_page(page)
 
-        if not expenses:
-            print("No expenses found.")
-            return
+            if not expenses:
+                print("No expenses found.")
+                return
 
-        expenses.sort(key=lambda e: e.created_at, reverse=True)
+            summary = self.storage.get_category_summary()
+            count = sum(entry["count"] for entry in summary.values())
+            total = from_cents(sum(entry["total_cents"] for entry in summary.values()))
+            pages = max(1, -(-count // self.page_size))
 
-        print(f"{'Date':12} | {'Category':15} | {'Amount':>10} | Description")
-        print("-" * 80)
+            print(f"{'Date':12} | {'Category':15} | {'Amount':>10} | Description")
+            print("-" * 80)
 
-        total = 0
-        for expense in expenses:
-            print(expense)
-            total += expense.amount
+            self.renderer.write(self.renderer.expense_rows(expenses))
 
-        print("-" * 80)
-        print(f"{'':12} | {'TOTAL':15} | ${total:>9.2f} |")
-        print(f"\nTotal Expenses: {len(expenses)}")
+            print("-" * 80)
+            print(f"{'':12} | {'TOTAL':15} | ${total:>9.2f} |")
+            print(f"\nTotal Expenses: {count}")
+            self._print_budgets(self.storage.get_budget_status())
+
+            if page == 0 and not has_next:
+                return
+            print(f"Page {page + 1} of {pages}")
+            try:
+                choice = input("\n[n]ext page, [p]revious page, or press Enter to return: ").strip().lower()
+            except KeyboardInterrupt:
+                print("\n\nOperation cancelled.")
+                return
+            page = self._turn_page(page, has_next, choice)
+            if page is None:
+                return
+            print()
 
     def view_expenses_by_category(self):
         """Group and display expenses by category."""
         print("\n--- Expenses by Category ---\n")
 
-        expenses = self.storage.load_all_expenses()
+        expenses = self.storage.load_expenses_by_date_range()
 
         if not expenses:
             print("No expenses found.")
             return
 
+        # Expenses arrive newest date first, so each category keeps that order.
         categories = {}
         for expense in expenses:
             if expense.category not in categories:
                 categories[expense.category] = []
             categories[expense.category].append(expense)
 
-        grand_total = 0
-        for category, category_expenses in sorted(categories.items()):
-            category_total = sum(e.amount for e in category_expenses)
-            grand_total += category_total
-
-            print(f"\n{category}")
-            print("-" * 80)
-            for expense in sorted(category_expenses, key=lambda e: e.date, reverse=True):
-                print(f"  {expense.date:12} | ${expense.amount:8.2f} | {expense.description}")
-            print(f"  {'':12} | ${category_total:8.2f} | Subtotal")
+        summary = self.storage.get_category_summary()
+        grand_total = from_cents(sum(entry["total_cents"] for entry in summary.values()))
+        self.renderer.write(self._category_sections(categories, summary))
 
         print("\n" + "=" * 80)
         print(f"GRAND TOTAL: ${grand_total:.2f}")
 
-    def delete_expense(self):
-        """Interactive prompt to delete expense."""
-        print("\n--- Delete Expense ---\n")
+    def _category_sections(self, categories, summary):
+        for category, category_expenses in sorted(categories.items()):
+            entry = summary.get(category)
+            category_total = entry["total"] if entry else self._sum_amounts(category_expenses)
+
+            yield f"\n{category}"
+            yield "-" * 80
+            yield from self.renderer.category_rows(category_expenses)
+            if entry:
+                noun = "expense" if entry["count"] == 1 else "expenses"
+                yield (f"  {'':12} | ${category_total:8.2f} | Subtotal ({entry['count']} {noun}, "
+                       f"min ${entry['min']:.2f}, max ${entry['max']:.2f})")
+            else:
+                yield f"  {'':12} | ${category_total:8.2f} | Subtotal"
 
-        expenses = self.storage.load_all_expenses()
+    def spending_report(self):
+        """Display spending per month (or day) and category for a date range."""
+        print("\n--- Spending Report ---\n")
 
-        if not expenses:
+        try:
+            start_input = input("Start date (YYYY-MM-DD, or press Enter for the beginning): ").strip()
+            start_date = validate_date(start_input) if start_input else None
+            end_input = input("End date (YYYY-MM-DD, or press Enter for today): ").strip()
+            end_date = validate_date(end_input)
+            granularity = input("Group by month or day (press Enter for month): ").strip().lower() or "month"
+            rollup = self.storage.get_spending_rollup(start_date, end_date, granularity)
+        except ValueError as e:
+            print(f"\n✗ Error: {e}")
+            return
+        except KeyboardInterrupt:
+            print("\n\nOperation cancelled.")
+            return
+
+        if not rollup:
             print("No expenses found.")
             return
 
-        expenses.sort(key=lambda e: e.created_at, reverse=True)
+        print(f"\n{'Period':12} | {'Category':15} | {'Amount':>10} | Count")
+        print("-" * 80)
+        category_totals = {}
+        for period, categories in rollup.items():
+            label = period
+            for category, entry in categories.items():
+                print(f"{label:12} | {category:15} | ${entry['total']:>9.2f} | {entry['count']}")
+                label = ""
+                totals = category_totals.setdefault(category, [0, 0])
+                totals[0] += entry["count"]
+                totals[1] += entry["total_cents"]
 
-        print(f"{'#':3} | {'Date':12} | {'Category':15} | {'Amount':>10} | Description")
         print("-" * 80)
+        for category, (count, total_cents) in sorted(category_totals.items()):
+            print(f"{'':12} | {category:15} | ${from_cents(total_cents):>9.2f} | {count}")
+        grand_total = from_cents(sum(total_cents for _, total_cents in category_totals.values()))
+        print("\n" + "=" * 80)
+        print(f"TOTAL {start_date or 'beginning'} to {end_date}: ${grand_total:.2f}")
 
-        for idx, expense in enumerate(expenses, 1):
-            print(f"{idx:3} | {expense}")
+    def search_expenses(self):
+        """Find expenses by words in their description or category."""
+        print("\n--- Search Expenses ---\n")
 
-        print()
         try:
-            choice = input("Enter expense number to delete (or press Enter to cancel): ").strip()
+            query = input("Search for (end a word with * to match its prefix): ").strip()
+            if not query:
+                print("Search cancelled.")
+                return
+            expenses = self.storage.search_expenses(query, limit=self.page_size + 1)
+        except ValueError as e:
+            print(f"\n✗ Error: {e}")
+            return
+        except KeyboardInterrupt:
+            print("\n\nOperation cancelled.")
+            return
 
+        if not expenses:
+            print("No matching expenses found.")
+            return
+
+        print(f"\n{'Date':12} | {'Category':15} | {'Amount':>10} | Description")
+        print("-" * 80)
+        self.renderer.write(self.renderer.expense_rows(expenses[:self.page_size]))
+        print("-" * 80)
+        if len(expenses) > self.page_size:
+            print(f"Showing the newest {self.page_size} matches; add words to narrow the search.")
+        else:
+            print(f"{len(expenses)} matching expense(s)")
+
+    def manage_budgets(self):
+        """Show this month's budgets and set or remove one."""
+        print("\n--- Budgets ---\n")
+
+        status = self.storage.get_budget_status()
+        if status:
+            self._print_budgets(status)
+        else:
+            print("No budgets set.")
+
+        try:
+            category = input("\nCategory to budget (or press Enter to return): ").strip()
+            if not category:
+                return
+            category = validate_category(category)
+            amount = input(f"Monthly budget for {category} (or press Enter to remove): $").strip()
+            if not amount:
+                if self.storage.remove_budget(category):
+                    print(f"\n✓ Budget for {category} removed.")
+                else:
+                    print(f"\nNo budget set for {category}.")
+                return
+            if self.cents:
+                amount = from_cents(validate_amount_cents(amount))
+            else:
+                amount = validate_amount(amount)
+            self.storage.set_budget(category, amount)
+            print(f"\n✓ Budget set: {category} ${amount:.2f} per month")
+        except ValueError as e:
+            print(f"\n✗ Error: {e}")
+        except KeyboardInterrupt:
+            print("\n\nOperation cancelled.")
+
+    def _show_budget(self, expense):
+        month = expense.date[:7]
+        try:
+            entry = self.storage.get_budget_status(month).get(expense.category)
+        except (OSError, ValueError) as e:
+            print(f"\n⚠ Warning: Could not check the {month} budget: {e}")
+            return
+        if entry is None:
+            return
+        if entry["over"]:
+            print(f"\n⚠ Warning: {expense.category} is ${-entry['remaining']:.2f} over its {month} budget "
+                  f"(${entry['spent']:.2f} of ${entry['limit']:.2f})")
+        else:
+            print(f"  Budget: ${entry['remaining']:.2f} left of ${entry['limit']:.2f} "
+                  f"for {expense.category} in {month}")
+
+    @staticmethod
+    def _print_budgets(status):
+        if not status:
+            return
+        print("\nBudgets this month:")
+        for category, entry in status.items():
+            if entry["over"]:
+                left = f"${-entry['remaining']:.2f} OVER"
+            else:
+                left = f"${entry['remaining']:.2f} left"
+            print(f"  {category:15} | ${entry['spent']:9.2f} of ${entry['limit']:9.2f} | {left}")
+
+    def delete_expense(self):
+        """Interactive prompt to delete expense."""
+        print("\n--- Delete Expense ---\n")
+
+        page = 0
+        while True:
+            expenses, has_next = self._load_page(page)
+
+            if not expenses:
+                print("No expenses found.")
+                return
+
+            print(f"{'#':3} | {'Date':12} | {'Category':15} | {'Amount':>10} | Description")
+            print("-" * 80)
+
+            self.renderer.write(self.renderer.expense_rows(expenses, numbered=True))
+
+            print()
+            paged = page > 0 or has_next
+            if paged:
+                print(f"Page {page + 1}")
+                prompt = "Enter expense number to delete, [n]ext/[p]revious page (or press Enter to cancel): "
+            else:
+                prompt = "Enter expense number to delete (or press Enter to cancel): "
+            try:
+                choice = input(prompt).strip().lower()
+            except KeyboardInterrupt:
+                print("\n\nOperation cancelled.")
+                return
+
+            if paged and choice in ('n', 'p'):
+                page = self._turn_page(page, has_next, choice)
+                print()
+                continue
+            break
+
+        try:
             if not choice:
                 print("Deletion cancelled.")
                 return
@@ -172,6 +369,29 @@ class ExpenseTrackerMenu:
         except KeyboardInterrupt:
             print("\n\nOperation cancelled.")
 
+    def _load_page(self, page):
+        if page > 0:
+            # Paging on: keep sorted indexes in memory if the backend has them.
+            load_ordered_indexes = getattr(self.storage, "load_ordered_indexes", None)
+            if load_ordered_indexes is not None:
+                load_ordered_indexes()
+        # One extra row tells whether another page follows without counting.
+        expenses = self.storage.load_newest_expenses(self.page_size + 1, offset=page * self.page_size)
+        return expenses[:self.page_size], len(expenses) > self.page_size
+
+    @staticmethod
+    def _turn_page(page, has_next, choice):
+        if choice == 'n':
+            return page + 1 if has_next else page
+        if choice == 'p':
+            return max(page - 1, 0)
+        return None
+
+    def _sum_amounts(self, expenses):
+        if self.cents:
+            return from_cents(sum(e.amount_cents for e in expenses))
+        return sum(e.amount for e in expenses)
+
     def get_user_choice(self):
         """
         Get and validate menu choice.
@@ -179,7 +399,7 @@ class ExpenseTrackerMenu:
         Returns:
             str: User's menu choice
         """
-        return input("\nEnter your choice (1-5): ").strip()
+        return input("\nEnter your choice (1-8): ").strip()
 
     def clear_screen(self):
         """Clear terminal screen for better UX."""
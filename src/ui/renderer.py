@@ -0,0 +1,120 @@
+class TableRenderer:
+    """
+    Format table rows in batches and write each batch with a single call.
+
+    Printing one row at a time costs a print() and a stdout write per row,
+    which dominates when thousands of rows are shown. The renderer joins up
+    to batch_size formatted rows into one string and hands it to print()
+    once. Padded category cells are cached, since the same few categories
+    repeat on every row.
+
+    With stream=True every batch is flushed as soon as it is written, so a
+    pager such as ``less`` starts showing rows immediately, and a reader that
+    goes away early (BrokenPipeError) ends the output quietly.
+    """
+
+    BATCH_SIZE = 1000
+    CATEGORY_WIDTH = 15
+
+    def __init__(self, file=None, batch_size=BATCH_SIZE, stream=False):
+        """
+        Initialize the renderer.
+
+        Args:
+            file (file-like, optional): Where to write; sys.stdout at write time
+                when omitted
+            batch_size (int): Number of rows joined into one write
+            stream (bool): Flush after every batch and stop quietly when the
+                output is closed
+        """
+        self.file = file
+        self.batch_size = batch_size
+        self.stream = stream
+        self._categories = {}
+
+    def expense_rows(self, expenses, numbered=False, start=1):
+        """
+        Format expenses the way Expense.__str__ does.
+
+        Args:
+            expenses (iterable[Expense]): Expenses to format
+            numbered (bool): Prefix each row with a right-aligned number
+            start (int): Number of the first row
+
+        Yields:
+            str: One formatted row per expense
+        """
+        pad = self._category
+        if numbered:
+            for number, expense in enumerate(expenses, start):
+                yield (f"{number:3} | {expense.date} | {pad(expense.category)} | "
+                       f"${expense.amount:8.2f} | {expense.description}")
+        else:
+            for expense in expenses:
+                yield f"{expense.date} | {pad(expense.category)} | ${expense.amount:8.2f} | {expense.description}"
+
+    def category_rows(self, expenses):
+        """
+        Format expenses as rows under a category heading.
+
+        Args:
+            expenses (iterable[Expense]): Expenses of one category
+
+        Yields:
+            str: One indented date, amount and description row per expense
+        """
+        for expense in expenses:
+            yield f"  {expense.date:12} | ${expense.amount:8.2f} | {expense.description}"
+
+    def write(self, rows):
+        """
+        Write rows, one print() call per batch.
+
+        Args:
+            rows (iterable[str]): Formatted rows without line endings
+
+        Returns:
+            int: Number of rows written; fewer than given if a streaming
+            reader closed the output
+        """
+        written = 0
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    self._emit(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                self._emit(batch)
+                written += len(batch)
+        except BrokenPipeError:
+            if not self.stream:
+                raise
+        return written
+
+    def _emit(self, batch):
+        print("\n".join(batch), file=self.file, flush=self.stream)
+
+    def _category(self, category):
+        padded = self._categories.get(category)
+        if padded is None:
+            padded = self._categories[category] = f"{category:{self.CATEGORY_WIDTH}}"
+        return padded
+
+
+def render_expenses(expenses, file=None, stream=False):
+    """
+    Write expenses as table rows through a TableRenderer.
+
+    Args:
+        expenses (iterable[Expense]): Expenses to write, in display order
+        file (file-like, optional): Where to write; defaults to sys.stdout
+        stream (bool): Flush after every batch, for pagers and pipes
+
+    Returns:
+        int: Number of rows written
+    """
+    renderer = TableRenderer(file, stream=stream)
+    return renderer.write(renderer.expense_rows(expenses))
@@ -1,4 +1,11 @@
-from datetime import datetime
+import math
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+
+DATE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
 
 
 def validate_amount(amount_str):
@@ -16,13 +23,40 @@ def validate_amount(amount_str):
     """
     try:
         amount = float(amount_str)
-        if amount <= 0:
-            raise ValueError("Amount must be greater than zero")
-        return amount
-    except (ValueError, TypeError) as e:
-        if "could not convert" in str(e) or "invalid literal" in str(e):
-            raise ValueError("Amount must be a valid number")
-        raise
+    except (ValueError, TypeError):
+        raise ValueError("Amount must be a valid number")
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a valid number")
+    if amount <= 0:
+        raise ValueError("Amount must be greater than zero")
+    return amount
+
+
+def validate_amount_cents(amount_str):
+    """
+    Validate an amount and convert it to whole cents without going through float.
+
+    Args:
+        amount_str (str): String representation of amount
+
+    Returns:
+        int: Validated amount in cents
+
+    Raises:
+        ValueError: If amount is invalid (negative, zero, not a number, or
+            more precise than a cent)
+    """
+    try:
+        amount = Decimal(str(amount_str).strip())
+    except InvalidOperation:
+        raise ValueError("Amount must be a valid number")
+    if not amount.is_finite():
+        raise ValueError("Amount must be a valid number")
+    if amount <= 0:
+        raise ValueError("Amount must be greater than zero")
+    if amount.normalize().as_tuple().exponent < -2:
+        raise ValueError("Amount cannot have more than two decimal places")
+    return int(amount.scaleb(2))
 
 
 def validate_category(category):
@@ -38,16 +72,24 @@ def validate_category(category):
     Raises:
         ValueError: If category is empty
     """
-    category = category.strip()
-    if not category:
+    normalized = _normalize_category(category)
+    if not normalized:
         raise ValueError("Category cannot be empty")
-    return category.capitalize()
+    return normalized
+
+
+@lru_cache(maxsize=4096)
+def _normalize_category(category):
+    return category.strip().capitalize()
 
 
 def validate_date(date_str):
     """
     Validate date format.
 
+    Month and day must be zero-padded, as in validate_dates, because stored
+    dates are sliced by position into months and shards.
+
     Args:
         date_str (str): Date string in ISO format (YYYY-MM-DD) or empty
 
@@ -60,11 +102,188 @@ def validate_date(date_str):
     if not date_str or date_str.strip() == "":
         return datetime.now().strftime("%Y-%m-%d")
 
+    if not _is_calendar_date(date_str):
+        raise ValueError("Date must be in YYYY-MM-DD format")
+    return date_str
+
+
+class ValidationReport:
+    """
+    Outcome of validating many values at once.
+
+    values lines up with the input: the validated value for each row, or
+    None where the row failed. errors lists (row, field, message) tuples for
+    every failure, in row order, so callers can report all bad rows instead
+    of stopping at the first.
+    """
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.values = []
+        self.errors = []
+
+    def add_value(self, value):
+        """
+        Record a valid row.
+
+        Args:
+            value: The validated value
+        """
+        self.values.append(value)
+
+    def add_error(self, field, message):
+        """
+        Record an invalid row.
+
+        Args:
+            field (str): Name of the field that failed
+            message (str): Why it failed
+        """
+        self.errors.append((len(self.values), field, message))
+        self.values.append(None)
+
+    @property
+    def ok(self):
+        """bool: True if every row was valid."""
+        return not self.errors
+
+    def __repr__(self):
+        return f"ValidationReport(rows={len(self.values)}, errors={len(self.errors)})"
+
+
+def validate_amounts(values, cents=False):
+    """
+    Validate a column of amount strings.
+
+    Args:
+        values (iterable[str]): Amount strings
+        cents (bool): Return whole cents via validate_amount_cents instead of floats
+
+    Returns:
+        ValidationReport: Floats (or cents) per row with errors for invalid rows
+    """
+    report = ValidationReport()
+    for value in values:
+        if cents:
+            try:
+                report.add_value(validate_amount_cents(value))
+            except ValueError as e:
+                report.add_error("amount", str(e))
+            continue
+
+        try:
+            amount = float(value)
+        except (ValueError, TypeError):
+            report.add_error("amount", "Amount must be a valid number")
+            continue
+        if not math.isfinite(amount):
+            report.add_error("amount", "Amount must be a valid number")
+        elif amount <= 0:
+            report.add_error("amount", "Amount must be greater than zero")
+        else:
+            report.add_value(amount)
+    return report
+
+
+def validate_categories(values):
+    """
+    Validate a column of categories, normalizing each distinct spelling once.
+
+    Args:
+        values (iterable[str]): Category strings
+
+    Returns:
+        ValidationReport: Capitalized categories per row with errors for empty ones
+    """
+    report = ValidationReport()
+    for value in values:
+        normalized = _normalize_category(value) if isinstance(value, str) else ""
+        if normalized:
+            report.add_value(normalized)
+        else:
+            report.add_error("category", "Category cannot be empty")
+    return report
+
+
+def validate_dates(values):
+    """
+    Validate a column of dates against a precompiled YYYY-MM-DD pattern.
+
+    Empty values become today's date, as in validate_date. Each distinct date
+    string is checked against the calendar only once.
+
+    Args:
+        values (iterable[str]): Date strings
+
+    Returns:
+        ValidationReport: Dates per row with errors for malformed ones
+    """
+    report = ValidationReport()
+    today = None
+    checked = {}
+    for value in values:
+        if not value or not value.strip():
+            if today is None:
+                today = datetime.now().strftime("%Y-%m-%d")
+            report.add_value(today)
+            continue
+
+        valid = checked.get(value)
+        if valid is None:
+            valid = checked[value] = _is_calendar_date(value)
+        if valid:
+            report.add_value(value)
+        else:
+            report.add_error("date", "Date must be in YYYY-MM-DD format")
+    return report
+
+
+def _is_calendar_date(value):
+    match = DATE_PATTERN.fullmatch(value)
+    if not match:
+        return False
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return date_str
+        date(*map(int, match.groups()))
     except ValueError:
-        raise ValueError("Date must be in YYYY-MM-DD format")
+        return False
+    return True
+
+
+def validate_expense_rows(rows, cents=False):
+    """
+    Validate expense rows column by column.
+
+    Each row is a dict with "amount", "category", optional "description" and
+    optional "date" strings. Every field of every row is checked, so a row
+    with several problems reports each of them.
+
+    Args:
+        rows (list[dict]): Raw rows, e.g. from a CSV reader
+        cents (bool): Validate amounts to whole cents
+
+    Returns:
+        ValidationReport: Per row, a dict with validated amount, category,
+        description and date, or None if any field failed
+    """
+    amounts = validate_amounts((row.get("amount") for row in rows), cents)
+    categories = validate_categories(row.get("category") for row in rows)
+    dates = validate_dates(row.get("date") for row in rows)
+
+    report = ValidationReport()
+    report.errors = sorted(amounts.errors + categories.errors + dates.errors,
+                           key=lambda error: error[0])
+    failed = {error[0] for error in report.errors}
+    for index, row in enumerate(rows):
+        if index in failed:
+            report.values.append(None)
+            continue
+        report.values.append({
+            "amount": amounts.values[index],
+            "category": categories.values[index],
+            "description": (row.get("description") or "").strip(),
+            "date": dates.values[index],
+        })
+    return report
 
 
 def get_valid_input(prompt, validator=None):
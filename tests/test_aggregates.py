@@ -0,0 +1,122 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.models.expense import Expense
+from src.storage.aggregates import CategoryAggregates, diff_summaries, main
+from src.storage.expense_storage import ExpenseStorage
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def aggregates(temp_dir):
+    """Create empty CategoryAggregates backed by a temporary file."""
+    aggregates = CategoryAggregates(Path(temp_dir) / "aggregates.json")
+    aggregates.rebuild([])
+    return aggregates
+
+
+def record(amount, category="Food", date="2025-01-10"):
+    return {"amount": amount, "category": category, "date": date}
+
+
+class TestCategoryAggregates:
+    def test_add_tracks_count_total_and_extremes(self, aggregates):
+        """Test that adding expenses updates every statistic."""
+        aggregates.add(record(0.1))
+        aggregates.add(record(0.2, date="2025-01-12"))
+
+        assert aggregates.summary()["Food"] == {"count": 2, "total_cents": 30, "total": 0.3,
+                                                "min": 0.1, "max": 0.2, "latest_date": "2025-01-12"}
+
+    def test_remove_interior_value_stays_fresh(self, aggregates):
+        """Test that removing a non-extreme value needs no recomputation."""
+        for amount, date in ((10, "2025-01-01"), (20, "2025-01-02"), (30, "2025-01-03")):
+            aggregates.add(record(amount, date=date))
+
+        aggregates.remove(record(20, date="2025-01-02"))
+
+        assert aggregates.stale == set()
+        assert aggregates.summary()["Food"]["total"] == 40.0
+
+    def test_remove_extreme_marks_stale(self, aggregates):
+        """Test that removing the maximum marks the category stale."""
+        aggregates.add(record(10))
+        aggregates.add(record(30, date="2025-01-01"))
+
+        aggregates.remove(record(30, date="2025-01-01"))
+
+        assert aggregates.stale == {"Food"}
+        aggregates.replace("Food", [record(10)])
+        assert aggregates.stale == set()
+        assert aggregates.summary()["Food"]["max"] == 10.0
+
+    def test_remove_last_drops_category(self, aggregates):
+        """Test that a category with no expenses disappears."""
+        aggregates.add(record(10))
+
+        aggregates.remove(record(10))
+
+        assert aggregates.summary() == {}
+
+    def test_accepts_cents_records(self, aggregates):
+        """Test that integer-cents dictionaries are counted exactly."""
+        aggregates.add({"amount_cents": 1999, "category": "Food", "date": "2025-01-10"})
+
+        assert aggregates.summary()["Food"]["total_cents"] == 1999
+
+    def test_save_and_load_round_trip(self, aggregates):
+        """Test that saved aggregates load back unchanged."""
+        aggregates.add(record(10))
+        aggregates.stale.add("Food")
+        aggregates.save()
+
+        loaded = CategoryAggregates(aggregates.path)
+
+        assert loaded.load() is True
+        assert loaded.summary() == aggregates.summary()
+        assert loaded.stale == {"Food"}
+
+    def test_load_corrupted_file(self, aggregates):
+        """Test that an unreadable file asks for a rebuild."""
+        aggregates.path.write_text("{not json")
+
+        assert CategoryAggregates(aggregates.path).load() is False
+        assert CategoryAggregates(aggregates.path.with_name("missing.json")).load() is False
+
+    def test_diff_summaries(self):
+        """Test listing the categories that differ."""
+        expected = {"Food": {"count": 1}, "Transport": {"count": 2}}
+        actual = {"Food": {"count": 1}, "Transport": {"count": 3}, "Rent": {"count": 1}}
+
+        assert diff_summaries(expected, actual) == ["Rent", "Transport"]
+
+
+class TestMain:
+    def test_consistent(self, temp_dir):
+        """Test the verify command on an untouched directory."""
+        ExpenseStorage(temp_dir).save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+
+        with patch('builtins.print') as mock_print:
+            assert main([temp_dir]) == 0
+
+        assert "consistent" in str(mock_print.call_args_list)
+
+    def test_drift_and_rebuild(self, temp_dir):
+        """Test that drift fails verification and --rebuild repairs it."""
+        ExpenseStorage(temp_dir).save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+        (Path(temp_dir) / ExpenseStorage.AGGREGATES_FILENAME).write_text(
+            '{"categories": {}, "stale": []}')
+
+        with patch('builtins.print'):
+            assert main([temp_dir]) == 1
+            assert main([temp_dir, "--rebuild"]) == 0
+            assert main([temp_dir]) == 0
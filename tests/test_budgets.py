@@ -0,0 +1,82 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.storage.budgets import BudgetLimits, month_bounds
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def budgets(temp_dir):
+    """Create budget limits backed by a temporary file."""
+    return BudgetLimits(Path(temp_dir) / "budgets.json")
+
+
+class TestBudgetLimits:
+    def test_set_save_and_load(self, budgets):
+        """Test that limits are kept in cents and survive a reload."""
+        budgets.set("Food", 300.10)
+        budgets.set("Transport", "50")
+        budgets.save()
+
+        assert BudgetLimits(budgets.path).limits == {"Food": 30010, "Transport": 5000}
+
+    def test_set_rejects_non_positive(self, budgets):
+        """Test that a budget must be a positive amount."""
+        with pytest.raises(ValueError, match="greater than zero"):
+            budgets.set("Food", 0)
+        with pytest.raises(ValueError, match="valid number"):
+            budgets.set("Food", "abc")
+        assert budgets.limits == {}
+
+    def test_remove(self, budgets):
+        """Test removing a limit reports whether one existed."""
+        budgets.set("Food", 100)
+
+        assert budgets.remove("Food") is True
+        assert budgets.remove("Food") is False
+
+    def test_status(self, budgets):
+        """Test remaining amounts and the over flag per budgeted category."""
+        budgets.set("Food", 100)
+        budgets.set("Fun", 20)
+        budgets.set("Bills", 50)
+        spending = {
+            "Food": {"count": 2, "total_cents": 11000},
+            "Fun": {"count": 1, "total_cents": 1999},
+            "Transport": {"count": 1, "total_cents": 500},
+        }
+
+        status = budgets.status(spending)
+
+        assert list(status) == ["Bills", "Food", "Fun"]
+        assert status["Food"]["remaining_cents"] == -1000
+        assert status["Food"]["remaining"] == -10.0
+        assert status["Food"]["over"] is True
+        assert status["Fun"]["remaining"] == 0.01
+        assert status["Fun"]["over"] is False
+        assert status["Bills"]["spent"] == 0.0
+        assert status["Bills"]["count"] == 0
+
+    def test_corrupted_file(self, budgets):
+        """Test that an unreadable file is reported and treated as no budgets."""
+        budgets.path.write_text("{not json")
+
+        with patch('builtins.print') as mock_print:
+            assert budgets.limits == {}
+
+        assert "Warning" in str(mock_print.call_args)
+
+    def test_month_bounds(self):
+        """Test month validation and bounds."""
+        assert month_bounds("2025-02") == ("2025-02-01", "2025-02-31")
+        with pytest.raises(ValueError, match="YYYY-MM"):
+            month_bounds("2025-2")
@@ -0,0 +1,196 @@
+import pytest
+import json
+import tempfile
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from src.models.expense import Expense
+from src.storage.expense_storage import ExpenseStorage
+from src.ui.cli import main, parse_args
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Create ExpenseStorage instance with two expenses."""
+    storage = ExpenseStorage(temp_dir, use_manifest=True)
+    storage.save_expense(Expense(12.5, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+    storage.save_expense(Expense(30, "Transport", "Taxi", date="2025-01-11", expense_id="exp_2"))
+    return storage
+
+
+def run(temp_dir, *argv):
+    return main(["--data-dir", temp_dir, *argv])
+
+
+class TestCommandLine:
+    def test_no_command_starts_menu(self, temp_dir):
+        """Test that the interactive menu runs when no command is given."""
+        with patch('src.ui.menu.ExpenseTrackerMenu') as mock_menu:
+            status = run(temp_dir)
+
+        assert status == 0
+        mock_menu.return_value.run.assert_called_once()
+        assert parse_args([]).command is None
+
+    def test_add_prints_id(self, temp_dir, capsys):
+        """Test that add saves the expense and prints only its ID."""
+        status = run(temp_dir, "add", "12.50", "Food", "Lunch", "--date", "2025-01-10")
+
+        expense_id = capsys.readouterr().out.strip()
+        assert status == 0
+        expenses = ExpenseStorage(temp_dir).load_all_expenses()
+        assert [(e.id, e.amount, e.category, e.description, e.date) for e in expenses] == \
+            [(expense_id, 12.5, "Food", "Lunch", "2025-01-10")]
+
+    def test_add_rejects_invalid_input(self, temp_dir, capsys):
+        """Test that invalid input is reported on stderr with exit status 2."""
+        status = run(temp_dir, "add", "-5", "Food")
+
+        captured = capsys.readouterr()
+        assert status == 2
+        assert captured.out == ""
+        assert "Amount must be greater than zero" in captured.err
+        assert ExpenseStorage(temp_dir).load_all_expenses() == []
+
+        assert run(temp_dir, "add", "nan", "Food") == 2
+        assert "Amount must be a valid number" in capsys.readouterr().err
+        assert list(Path(temp_dir).glob("exp_*.json")) == []
+
+        assert run(temp_dir, "add", "5", "Food", "--date", "2025-1-5") == 2
+        assert "YYYY-MM-DD" in capsys.readouterr().err
+        assert list(Path(temp_dir).glob("exp_*.json")) == []
+        assert ExpenseStorage(temp_dir).get_spending_rollup() == {}
+
+    def test_list_prints_json_lines(self, storage, temp_dir, capsys):
+        """Test that list prints one JSON object per expense, newest first."""
+        run(temp_dir, "list")
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [row["id"] for row in rows] == ["exp_2", "exp_1"]
+        assert rows[1]["amount"] == 12.5
+
+        run(temp_dir, "list", "--limit", "1", "--offset", "1")
+        assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["exp_1"]
+
+    def test_warnings_stay_out_of_json_lines(self, storage, temp_dir, capfd):
+        """Test that a corrupted file is reported on stderr, not in the output stream."""
+        with open(Path(temp_dir) / "exp_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+
+        for argv in (["list"], ["export", "-", "--format", "jsonl"], ["--no-manifest", "list"]):
+            assert run(temp_dir, *argv) == 0
+            captured = capfd.readouterr()
+            rows = [json.loads(line) for line in captured.out.splitlines()]
+            assert sorted(row["id"] for row in rows) == ["exp_1", "exp_2"]
+            assert "exp_corrupted.json" in captured.err
+
+    def test_list_table(self, storage, temp_dir, capsys):
+        """Test that list can print the menu's table rows."""
+        run(temp_dir, "list", "--format", "table")
+
+        assert capsys.readouterr().out.splitlines() == [
+            str(storage.load_newest_expenses(1)[0]),
+            str(storage.load_newest_expenses(1, offset=1)[0]),
+        ]
+
+    def test_by_category(self, storage, temp_dir, capsys):
+        """Test that by-category prints the category summary as JSON lines."""
+        run(temp_dir, "by-category")
+
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(row["category"], row["count"], row["total"]) for row in rows] == \
+            [("Food", 1, 12.5), ("Transport", 1, 30.0)]
+
+    def test_budget(self, storage, temp_dir, capsys):
+        """Test setting, printing and removing budgets."""
+        run(temp_dir, "budget", "food", "20", "--month", "2025-01")
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(row["category"], row["spent"], row["remaining"]) for row in rows] == [("Food", 12.5, 7.5)]
+
+        assert run(temp_dir, "budget", "Food", "--remove") == 0
+        assert run(temp_dir, "budget", "Food", "--remove") == 1
+        assert "No budget set for Food" in capsys.readouterr().err
+
+    def test_add_warns_over_budget(self, storage, temp_dir, capsys):
+        """Test that add reports a category pushed over its budget on stderr."""
+        storage.set_budget("Food", 20)
+
+        run(temp_dir, "add", "10", "Food", "--date", "2025-01-12")
+
+        captured = capsys.readouterr()
+        assert captured.out.startswith("exp_")
+        assert "Warning: Food is $2.50 over its 2025-01 budget ($22.50 of $20.00)" in captured.err
+
+    def test_add_succeeds_when_budget_check_fails(self, storage, temp_dir, capsys):
+        """Test that a failed budget lookup after the save keeps exit status 0."""
+        with patch.object(ExpenseStorage, 'get_budget_status', side_effect=ValueError("bad month")):
+            status = run(temp_dir, "add", "10", "Food", "--date", "2025-01-12")
+
+        captured = capsys.readouterr()
+        assert status == 0
+        assert captured.out.startswith("exp_")
+        assert "Could not check the 2025-01 budget: bad month" in captured.err
+        assert len(ExpenseStorage(temp_dir).load_all_expenses()) == 3
+
+    def test_delete(self, storage, temp_dir, capsys):
+        """Test that delete prints deleted IDs and fails for unknown ones."""
+        status = run(temp_dir, "delete", "exp_1", "exp_missing")
+
+        captured = capsys.readouterr()
+        assert status == 1
+        assert captured.out.split() == ["exp_1"]
+        assert "exp_missing" in captured.err
+        assert [e.id for e in ExpenseStorage(temp_dir).load_all_expenses()] == ["exp_2"]
+
+    def test_export(self, storage, temp_dir):
+        """Test that export writes matching expenses to a file."""
+        output = Path(temp_dir) / "out" / "expenses.csv"
+        output.parent.mkdir()
+
+        status = run(temp_dir, "export", str(output), "--category", "Food")
+
+        assert status == 0
+        lines = output.read_text().splitlines()
+        assert len(lines) == 2
+        assert "exp_1" in lines[1]
+
+    def test_add_imports_only_storage(self, temp_dir):
+        """Test that add leaves the menu and exporter unimported."""
+        code = ("import sys; from src.ui.cli import main; "
+                f"main(['--data-dir', {temp_dir!r}, 'add', '1', 'Food']); "
+                "print(sorted(m for m in ('src.ui.menu', 'src.exports.exporter', "
+                "'src.storage.sqlite_storage', 'concurrent.futures') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent.parent)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.splitlines()[-1] == "[]"
+
+    def test_concurrent_adds_keep_summaries_consistent(self, temp_dir):
+        """Test that adds running in parallel processes all reach the summaries."""
+        processes = [
+            subprocess.Popen([sys.executable, "main.py", "--data-dir", temp_dir,
+                              "add", "1", "food", f"Snack {i}"],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                             cwd=Path(__file__).resolve().parent.parent)
+            for i in range(12)
+        ]
+        for process in processes:
+            _, stderr = process.communicate(timeout=60)
+            assert process.returncode == 0, stderr
+
+        storage = ExpenseStorage(temp_dir, use_manifest=True)
+        assert len(storage.get_all_expense_files()) == 12
+        assert storage.get_category_summary()["Food"]["count"] == 12
+        assert storage.verify_aggregates() == []
+        assert len(storage.load_index()) == 12
+        assert not list(Path(temp_dir).glob("*.tmp"))
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 from src.models.expense import Expense
 
 
@@ -46,6 +47,7 @@ class TestExpense:
         assert expense2.id.startswith("exp_")
         assert expense1.id != expense2.id
         assert len(expense1.id.split('_')) == 4
+        assert expense1.id < expense2.id
 
     def test_expense_to_dict(self):
         """Test serialization to dictionary."""
@@ -131,4 +133,61 @@ class TestExpense:
         assert parts[0] == "exp"
         assert len(parts[1]) == 8
         assert len(parts[2]) == 6
-        assert len(parts[3]) == 6
+        assert len(parts[3]) == 11
+        assert parts[3][:3].isdigit()
+
+    def test_expense_has_no_instance_dict(self):
+        """Test that Expense uses slots instead of a per-instance dict."""
+        expense = Expense(10, "Food", "Test")
+
+        assert not hasattr(expense, "__dict__")
+        with pytest.raises(AttributeError):
+            expense.note = "extra"
+
+    def test_from_dict_trusted_skips_validation(self):
+        """Test that the trusted path does not re-validate the amount."""
+        expense = Expense.from_dict({"amount": 0, "category": "Food", "description": "Test",
+                                     "date": "2025-01-01", "id": "exp_1",
+                                     "created_at": "2025-01-01T10:00:00"}, strict=False)
+
+        assert expense.amount == 0.0
+        assert expense.id == "exp_1"
+
+    def test_from_dict_strict_by_default(self):
+        """Test that from_dict still validates unless told otherwise."""
+        with pytest.raises(ValueError, match="Amount must be greater than zero"):
+            Expense.from_dict({"amount": -5, "category": "Food", "description": "Test"})
+
+    def test_from_dicts_shares_one_clock_reading(self):
+        """Test that the bulk constructor reads the clock once for missing fields."""
+        records = [{"amount": 10 + i, "category": "Food", "description": "Test"} for i in range(3)]
+
+        with patch("src.models.expense.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 3, 4, 5, 6, 7)
+            expenses = Expense.from_dicts(records)
+
+        assert mock_datetime.now.call_count == 1
+        assert [e.date for e in expenses] == ["2025-03-04"] * 3
+        assert len({e.id for e in expenses}) == 3
+
+    def test_from_dicts_strict(self):
+        """Test that strict bulk loading rejects invalid records."""
+        with pytest.raises(ValueError):
+            Expense.from_dicts([{"amount": 0, "category": "Food", "description": "Test"}], strict=True)
+
+    def test_to_dict_cents(self):
+        """Test serializing the amount as integer cents."""
+        expense = Expense(19.99, "Food", "Test", expense_id="exp_1")
+
+        data = expense.to_dict(cents=True)
+
+        assert data["amount_cents"] == 1999
+        assert "amount" not in data
+        assert expense.amount_cents == 1999
+
+    def test_from_dict_reads_cents(self):
+        """Test that integer-cents dictionaries load in both modes."""
+        data = {"amount_cents": 1999, "category": "Food", "description": "Test"}
+
+        assert Expense.from_dict(data).amount == 19.99
+        assert Expense.from_dict(data, strict=False).amount == 19.99
@@ -0,0 +1,94 @@
+import pytest
+from src.models.expense import Expense
+from src.models.expense_batch import ExpenseBatch
+
+
+@pytest.fixture
+def expenses():
+    """Create a few expenses spread over two categories."""
+    return [
+        Expense(50, "Food", "Lunch", date="2025-01-10", expense_id="exp_1",
+                created_at="2025-01-10T12:00:00"),
+        Expense(20, "Transport", "Bus", date="2025-01-11", expense_id="exp_2",
+                created_at="2025-01-11T08:00:00"),
+        Expense(15.5, "Food", "Snack", date="2025-01-11", expense_id="exp_3",
+                created_at="2025-01-11T16:00:00"),
+    ]
+
+
+class TestExpenseBatch:
+    def test_from_expenses_round_trip(self, expenses):
+        """Test that rows convert back to equal expenses."""
+        batch = ExpenseBatch.from_expenses(expenses)
+
+        assert len(batch) == 3
+        assert [e.to_dict() for e in batch.to_expenses()] == [e.to_dict() for e in expenses]
+
+    def test_row_view(self, expenses):
+        """Test that a row exposes the Expense attributes and display format."""
+        batch = ExpenseBatch.from_expenses(expenses)
+        row = batch[-1]
+
+        assert row.id == "exp_3"
+        assert row.amount == 15.5
+        assert row.category == "Food"
+        assert row.date == "2025-01-11"
+        assert str(row) == str(expenses[2])
+
+    def test_index_out_of_range(self, expenses):
+        """Test that indexing past the end raises IndexError."""
+        batch = ExpenseBatch.from_expenses(expenses)
+
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_categories_and_dates_are_interned(self, expenses):
+        """Test that repeated categories share one code and dates one string."""
+        batch = ExpenseBatch.from_expenses(expenses)
+
+        assert batch.categories == ["Food", "Transport"]
+        assert list(batch.category_codes) == [0, 1, 0]
+        assert batch.dates[1] is batch.dates[2]
+
+    def test_totals(self, expenses):
+        """Test grand and per-category totals."""
+        batch = ExpenseBatch.from_expenses(expenses)
+
+        assert batch.total() == 85.5
+        assert batch.category_totals() == {"Food": (2, 65.5), "Transport": (1, 20.0)}
+
+    def test_from_dicts_applies_defaults(self):
+        """Test that dictionaries without optional fields get defaults."""
+        batch = ExpenseBatch.from_dicts([{"amount": 10, "category": "Food", "description": "Tea"}])
+
+        row = batch[0]
+        assert row.id.startswith("exp_")
+        assert row.date is not None
+        assert row.created_at is not None
+
+    def test_from_dicts_rejects_invalid(self):
+        """Test that invalid dictionaries raise like Expense.from_dict."""
+        with pytest.raises(ValueError, match="Amount must be greater than zero"):
+            ExpenseBatch.from_dicts([{"amount": 0, "category": "Food", "description": "Tea"}])
+        with pytest.raises(KeyError):
+            ExpenseBatch.from_dicts([{"amount": 5, "description": "Tea"}])
+
+    def test_cents_mode(self, expenses):
+        """Test that cents batches keep int64 cents and total exactly."""
+        batch = ExpenseBatch.from_expenses(expenses + [Expense(0.1, "Food", "Gum")] * 10, cents=True)
+
+        assert batch.amounts.typecode == 'q'
+        assert batch.total_cents() == 8650
+        assert batch.total() == 86.5
+        assert batch.category_totals()["Food"] == (12, 66.5)
+        assert batch[0].amount == 50.0
+        assert batch[0].amount_cents == 5000
+
+    def test_cents_mode_from_dicts(self):
+        """Test that either amount format fills a cents batch."""
+        batch = ExpenseBatch.from_dicts([
+            {"amount_cents": 1999, "category": "Food", "description": "A"},
+            {"amount": 0.01, "category": "Food", "description": "B"},
+        ], cents=True)
+
+        assert list(batch.amounts) == [1999, 1]
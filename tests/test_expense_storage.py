@@ -1,8 +1,10 @@
 import pytest
 import json
+import os
 import tempfile
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 from src.models.expense import Expense
 from src.storage.expense_storage import ExpenseStorage
 
@@ -166,3 +168,783 @@ class TestExpenseStorage:
         assert len(expenses) == 1
         assert expenses[0].id == "exp_persist"
         assert expenses[0].amount == 100.0
+
+    def test_delete_uses_index_without_parsing_other_files(self, storage, temp_dir):
+        """Test that delete locates the file through the ID index."""
+        for i in range(5):
+            storage.save_expense(Expense(10 + i, "Food", "Meal", expense_id=f"exp_{i}"))
+
+        with patch('src.storage.expense_storage.json.load', wraps=json.load) as mock_load:
+            result = storage.delete_expense("exp_3")
+
+        assert result is True
+        # Only the deleted file is read, to take it out of the category aggregates.
+        assert mock_load.call_count == 1
+        assert mock_load.call_args[0][0].name.endswith("exp_3.json")
+        assert not (Path(temp_dir) / "exp_3.json").exists()
+        assert len(storage.get_all_expense_files()) == 4
+
+    def test_index_persists_across_instances(self, temp_dir):
+        """Test that the ID index is reused by a new storage instance."""
+        storage1 = ExpenseStorage(temp_dir)
+        storage1.save_expense(Expense(20, "Food", "Lunch", expense_id="exp_a"))
+        storage1.save_expense(Expense(30, "Food", "Dinner", expense_id="exp_b"))
+        storage1.delete_expense("exp_a")
+
+        storage2 = ExpenseStorage(temp_dir)
+        index = storage2.load_index()
+
+        assert index.get("exp_a") is None
+        assert index.get("exp_b") == "exp_b.json"
+
+    def test_index_rebuilds_when_stale(self, storage, temp_dir):
+        """Test that delete finds files written outside the index."""
+        storage.save_expense(Expense(20, "Food", "Lunch", expense_id="exp_known"))
+
+        with open(Path(temp_dir) / "exp_external.json", 'w') as f:
+            json.dump(Expense(15, "Food", "Snack", expense_id="exp_external").to_dict(), f)
+        (Path(temp_dir) / "exp_known.json").unlink()
+
+        assert storage.delete_expense("exp_external") is True
+        assert storage.delete_expense("exp_known") is False
+        assert storage.get_all_expense_files() == []
+
+    def test_delete_unknown_id_does_not_rebuild_index(self, storage):
+        """Test that a missing ID is answered without scanning every file."""
+        storage.save_expense(Expense(20, "Food", "Lunch", expense_id="exp_known"))
+
+        with patch.object(ExpenseStorage, 'rebuild_index') as mock_rebuild:
+            assert storage.delete_expense("exp_typo") is False
+            assert ExpenseStorage(storage.data_dir).delete_expense("exp_typo") is False
+
+        mock_rebuild.assert_not_called()
+
+    def test_sharded_delete_finds_file_written_outside_index(self, temp_dir):
+        """Test that a file added to a shard behind the index is still deleted."""
+        sharded = ExpenseStorage(temp_dir, layout="sharded")
+        sharded.save_expense(Expense(20, "Food", "Lunch", date="2025-01-10", expense_id="exp_known"))
+        ExpenseStorage(temp_dir, layout="sharded").save_expense(
+            Expense(15, "Food", "Snack", date="2025-02-11", expense_id="exp_external"))
+
+        assert sharded.delete_expense("exp_external") is True
+        assert sharded.delete_expense("exp_missing") is False
+        assert [path.name for path in sharded.get_all_expense_files()] == ["exp_known.json"]
+
+    def test_corrupted_index_is_rebuilt(self, storage, temp_dir):
+        """Test that an unreadable index file is rebuilt from the data files."""
+        storage.save_expense(Expense(20, "Food", "Lunch", expense_id="exp_keep"))
+        with open(Path(temp_dir) / ExpenseStorage.INDEX_FILENAME, 'w') as f:
+            f.write("{not json")
+
+        fresh = ExpenseStorage(temp_dir)
+
+        assert fresh.delete_expense("exp_keep") is True
+
+    def test_load_cache_reuses_unchanged_files(self, storage):
+        """Test that a repeat load does not re-parse unchanged files."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+        first = storage.load_all_expenses()
+
+        with patch('src.storage.expense_storage.json.load') as mock_load:
+            second = storage.load_all_expenses()
+
+        mock_load.assert_not_called()
+        assert sorted(e.id for e in second) == sorted(e.id for e in first)
+
+    def test_load_cache_picks_up_changes(self, storage, temp_dir):
+        """Test that new, changed and removed files are reflected."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+        storage.load_all_expenses()
+
+        with open(Path(temp_dir) / "exp_1.json", 'w') as f:
+            json.dump(Expense(99.5, "Food", "Changed", expense_id="exp_1").to_dict(), f)
+        (Path(temp_dir) / "exp_2.json").unlink()
+        storage.save_expense(Expense(10, "Food", "Snack", expense_id="exp_3"))
+
+        expenses = {e.id: e for e in storage.load_all_expenses()}
+
+        assert sorted(expenses) == ["exp_1", "exp_3"]
+        assert expenses["exp_1"].amount == 99.5
+
+    def test_load_cache_keeps_warning_for_corrupted_file(self, storage, temp_dir):
+        """Test that a cached corrupted file still produces a warning."""
+        with open(Path(temp_dir) / "exp_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+        storage.load_all_expenses()
+
+        with patch('builtins.print') as mock_print:
+            assert storage.load_all_expenses() == []
+
+        assert "exp_corrupted.json" in str(mock_print.call_args)
+
+    @pytest.mark.parametrize("process_pool_threshold", [None, 1])
+    def test_parallel_load_matches_sequential(self, temp_dir, process_pool_threshold):
+        """Test that pooled loading returns the same ordered result and warnings."""
+        sequential = ExpenseStorage(temp_dir)
+        for i in range(7):
+            sequential.save_expense(Expense(10 + i, "Food", "Meal", expense_id=f"exp_{i}"))
+        with open(Path(temp_dir) / "exp_3_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+
+        parallel = ExpenseStorage(temp_dir, load_workers=3, load_chunk_size=2,
+                                  process_pool_threshold=process_pool_threshold)
+
+        with patch('builtins.print') as sequential_print:
+            expected = [e.to_dict() for e in sequential.load_all_expenses()]
+        with patch('builtins.print') as parallel_print:
+            actual = [e.to_dict() for e in parallel.load_all_expenses()]
+
+        assert actual == expected
+        assert [e["id"] for e in actual] == [f"exp_{i}" for i in range(7)]
+        assert parallel_print.call_args_list == sequential_print.call_args_list
+        assert "exp_3_corrupted.json" in str(parallel_print.call_args)
+
+    def test_iter_expenses_is_lazy_and_filters(self, storage):
+        """Test that iter_expenses yields only matching expenses."""
+        storage.save_expense(Expense(50, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(5, "Food", "Gum", date="2025-01-11", expense_id="exp_2"))
+        storage.save_expense(Expense(80, "Food", "Dinner", date="2025-02-01", expense_id="exp_3"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", date="2025-01-12", expense_id="exp_4"))
+
+        result = storage.iter_expenses(category="Food", start_date="2025-01-01",
+                                       end_date="2025-01-31", min_amount=10)
+
+        assert not isinstance(result, list)
+        assert [e.id for e in result] == ["exp_1"]
+
+    def test_iter_expenses_skips_files_by_id_timestamp(self, storage, temp_dir):
+        """Test that created_at bounds skip files without opening them."""
+        storage.save_expense(Expense(20, "Food", "New", expense_id="exp_20250301_120000_aaaaaa",
+                                     created_at="2025-03-01T12:00:00.100000"))
+        with open(Path(temp_dir) / "exp_20240101_090000_zzzzzz.json", 'w') as f:
+            f.write("{invalid json")
+
+        with patch('builtins.print') as mock_print:
+            expenses = list(storage.iter_expenses(created_from="2025-01-01T00:00:00"))
+
+        mock_print.assert_not_called()
+        assert [e.id for e in expenses] == ["exp_20250301_120000_aaaaaa"]
+
+    def test_iter_expenses_warns_on_corrupted_file(self, storage, temp_dir):
+        """Test that iter_expenses keeps the per-file warning."""
+        with open(Path(temp_dir) / "exp_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+
+        with patch('builtins.print') as mock_print:
+            assert list(storage.iter_expenses()) == []
+
+        assert "exp_corrupted.json" in str(mock_print.call_args)
+
+    def test_save_expense_leaves_no_temp_files(self, storage, temp_dir):
+        """Test that save_expense writes through a temp file and renames it."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+
+        assert sorted(p.name for p in Path(temp_dir).iterdir() if p.suffix != '.jsonl') == [
+            ExpenseStorage.AGGREGATES_FILENAME, ExpenseStorage.LOCK_FILENAME,
+            ExpenseStorage.ROLLUPS_FILENAME, "exp_1.json"
+        ]
+
+    def test_save_expenses_repeated_id_last_wins(self, storage, temp_dir):
+        """Test that a batch saving one ID twice writes and counts only the last expense."""
+        result = storage.save_expenses([Expense(10, "Food", "Lunch", expense_id="exp_1"),
+                                        Expense(25, "Food", "Dinner", expense_id="exp_1")])
+
+        assert result.saved == ["exp_1"]
+        assert result.failed == []
+        assert [e.amount for e in storage.load_all_expenses()] == [25]
+        assert storage.get_category_summary()["Food"]["total"] == 25.0
+        assert storage.verify_aggregates() == []
+        assert not list(Path(temp_dir).glob(".*.tmp"))
+
+    def test_rewritten_files_keep_shared_permissions(self, storage, temp_dir):
+        """Test that journals rewritten through mkstemp are not made owner-only."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.rebuild_index()
+        storage.rebuild_search_index()
+        (Path(temp_dir) / ExpenseStorage.ROLLUPS_FILENAME).chmod(0o640)
+        storage.save_expense(Expense(60, "Food", "Dinner", expense_id="exp_2"))
+
+        def mode(name):
+            return (Path(temp_dir) / name).stat().st_mode & 0o777
+
+        for name in (ExpenseStorage.AGGREGATES_FILENAME, ExpenseStorage.INDEX_FILENAME,
+                     ExpenseStorage.SEARCH_INDEX_FILENAME):
+            assert mode(name) == mode("exp_1.json")
+        assert mode(ExpenseStorage.ROLLUPS_FILENAME) == 0o640
+
+    def test_save_expenses_bulk(self, storage, temp_dir):
+        """Test saving a batch with grouped fsyncs and per-record failures."""
+        expenses = [Expense(10 + i, "Food", "Meal", expense_id=f"exp_{i}") for i in range(5)]
+        expenses.insert(2, Expense(10, "Food", object(), expense_id="exp_bad"))
+
+        with patch('src.storage.expense_storage.os.fsync', wraps=os.fsync) as mock_fsync:
+            result = storage.save_expenses(expenses, sync_chunk_size=2)
+
+        assert result.saved == [f"exp_{i}" for i in range(5)]
+        assert [expense_id for expense_id, _ in result.failed] == ["exp_bad"]
+        assert not result.ok
+        assert mock_fsync.call_count == 6
+        assert sorted(e.id for e in storage.load_all_expenses()) == result.saved
+        assert not list(Path(temp_dir).glob(".*.tmp"))
+        assert storage.delete_expense("exp_4") is True
+
+    def test_save_expenses_not_durable(self, storage):
+        """Test that durable=False skips every fsync."""
+        expenses = [Expense(10, "Food", "Meal", expense_id=f"exp_{i}") for i in range(3)]
+
+        with patch('src.storage.expense_storage.os.fsync') as mock_fsync:
+            result = storage.save_expenses(expenses, durable=False)
+
+        mock_fsync.assert_not_called()
+        assert result.ok
+        assert len(storage.get_all_expense_files()) == 3
+
+    def test_load_expense_batch(self, storage):
+        """Test that the batch holds the same expenses as load_all_expenses."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Transport", "Bus", expense_id="exp_2"))
+
+        batch = storage.load_expense_batch()
+
+        assert list(batch.ids) == [e.id for e in storage.load_all_expenses()]
+        assert batch.total() == 70.0
+
+    def test_strict_load_rejects_invalid_files(self, temp_dir):
+        """Test that strict storage validates files it did not write."""
+        with open(Path(temp_dir) / "exp_bad.json", 'w') as f:
+            json.dump({"id": "exp_bad", "amount": -5, "category": "Food", "description": "X",
+                       "date": "2025-01-01", "created_at": "2025-01-01T10:00:00"}, f)
+
+        assert [e.id for e in ExpenseStorage(temp_dir).load_all_expenses()] == ["exp_bad"]
+        with patch('builtins.print') as mock_print:
+            assert ExpenseStorage(temp_dir, strict=True).load_all_expenses() == []
+        assert "exp_bad.json" in str(mock_print.call_args)
+
+    def test_cents_storage_reads_float_files(self, temp_dir):
+        """Test that cents mode writes integer cents and still reads float files."""
+        ExpenseStorage(temp_dir).save_expense(Expense(0.1, "Food", "Old", expense_id="exp_1"))
+        storage = ExpenseStorage(temp_dir, cents=True)
+        storage.save_expense(Expense(0.2, "Food", "New", expense_id="exp_2"))
+
+        with open(Path(temp_dir) / "exp_2.json", 'r') as f:
+            assert json.load(f)["amount_cents"] == 20
+        assert sorted(e.amount for e in storage.load_all_expenses()) == [0.1, 0.2]
+        assert storage.load_expense_batch().total_cents() == 30
+
+    def test_load_newest_expenses(self, storage):
+        """Test that the newest expenses are found by ID order."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(5)]
+        for expense in expenses:
+            storage.save_expense(expense)
+
+        newest = storage.load_newest_expenses(2)
+
+        assert [e.id for e in newest] == [expenses[4].id, expenses[3].id]
+
+    def test_load_newest_expenses_reads_only_the_page(self, storage, temp_dir):
+        """Test that a cold call opens only the newest files instead of loading everything."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(5)]
+        for expense in expenses:
+            storage.save_expense(expense)
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+
+        with patch.object(fresh, 'load_all_expenses') as mock_load:
+            with patch('builtins.open', wraps=open) as mock_open:
+                newest = fresh.load_newest_expenses(2)
+
+        mock_load.assert_not_called()
+        assert mock_open.call_count == 2
+        assert [e.id for e in newest] == [expenses[4].id, expenses[3].id]
+
+        fresh.load_ordered_indexes()
+        with patch.object(fresh, '_iter_expense_entries') as mock_scan:
+            assert [e.id for e in fresh.load_newest_expenses(2, offset=1)] == [expenses[3].id, expenses[2].id]
+        mock_scan.assert_not_called()
+
+    def test_load_expenses_by_date_range(self, storage):
+        """Test an inclusive date range, newest date first."""
+        for day in (5, 1, 20, 10):
+            storage.save_expense(Expense(day, "Food", "Meal", date=f"2025-01-{day:02d}", expense_id=f"exp_{day:02d}"))
+
+        expenses = storage.load_expenses_by_date_range("2025-01-05", "2025-01-10")
+
+        assert [e.id for e in expenses] == ["exp_10", "exp_05"]
+
+    def test_ordered_indexes_follow_writes_without_reloading(self, storage):
+        """Test that saves and deletes update the in-memory indexes in place."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.load_expenses_by_date_range()
+
+        with patch.object(storage, 'load_all_expenses') as mock_load:
+            storage.save_expense(Expense(20, "Food", "Dinner", date="2025-01-12", expense_id="exp_2"))
+            storage.save_expense(Expense(30, "Food", "Moved", date="2025-01-01", expense_id="exp_1"))
+            storage.delete_expense("exp_2")
+            storage.save_expense(Expense(40, "Food", "Snack", date="2025-01-05", expense_id="exp_3"))
+
+            by_date = storage.load_expenses_by_date_range()
+            newest = storage.load_newest_expenses(1)
+
+        mock_load.assert_not_called()
+        assert [e.id for e in by_date] == ["exp_3", "exp_1"]
+        assert [e.id for e in newest] == ["exp_3"]
+
+    def test_ordered_indexes_rebuilt_after_outside_change(self, storage, temp_dir):
+        """Test that files added behind the storage's back are picked up."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.load_expenses_by_date_range()
+
+        ExpenseStorage(temp_dir).save_expense(Expense(20, "Food", "Dinner", date="2025-01-12", expense_id="exp_2"))
+
+        assert [e.id for e in storage.load_expenses_by_date_range()] == ["exp_2", "exp_1"]
+
+    def test_load_newest_expenses_offset(self, storage):
+        """Test paging through the newest expenses."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(5)]
+        for expense in expenses:
+            storage.save_expense(expense)
+
+        assert [e.id for e in storage.load_newest_expenses(2, offset=2)] == [expenses[2].id, expenses[1].id]
+        assert [e.id for e in storage.load_newest_expenses(2, offset=4)] == [expenses[0].id]
+
+    def test_load_newest_expenses_skips_corrupted(self, storage, temp_dir):
+        """Test that unreadable newest files do not leave the page short."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(3)]
+        for expense in expenses:
+            storage.save_expense(expense)
+        with open(Path(temp_dir) / "exp_99999999_999999_zzz.json", 'w') as f:
+            f.write("{invalid json")
+
+        with patch('builtins.print'):
+            newest = storage.load_newest_expenses(2)
+
+        assert [e.id for e in newest] == [expenses[2].id, expenses[1].id]
+
+
+class TestShardedLayout:
+    @pytest.fixture
+    def sharded(self, temp_dir):
+        """Create ExpenseStorage instance using the sharded layout."""
+        return ExpenseStorage(temp_dir, layout="sharded")
+
+    def test_save_into_date_shard(self, sharded, temp_dir):
+        """Test that files are placed under YYYY/MM from the expense date."""
+        filepath = sharded.save_expense(Expense(50, "Food", "Lunch", date="2025-03-14", expense_id="exp_1"))
+
+        assert Path(filepath) == Path(temp_dir) / "2025" / "03" / "exp_1.json"
+        assert [e.id for e in sharded.load_all_expenses()] == ["exp_1"]
+
+    def test_shard_falls_back_to_id_timestamp(self, sharded):
+        """Test that the ID timestamp is used when the date is malformed."""
+        expense = Expense(50, "Food", "Lunch", date="someday", expense_id="exp_20240205_101500_abc123")
+
+        assert sharded.get_expense_path(expense) == "2024/02/exp_20240205_101500_abc123.json"
+
+    def test_layout_is_recorded(self, sharded, temp_dir):
+        """Test that reopening the directory keeps the sharded layout."""
+        sharded.save_expense(Expense(50, "Food", "Lunch", date="2025-03-14", expense_id="exp_1"))
+
+        reopened = ExpenseStorage(temp_dir)
+
+        assert reopened.layout == "sharded"
+        assert reopened.delete_expense("exp_1") is True
+        with pytest.raises(ValueError, match="sharded layout"):
+            ExpenseStorage(temp_dir, layout="flat")
+
+    def test_date_change_moves_file(self, sharded, temp_dir):
+        """Test that re-saving with a new date leaves no stale copy behind."""
+        expense = Expense(50, "Food", "Lunch", date="2025-03-14", expense_id="exp_1")
+        sharded.save_expense(expense)
+        expense.date = "2025-04-01"
+        sharded.save_expense(expense)
+
+        files = sharded.get_all_expense_files()
+
+        assert files == [Path(temp_dir) / "2025" / "04" / "exp_1.json"]
+
+    def test_date_range_walks_only_relevant_shards(self, sharded):
+        """Test that iter_expenses prunes shards outside the date range."""
+        sharded.save_expense(Expense(10, "Food", "Jan", date="2025-01-10", expense_id="exp_1"))
+        sharded.save_expense(Expense(20, "Food", "Feb", date="2025-02-10", expense_id="exp_2"))
+        sharded.save_expense(Expense(30, "Food", "Old", date="2024-02-10", expense_id="exp_3"))
+
+        with patch.object(sharded, '_list_digit_dirs', wraps=sharded._list_digit_dirs) as mock_list:
+            expenses = list(sharded.iter_expenses(start_date="2025-02-01", end_date="2025-02-28"))
+
+        assert [e.id for e in expenses] == ["exp_2"]
+        scanned = [Path(call[0][0]).name for call in mock_list.call_args_list]
+        assert "2024" not in scanned
+
+    def test_migrate_to_sharded(self, storage, temp_dir):
+        """Test moving a flat directory into shards."""
+        storage.save_expense(Expense(10, "Food", "Jan", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Food", "Feb", date="2025-02-10", expense_id="exp_2"))
+        with open(Path(temp_dir) / "exp_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+
+        with patch('builtins.print'):
+            moved = storage.migrate_to_sharded()
+
+        assert moved == 2
+        assert storage.layout == "sharded"
+        assert (Path(temp_dir) / "2025" / "02" / "exp_2.json").exists()
+        assert (Path(temp_dir) / "exp_corrupted.json").exists()
+        assert storage.delete_expense("exp_1") is True
+        with patch('builtins.print'):
+            assert [e.id for e in ExpenseStorage(temp_dir).load_all_expenses()] == ["exp_2"]
+
+
+class TestManifest:
+    @pytest.fixture
+    def manifest_storage(self, temp_dir):
+        """Create ExpenseStorage instance served from the manifest."""
+        return ExpenseStorage(temp_dir, use_manifest=True)
+
+    def test_save_and_delete_update_manifest(self, manifest_storage):
+        """Test that saves and deletes keep the manifest current without rebuilds."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+
+        with patch.object(manifest_storage, 'rebuild_manifest') as mock_rebuild:
+            manifest_storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+            manifest_storage.save_expenses([Expense(5, "Food", "Gum", expense_id="exp_3")])
+            manifest_storage.delete_expense("exp_1")
+            expenses = manifest_storage.load_all_expenses()
+
+        mock_rebuild.assert_not_called()
+        assert sorted(e.id for e in expenses) == ["exp_2", "exp_3"]
+        assert sorted(manifest_storage.manifest.records) == ["exp_2", "exp_3"]
+
+    def test_cold_start_reads_manifest_only(self, manifest_storage, temp_dir):
+        """Test that a new instance lists expenses without opening expense files."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        manifest_storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+        with patch.object(fresh, '_load_expense_files') as mock_files:
+            expenses = fresh.load_all_expenses()
+
+        mock_files.assert_not_called()
+        assert sorted(e.id for e in expenses) == ["exp_1", "exp_2"]
+        assert {e.id: e.description for e in expenses}["exp_2"] == "Taxi"
+
+    def test_drift_triggers_rebuild(self, manifest_storage, temp_dir):
+        """Test that files added or removed behind the manifest are picked up."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        manifest_storage.load_all_expenses()
+
+        with open(Path(temp_dir) / "exp_external.json", 'w') as f:
+            json.dump(Expense(15, "Food", "Snack", expense_id="exp_external").to_dict(), f)
+        assert sorted(e.id for e in manifest_storage.load_all_expenses()) == ["exp_1", "exp_external"]
+
+        (Path(temp_dir) / "exp_1.json").unlink()
+        assert [e.id for e in manifest_storage.load_all_expenses()] == ["exp_external"]
+
+    def test_corrupted_manifest_is_rebuilt(self, manifest_storage, temp_dir):
+        """Test that an unreadable manifest is rebuilt from the files."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        with open(Path(temp_dir) / ExpenseStorage.MANIFEST_FILENAME, 'w') as f:
+            f.write("{not json")
+
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+
+        assert [e.id for e in fresh.load_all_expenses()] == ["exp_1"]
+
+    def test_load_expense_batch_from_manifest(self, manifest_storage):
+        """Test that the batch is filled from manifest records without parsing files."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        manifest_storage.load_all_expenses()
+
+        with patch("src.storage.expense_storage._parse_expense_chunk") as mock_parse:
+            batch = manifest_storage.load_expense_batch()
+
+        mock_parse.assert_not_called()
+        assert list(batch.ids) == ["exp_1"]
+
+    def test_append_expense_skips_journal_loads(self, manifest_storage, temp_dir):
+        """Test that appending a new expense on a cold start leaves the journals unread."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        manifest_storage.load_all_expenses()
+
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+        with patch.object(fresh.index, 'load') as mock_index, \
+                patch.object(fresh.manifest, 'load') as mock_manifest:
+            fresh.append_expense(Expense(30, "Food", "Taxi", expense_id="exp_2"))
+
+        mock_index.assert_not_called()
+        mock_manifest.assert_not_called()
+
+        reopened = ExpenseStorage(temp_dir, use_manifest=True)
+        with patch.object(reopened, 'rebuild_manifest') as mock_rebuild:
+            expenses = reopened.load_all_expenses()
+        mock_rebuild.assert_not_called()
+        assert sorted(e.id for e in expenses) == ["exp_1", "exp_2"]
+        assert reopened.load_index().get("exp_2") == "exp_2.json"
+        assert reopened.get_category_summary()["Food"]["count"] == 2
+        assert reopened.verify_aggregates() == []
+
+    def test_append_expense_falls_back_after_drift(self, manifest_storage, temp_dir):
+        """Test that a directory changed behind the manifest is not masked by an append."""
+        manifest_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        with open(Path(temp_dir) / "exp_external.json", 'w') as f:
+            json.dump(Expense(15, "Food", "Snack", expense_id="exp_external").to_dict(), f)
+
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+        with patch.object(fresh, 'save_expense', wraps=fresh.save_expense) as mock_save:
+            fresh.append_expense(Expense(30, "Food", "Taxi", expense_id="exp_2"))
+
+        mock_save.assert_called_once()
+        assert sorted(fresh.manifest.records) == ["exp_1", "exp_2", "exp_external"]
+
+    def test_append_expense_rejects_existing(self, manifest_storage):
+        """Test that an existing expense cannot be appended again."""
+        expense = Expense(50, "Food", "Lunch", expense_id="exp_1")
+        manifest_storage.save_expense(expense)
+
+        with pytest.raises(ValueError, match="already exists"):
+            manifest_storage.append_expense(expense)
+
+
+class TestCategoryAggregates:
+    def test_save_updates_summary(self, storage):
+        """Test that saving expenses keeps per-category totals current."""
+        storage.save_expense(Expense(10.10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expenses([Expense(20.20, "Food", "Dinner", date="2025-01-12", expense_id="exp_2"),
+                               Expense(5, "Transport", "Bus", date="2025-01-11", expense_id="exp_3")])
+
+        summary = storage.get_category_summary()
+
+        assert list(summary) == ["Food", "Transport"]
+        assert summary["Food"] == {"count": 2, "total_cents": 3030, "total": 30.30, "min": 10.10,
+                                   "max": 20.20, "latest_date": "2025-01-12"}
+        assert summary["Transport"]["count"] == 1
+
+    def test_overwrite_moves_expense_between_categories(self, storage):
+        """Test that re-saving an expense replaces its old contribution."""
+        storage.save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(15, "Transport", "Taxi", expense_id="exp_1"))
+
+        summary = storage.get_category_summary()
+
+        assert list(summary) == ["Transport"]
+        assert summary["Transport"]["total"] == 15.0
+
+    def test_delete_extreme_recomputes_category(self, storage):
+        """Test that deleting the maximum marks the category stale and recomputes it."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(50, "Food", "Dinner", date="2025-01-12", expense_id="exp_2"))
+
+        storage.delete_expense("exp_2")
+
+        assert storage.aggregates.stale == {"Food"}
+        summary = storage.get_category_summary()
+        assert summary["Food"] == {"count": 1, "total_cents": 1000, "total": 10.0, "min": 10.0,
+                                   "max": 10.0, "latest_date": "2025-01-10"}
+        assert storage.aggregates.stale == set()
+
+    def test_instances_pick_up_each_others_saves(self, storage, temp_dir):
+        """Test that an instance reloads summaries and indexes another one changed."""
+        other = ExpenseStorage(temp_dir, use_manifest=True)
+        storage.save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+        assert storage.search_expenses("lunch")[0].id == "exp_1"
+        other.save_expense(Expense(20, "Food", "Dinner", expense_id="exp_2"))
+
+        storage.save_expense(Expense(30, "Food", "Brunch", expense_id="exp_3"))
+
+        assert storage.get_category_summary()["Food"]["count"] == 3
+        assert other.get_category_summary()["Food"]["total"] == 60.0
+        assert storage.load_index().get("exp_2") == "exp_2.json"
+        assert [e.id for e in storage.search_expenses("dinner")] == ["exp_2"]
+        assert storage.verify_aggregates() == []
+
+    def test_summary_persists_without_reading_expenses(self, storage, temp_dir):
+        """Test that a new instance answers from the aggregates file alone."""
+        storage.save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+
+        fresh = ExpenseStorage(temp_dir)
+        with patch.object(fresh, '_all_records') as mock_files:
+            summary = fresh.get_category_summary()
+
+        mock_files.assert_not_called()
+        assert summary["Food"]["total"] == 10.0
+
+    def test_verify_detects_and_rebuild_fixes_drift(self, storage, temp_dir):
+        """Test that a hand-edited expense file is reported and repaired."""
+        storage.save_expense(Expense(10, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Transport", "Bus", expense_id="exp_2"))
+        path = Path(temp_dir) / "exp_1.json"
+        data = json.loads(path.read_text())
+        data["amount"] = 99
+        path.write_text(json.dumps(data))
+
+        assert storage.verify_aggregates() == ["Food"]
+
+        storage.rebuild_aggregates()
+
+        assert storage.verify_aggregates() == []
+        assert storage.get_category_summary()["Food"]["total"] == 99.0
+
+    def test_uncountable_amount_is_rejected_before_writing(self, storage, temp_dir):
+        """Test that an amount the aggregates cannot count leaves no file behind."""
+        with pytest.raises(ValueError):
+            storage.save_expense(Expense(float("nan"), "Food", "Bad", expense_id="exp_nan"))
+        result = storage.save_expenses([Expense(float("nan"), "Food", "Bad", expense_id="exp_nan"),
+                                        Expense(10, "Food", "Lunch", expense_id="exp_ok")])
+
+        assert result.saved == ["exp_ok"]
+        assert [expense_id for expense_id, _ in result.failed] == ["exp_nan"]
+        assert not (Path(temp_dir) / "exp_nan.json").exists()
+        assert storage.verify_aggregates() == []
+
+    def test_uncountable_file_is_skipped_with_warning(self, storage, temp_dir):
+        """Test that a hand-written NaN amount does not break summary rebuilds."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        with open(Path(temp_dir) / "exp_nan.json", 'w') as f:
+            f.write('{"id": "exp_nan", "amount": NaN, "category": "Food", "description": "Bad", '
+                    '"date": "2025-01-11", "created_at": "2025-01-11T10:00:00"}')
+        (Path(temp_dir) / ExpenseStorage.AGGREGATES_FILENAME).unlink()
+
+        fresh = ExpenseStorage(temp_dir)
+        with patch('builtins.print') as mock_print:
+            summary = fresh.get_category_summary()
+            assert fresh.verify_aggregates() == []
+            assert fresh.delete_expense("exp_nan") is True
+
+        assert summary["Food"]["count"] == 1
+        assert "exp_nan" in str(mock_print.call_args_list)
+
+    def test_cents_files_are_counted(self, temp_dir):
+        """Test that integer-cents records feed the same totals."""
+        storage = ExpenseStorage(temp_dir, cents=True)
+        storage.save_expense(Expense(0.1, "Food", "Gum", expense_id="exp_1"))
+        storage.save_expense(Expense(0.2, "Food", "Gum", expense_id="exp_2"))
+
+        assert storage.get_category_summary()["Food"]["total"] == 0.3
+
+    def test_budget_status_follows_writes(self, storage, temp_dir):
+        """Test that month-to-date budget spending tracks saves and deletes without a rescan."""
+        storage.set_budget("Food", 100)
+        storage.save_expense(Expense(60, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(50, "Food", "Dinner", date="2025-01-20", expense_id="exp_2"))
+        storage.save_expense(Expense(70, "Food", "Party", date="2025-02-01", expense_id="exp_3"))
+
+        with patch.object(storage, '_all_records') as mock_scan:
+            january = storage.get_budget_status("2025-01")["Food"]
+            storage.delete_expense("exp_2")
+            after_delete = storage.get_budget_status("2025-01")["Food"]
+        mock_scan.assert_not_called()
+
+        assert (january["spent"], january["remaining"], january["over"]) == (110.0, -10.0, True)
+        assert (after_delete["spent"], after_delete["remaining"], after_delete["over"]) == (60.0, 40.0, False)
+        assert ExpenseStorage(temp_dir).get_budgets() == {"Food": 100.0}
+        assert storage.remove_budget("Food") is True
+        assert storage.get_budget_status("2025-01") == {}
+
+    def test_set_budget_keeps_manifest_in_sync(self, temp_dir):
+        """Test that writing the budgets file is not mistaken for drift."""
+        storage = ExpenseStorage(temp_dir, use_manifest=True)
+        storage.save_expense(Expense(60, "Food", "Lunch", expense_id="exp_1"))
+        storage.set_budget("Food", 100)
+
+        fresh = ExpenseStorage(temp_dir, use_manifest=True)
+        with patch.object(fresh, 'rebuild_manifest') as mock_rebuild:
+            fresh.load_all_expenses()
+        mock_rebuild.assert_not_called()
+
+    def test_spending_rollup_follows_writes(self, storage):
+        """Test that month rollups track saves, date changes and deletes."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Food", "Dinner", date="2025-02-10", expense_id="exp_2"))
+        storage.save_expense(Expense(20, "Food", "Dinner", date="2025-03-10", expense_id="exp_2"))
+        storage.delete_expense("exp_1")
+
+        rollup = storage.get_spending_rollup("2025-01-01", "2025-03-31")
+
+        assert list(rollup) == ["2025-03"]
+        assert rollup["2025-03"]["Food"]["total"] == 20.0
+
+    def test_spending_rollup_reads_no_expenses(self, storage, temp_dir):
+        """Test that a new instance answers range queries from the rollups file."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+
+        fresh = ExpenseStorage(temp_dir)
+        with patch.object(fresh, '_all_records') as mock_records:
+            rollup = fresh.get_spending_rollup(granularity="day")
+
+        mock_records.assert_not_called()
+        assert rollup == {"2025-01-10": {"Food": {"count": 1, "total_cents": 1000, "total": 10.0}}}
+
+    def test_verify_detects_rollup_drift(self, storage, temp_dir):
+        """Test that a hand-edited date is reported and repaired."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        path = Path(temp_dir) / "exp_1.json"
+        data = json.loads(path.read_text())
+        data["date"] = "2025-02-10"
+        path.write_text(json.dumps(data))
+
+        assert storage.verify_aggregates() == ["Food"]
+        storage.rebuild_aggregates()
+        assert list(storage.get_spending_rollup()) == ["2025-02"]
+
+
+class TestSearch:
+    def test_search_expenses(self, storage):
+        """Test finding expenses by description and category words."""
+        storage.save_expense(Expense(25, "Transport", "Uber to airport", expense_id="exp_1"))
+        storage.save_expense(Expense(12, "Food", "Uber Eats lunch", expense_id="exp_2"))
+        storage.save_expense(Expense(8, "Food", "Coffee", expense_id="exp_3"))
+
+        assert [e.id for e in storage.search_expenses("uber")] == ["exp_2", "exp_1"]
+        assert [e.id for e in storage.search_expenses("food cof*")] == ["exp_3"]
+        assert [e.id for e in storage.search_expenses("uber", limit=1)] == ["exp_2"]
+
+    def test_search_index_follows_writes(self, storage, temp_dir):
+        """Test that saves and deletes after the first search update the index."""
+        storage.save_expense(Expense(25, "Transport", "Uber to airport", expense_id="exp_1"))
+        storage.search_expenses("uber")
+
+        storage.save_expense(Expense(25, "Transport", "Taxi to airport", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Transport", "Uber home", expense_id="exp_2"))
+        storage.delete_expense("exp_2")
+
+        with patch.object(storage, '_all_records') as mock_records:
+            assert storage.search_expenses("uber") == []
+            assert [e.id for e in storage.search_expenses("taxi")] == ["exp_1"]
+            assert [e.id for e in ExpenseStorage(temp_dir).search_expenses("airport")] == ["exp_1"]
+        mock_records.assert_not_called()
+
+    def test_search_rebuilds_index_from_older_tokenizer(self, storage, temp_dir):
+        """Test that a journal written before non-ASCII tokens is rebuilt on search."""
+        storage.save_expense(Expense(4, "Food", "Café", expense_id="exp_1"))
+        path = Path(temp_dir) / ExpenseStorage.SEARCH_INDEX_FILENAME
+        path.write_text(json.dumps({"id": "exp_1", "tokens": ["caf", "food"]}) + "\n")
+
+        assert [e.id for e in ExpenseStorage(temp_dir).search_expenses("café")] == ["exp_1"]
+
+    def test_search_skips_files_removed_by_hand(self, storage, temp_dir, capsys):
+        """Test that a match whose file is gone is skipped and dropped from the journals."""
+        storage.save_expense(Expense(25, "Transport", "Uber to airport", expense_id="exp_1"))
+        storage.save_expense(Expense(12, "Food", "Uber Eats lunch", expense_id="exp_2"))
+        storage.search_expenses("uber")
+        (Path(temp_dir) / "exp_2.json").unlink()
+
+        assert [e.id for e in ExpenseStorage(temp_dir).search_expenses("uber")] == ["exp_1"]
+        assert "exp_2.json" in capsys.readouterr().err
+
+        fresh = ExpenseStorage(temp_dir)
+        assert fresh.load_index().get("exp_2") is None
+        assert [e.id for e in fresh.search_expenses("uber")] == ["exp_1"]
+        assert capsys.readouterr().err == ""
+
+    def test_rebuild_search_index(self, storage, temp_dir):
+        """Test re-indexing after a file was edited by hand."""
+        storage.save_expense(Expense(25, "Transport", "Uber", expense_id="exp_1"))
+        storage.search_expenses("uber")
+        path = Path(temp_dir) / "exp_1.json"
+        data = json.loads(path.read_text())
+        data["description"] = "Taxi"
+        path.write_text(json.dumps(data))
+
+        storage.rebuild_search_index()
+
+        assert [e.id for e in storage.search_expenses("taxi")] == ["exp_1"]
@@ -0,0 +1,95 @@
+import pytest
+import csv
+import gzip
+import io
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.exports.exporter import export_expenses, main
+from src.models.expense import Expense
+from src.storage.expense_storage import ExpenseStorage
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Create ExpenseStorage with three expenses."""
+    storage = ExpenseStorage(Path(temp_dir) / "data")
+    storage.save_expenses([
+        Expense(12.5, "Food", "Lunch", date="2025-01-02", expense_id="exp_1"),
+        Expense(3, "Transport", "Bus, return", date="2025-01-03", expense_id="exp_2"),
+        Expense(40, "Food", "Groceries", date="2025-02-01", expense_id="exp_3"),
+    ])
+    return storage
+
+
+class TestExportExpenses:
+    def test_export_csv(self, storage, temp_dir):
+        """Test CSV output with a header and quoted fields."""
+        output = Path(temp_dir) / "out.csv"
+
+        result = export_expenses(storage, output)
+
+        with open(output, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert result.rows == 3
+        assert sorted(row["id"] for row in rows) == ["exp_1", "exp_2", "exp_3"]
+        assert {row["id"]: row["description"] for row in rows}["exp_2"] == "Bus, return"
+
+    def test_export_jsonl_gzip_with_filters(self, storage, temp_dir):
+        """Test gzip-compressed JSON lines restricted by category and date."""
+        output = Path(temp_dir) / "food.jsonl.gz"
+
+        result = export_expenses(storage, output, category="Food", end_date="2025-01-31")
+
+        with gzip.open(output, 'rt') as f:
+            records = [json.loads(line) for line in f]
+        assert result.rows == 1
+        assert records[0]["id"] == "exp_1"
+        assert records[0]["amount"] == 12.5
+
+    def test_export_cents_to_stream(self, storage):
+        """Test writing integer cents to an open text stream."""
+        stream = io.StringIO()
+
+        export_expenses(storage, stream, file_format="jsonl", cents=True, category="Transport")
+
+        assert json.loads(stream.getvalue())["amount_cents"] == 300
+
+    def test_failed_export_leaves_no_file(self, storage, temp_dir):
+        """Test that an error mid-export removes the partial output."""
+        output = Path(temp_dir) / "out.csv"
+
+        def broken(**filters):
+            yield Expense(1, "Food", "Ok")
+            raise OSError("read failed")
+
+        with patch.object(storage, "iter_expenses", side_effect=broken):
+            with pytest.raises(OSError):
+                export_expenses(storage, output)
+
+        assert list(Path(temp_dir).glob("*out.csv*")) == []
+
+    def test_unknown_format(self, storage, temp_dir):
+        """Test that unsupported formats raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown export format"):
+            export_expenses(storage, Path(temp_dir) / "out.xml")
+
+    def test_main(self, storage, temp_dir):
+        """Test the command-line entry point."""
+        output = Path(temp_dir) / "out.jsonl"
+
+        with patch('builtins.print') as mock_print:
+            main([str(output), "--data-dir", str(storage.data_dir), "--min-amount", "10"])
+
+        assert len(output.read_text().splitlines()) == 2
+        assert "Exported 2 expenses" in str(mock_print.call_args)
@@ -0,0 +1,74 @@
+import pytest
+import time
+from src.storage.filters import ExpenseFilter
+
+
+@pytest.fixture
+def data():
+    """Create a raw expense dictionary."""
+    return {
+        "id": "exp_20250115_120000_abc123",
+        "amount": 42.0,
+        "category": "Food",
+        "description": "Lunch",
+        "date": "2025-01-15",
+        "created_at": "2025-01-15T12:00:00.500000"
+    }
+
+
+class TestExpenseFilter:
+    def test_empty_filter_matches(self, data):
+        """Test that a filter without bounds matches everything."""
+        assert ExpenseFilter().matches(data)
+        assert ExpenseFilter().may_match_id(data["id"])
+
+    def test_bounds_are_inclusive(self, data):
+        """Test that every bound includes its edge value."""
+        expense_filter = ExpenseFilter(category="Food", start_date="2025-01-15", end_date="2025-01-15",
+                                       min_amount=42.0, max_amount=42.0)
+
+        assert expense_filter.matches(data)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"category": "Transport"},
+        {"start_date": "2025-01-16"},
+        {"end_date": "2025-01-14"},
+        {"min_amount": 50},
+        {"max_amount": 10},
+        {"created_from": "2025-01-16T00:00:00"},
+        {"created_to": "2025-01-15T11:00:00"},
+    ])
+    def test_rejects_out_of_range(self, data, kwargs):
+        """Test that each filter rejects a non-matching expense."""
+        assert not ExpenseFilter(**kwargs).matches(data)
+
+    def test_may_match_id(self, data):
+        """Test pruning by the timestamp embedded in the ID."""
+        assert not ExpenseFilter(created_from="2025-01-16T00:00:00").may_match_id(data["id"])
+        assert not ExpenseFilter(created_to="2025-01-15T11:59:59").may_match_id(data["id"])
+        assert ExpenseFilter(created_from="2025-01-15T12:00:01").may_match_id(data["id"])
+        assert ExpenseFilter(created_from="2030-01-01T00:00:00").may_match_id("exp_custom")
+
+    def test_may_match_id_compares_utc_ids_with_local_bounds(self, monkeypatch):
+        """Test that local created_at bounds keep UTC and older local-time IDs."""
+        monkeypatch.setenv("TZ", "EST5EDT,M3.2.0,M11.1.0")
+        time.tzset()
+        try:
+            expense_filter = ExpenseFilter(created_from="2025-01-15T09:00:00",
+                                           created_to="2025-01-15T09:59:59")
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert expense_filter.may_match_id("exp_20250115_143000_abc123")
+        assert expense_filter.may_match_id("exp_20250115_093000_abc123")
+        assert not expense_filter.may_match_id("exp_20250115_160000_abc123")
+        assert not expense_filter.may_match_id("exp_20250115_073000_abc123")
+
+    def test_matches_cents_format(self, data):
+        """Test that integer-cents dictionaries are filtered by amount."""
+        del data["amount"]
+        data["amount_cents"] = 4200
+
+        assert ExpenseFilter(min_amount=42.0, max_amount=42.0).matches(data)
+        assert not ExpenseFilter(min_amount=42.01).matches(data)
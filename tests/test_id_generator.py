@@ -0,0 +1,111 @@
+import pytest
+import threading
+import time
+from src.models.id_generator import ExpenseIdGenerator, MAX_COUNTER, derive_expense_id
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, now=1766500000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Create a controllable clock."""
+    return FakeClock()
+
+
+class TestExpenseIdGenerator:
+    def test_ids_within_one_millisecond_are_sorted_and_unique(self, clock):
+        """Test that a frozen clock still yields increasing IDs."""
+        generator = ExpenseIdGenerator(clock)
+
+        ids = [generator.generate() for _ in range(1000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 1000
+
+    def test_ids_sort_across_milliseconds(self, clock):
+        """Test that a later millisecond sorts after a busy earlier one."""
+        generator = ExpenseIdGenerator(clock)
+        first = [generator.generate() for _ in range(50)]
+        clock.now += 0.5
+
+        later = generator.generate()
+
+        assert later > max(first)
+        assert later.split('_')[3][:7] == "5000000"
+
+    def test_clock_going_backwards_stays_monotonic(self, clock):
+        """Test that a clock stepping back does not reorder IDs."""
+        generator = ExpenseIdGenerator(clock)
+        before = generator.generate()
+        clock.now -= 5
+
+        assert generator.generate() > before
+
+    def test_counter_overflow_carries_into_next_millisecond(self, clock):
+        """Test that a full counter moves on to the next millisecond."""
+        generator = ExpenseIdGenerator(clock)
+        generator.generate()
+        generator._counter = MAX_COUNTER
+        last = generator.generate()
+
+        assert last.split('_')[3][:7] == "0010000"
+
+    def test_ids_sort_across_daylight_saving_fall_back(self, clock, monkeypatch):
+        """Test that the repeated local hour at the end of DST keeps IDs sorted."""
+        monkeypatch.setenv("TZ", "EST5EDT,M3.2.0,M11.1.0")
+        time.tzset()
+        try:
+            # 2025-11-02 01:30 EDT, then 01:10 EST forty minutes later.
+            clock.now = 1762061400.0
+            generator = ExpenseIdGenerator(clock)
+            first = generator.generate()
+            clock.now += 40 * 60
+            second = generator.generate()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert first.startswith("exp_20251102_053000_")
+        assert second > first
+
+    def test_thread_safety(self, clock):
+        """Test that concurrent callers never receive the same ID."""
+        generator = ExpenseIdGenerator(clock)
+        ids = []
+
+        def worker():
+            ids.extend(generator.generate() for _ in range(500))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(ids)) == 2000
+
+
+class TestDeriveExpenseId:
+    def test_same_inputs_give_same_id(self):
+        """Test that derived IDs are stable and sort by sequence."""
+        ids = [derive_expense_id(1766500000000, row, "statement.csv") for row in range(1, 4)]
+
+        assert ids == [derive_expense_id(1766500000000, row, "statement.csv") for row in range(1, 4)]
+        assert ids == sorted(ids)
+        assert derive_expense_id(1766500000000, 1, "other.csv") != ids[0]
+
+    def test_sequence_carries_into_next_millisecond(self):
+        """Test that a sequence beyond the counter still sorts after the rest."""
+        last = derive_expense_id(1766500000000, MAX_COUNTER, "statement.csv")
+        carried = derive_expense_id(1766500000000, MAX_COUNTER + 1, "statement.csv")
+
+        assert carried > last
+        assert carried.split('_')[3][:7] == "0010000"
@@ -0,0 +1,168 @@
+import pytest
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.imports.importer import StatementImporter, main
+from src.storage.sqlite_storage import SQLiteExpenseStorage
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Create SQLiteExpenseStorage instance with temporary directory."""
+    storage = SQLiteExpenseStorage(Path(temp_dir) / "db")
+    yield storage
+    storage.close()
+
+
+def write_csv(temp_dir, rows, header="date,amount,category,description"):
+    path = Path(temp_dir) / "statement.csv"
+    path.write_text(header + "\n" + "".join(row + "\n" for row in rows))
+    return path
+
+
+class TestStatementImporter:
+    def test_import_csv(self, storage, temp_dir):
+        """Test that valid rows are saved and invalid ones reported by row."""
+        path = write_csv(temp_dir, ["2025-01-02,12.50,food,Lunch",
+                                    "2025-01-03,abc,food,Bad",
+                                    "2025-01-04,3,,Bus"])
+
+        result = StatementImporter(storage, chunk_size=2).import_file(path)
+
+        assert (result.rows_read, result.imported, result.error_count) == (3, 2, 1)
+        assert result.errors == [(2, "amount", "Amount must be a valid number")]
+        assert sorted((e.category, e.amount) for e in storage.load_all_expenses()) == [
+            ("Food", 12.5), ("Uncategorized", 3.0)
+        ]
+
+    def test_debits_negative_and_date_format(self, storage, temp_dir):
+        """Test sign handling and source date conversion."""
+        path = write_csv(temp_dir, ["01/02/2025,-12.50,Food,Lunch", "01/03/2025,500,Food,Salary"])
+
+        result = StatementImporter(storage, date_format="%m/%d/%Y").import_file(
+            path, debits_negative=True)
+
+        assert (result.imported, result.skipped) == (1, 1)
+        expense = storage.load_all_expenses()[0]
+        assert (expense.amount, expense.date) == (12.5, "2025-01-02")
+
+    def test_import_ofx(self, storage, temp_dir):
+        """Test that OFX debits are imported and credits skipped."""
+        path = Path(temp_dir) / "statement.ofx"
+        path.write_text("<OFX><STMTTRN><DTPOSTED>20250101<TRNAMT>-4.20<NAME>Tea</STMTTRN>"
+                        "<STMTTRN><DTPOSTED>20250102<TRNAMT>9.00<NAME>Refund</STMTTRN></OFX>")
+
+        result = StatementImporter(storage, default_category="Bank").import_file(path)
+
+        assert (result.imported, result.skipped) == (1, 1)
+        assert [(e.description, e.category) for e in storage.load_all_expenses()] == [("Tea", "Bank")]
+
+    def test_resume_from_checkpoint(self, storage, temp_dir):
+        """Test that an interrupted import continues after the last checkpoint."""
+        path = write_csv(temp_dir, [f"2025-01-0{i},{i},Food,Row {i}" for i in range(1, 6)])
+        checkpoint = Path(temp_dir) / "import.checkpoint"
+        importer = StatementImporter(storage, chunk_size=2)
+        original = storage.save_expenses
+        calls = []
+
+        def failing_save(expenses):
+            calls.append(len(expenses))
+            if len(calls) == 2:
+                raise OSError("disk full")
+            return original(expenses)
+
+        with patch.object(storage, "save_expenses", side_effect=failing_save):
+            with pytest.raises(OSError):
+                importer.import_file(path, checkpoint_path=checkpoint)
+
+        with open(checkpoint, 'r') as f:
+            assert json.load(f)["rows_read"] == 2
+
+        result = importer.import_file(path, checkpoint_path=checkpoint)
+
+        assert (result.rows_read, result.imported) == (5, 5)
+        assert sorted(e.description for e in storage.load_all_expenses()) == [
+            f"Row {i}" for i in range(1, 6)
+        ]
+        assert not checkpoint.exists()
+
+    def test_replayed_chunk_overwrites_instead_of_duplicating(self, storage, temp_dir):
+        """Test that a crash after a chunk is written but before its checkpoint adds no duplicates."""
+        path = write_csv(temp_dir, [f"2025-01-0{i},{i},Food,Row {i}" for i in range(1, 6)])
+        checkpoint = Path(temp_dir) / "import.checkpoint"
+        importer = StatementImporter(storage, chunk_size=2)
+        original = importer._checkpoint
+        calls = []
+
+        def failing_checkpoint(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise OSError("disk full")
+            return original(*args)
+
+        with patch.object(importer, "_checkpoint", side_effect=failing_checkpoint):
+            with pytest.raises(OSError):
+                importer.import_file(path, checkpoint_path=checkpoint)
+        first_ids = sorted(e.id for e in storage.load_all_expenses())
+        assert len(first_ids) == 4
+
+        result = importer.import_file(path, checkpoint_path=checkpoint)
+
+        assert result.rows_read == 5
+        expenses = storage.load_all_expenses()
+        assert sorted(e.description for e in expenses) == [f"Row {i}" for i in range(1, 6)]
+        assert sorted(e.id for e in expenses)[:4] == first_ids
+
+    def test_checkpoint_for_other_file_is_ignored(self, storage, temp_dir):
+        """Test that a stale checkpoint does not skip rows."""
+        path = write_csv(temp_dir, ["2025-01-01,1,Food,A"])
+        checkpoint = Path(temp_dir) / "import.checkpoint"
+        checkpoint.write_text(json.dumps({"source": ["elsewhere", 0, 0], "offset": 999}))
+
+        with patch('builtins.print') as mock_print:
+            result = StatementImporter(storage).import_file(path, checkpoint_path=checkpoint)
+
+        assert result.imported == 1
+        assert "different file" in str(mock_print.call_args)
+
+    def test_progress_sees_elapsed_time_of_each_chunk(self, storage, temp_dir):
+        """Test that progress is reported after the chunk's time is counted."""
+        path = write_csv(temp_dir, [f"2025-01-0{i},{i},Food,Row {i}" for i in range(1, 6)])
+        reports = []
+        importer = StatementImporter(storage, chunk_size=2,
+                                     progress=lambda result: reports.append((result.rows_read,
+                                                                             result.elapsed)))
+
+        with patch('src.imports.importer.time.perf_counter', side_effect=[0.0, 1.0, 2.0, 3.0, 3.0]):
+            importer.import_file(path)
+
+        assert reports == [(2, 1.0), (4, 2.0), (5, 3.0)]
+
+    def test_unknown_format(self, storage, temp_dir):
+        """Test that unsupported files raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown import format"):
+            StatementImporter(storage).import_file(Path(temp_dir) / "statement.xls")
+
+    def test_main(self, temp_dir):
+        """Test the command-line entry point with a column mapping."""
+        path = write_csv(temp_dir, ["2025-01-02,12.50,Lunch"], header="Posted,Amount,Payee")
+        data_dir = Path(temp_dir) / "data"
+
+        with patch('builtins.print') as mock_print:
+            main([str(path), "--backend", "sqlite", "--data-dir", str(data_dir),
+                  "--map", "date=Posted", "--map", "description=Payee"])
+
+        assert "Imported 1 of 1 rows" in str(mock_print.call_args_list)
+        storage = SQLiteExpenseStorage(data_dir)
+        assert [e.description for e in storage.load_all_expenses()] == ["Lunch"]
+        storage.close()
@@ -0,0 +1,262 @@
+import pytest
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.models.expense import Expense
+from src.storage.log_storage import LogExpenseStorage
+from src.storage.backends import create_storage
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Create LogExpenseStorage instance with synchronous compaction."""
+    storage = LogExpenseStorage(temp_dir, min_compact_records=4, background=False)
+    yield storage
+    storage.close()
+
+
+class TestLogExpenseStorage:
+    def test_save_and_load(self, storage):
+        """Test that saved expenses are returned by load_all_expenses."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+
+        expenses = storage.load_all_expenses()
+
+        assert sorted(e.id for e in expenses) == ["exp_1", "exp_2"]
+
+    def test_save_appends_to_single_segment(self, storage, temp_dir):
+        """Test that saves append lines instead of creating files."""
+        for i in range(3):
+            storage.save_expense(Expense(10, "Food", "Meal", expense_id=f"exp_{i}"))
+
+        segments = storage.get_segment_files()
+
+        assert len(segments) == 1
+        assert not list(Path(temp_dir).glob("exp_*.json"))
+        with open(segments[0]) as f:
+            assert len(f.readlines()) == 3
+
+    def test_delete_expense(self, storage):
+        """Test that deleting writes a tombstone and hides the expense."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+
+        assert storage.delete_expense("exp_1") is True
+        assert storage.delete_expense("exp_1") is False
+        assert storage.load_all_expenses() == []
+
+    def test_delete_nonexistent_expense(self, storage):
+        """Test deleting expense that doesn't exist."""
+        assert storage.delete_expense("nonexistent_id") is False
+
+    def test_overwrite_keeps_latest_record(self, storage):
+        """Test that saving the same ID twice keeps the newest version."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(75, "Food", "Brunch", expense_id="exp_1"))
+
+        expenses = storage.load_all_expenses()
+
+        assert len(expenses) == 1
+        assert expenses[0].amount == 75.0
+
+    def test_compaction_drops_dead_records(self, storage):
+        """Test that crossing the dead-record threshold compacts the log."""
+        for i in range(4):
+            storage.save_expense(Expense(10 + i, "Food", "Meal", expense_id=f"exp_{i}"))
+        storage.delete_expense("exp_0")
+        assert len(storage.get_segment_files()) == 1
+        storage.delete_expense("exp_1")
+
+        segments = storage.get_segment_files()
+        with open(segments[0]) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert len(segments) == 1
+        assert [line["expense"]["id"] for line in lines] == ["exp_2", "exp_3"]
+        assert storage.dead_ratio() == 0.0
+        assert sorted(e.id for e in storage.load_all_expenses()) == ["exp_2", "exp_3"]
+
+    def test_writes_after_compaction(self, storage):
+        """Test that the log keeps working after compaction."""
+        for i in range(4):
+            storage.save_expense(Expense(10, "Food", "Meal", expense_id=f"exp_{i}"))
+        storage.compact()
+        storage.save_expense(Expense(20, "Food", "Snack", expense_id="exp_new"))
+        storage.delete_expense("exp_0")
+
+        ids = sorted(e.id for e in storage.load_all_expenses())
+
+        assert ids == ["exp_1", "exp_2", "exp_3", "exp_new"]
+
+    def test_background_compaction(self, temp_dir):
+        """Test that compaction can run on a background thread."""
+        storage = LogExpenseStorage(temp_dir, min_compact_records=2)
+        storage.save_expense(Expense(10, "Food", "Meal", expense_id="exp_1"))
+        storage.save_expense(Expense(10, "Food", "Meal", expense_id="exp_2"))
+        storage.delete_expense("exp_1")
+        storage.delete_expense("exp_2")
+        storage.close()
+
+        assert storage.load_all_expenses() == []
+        assert storage.dead_ratio() == 0.0
+
+    def test_two_instances_survive_compaction(self, storage, temp_dir):
+        """Test that a writer notices another instance compacted its active segment."""
+        other = LogExpenseStorage(temp_dir, min_compact_records=4, background=False)
+        for i in range(10):
+            storage.save_expense(Expense(10, "Food", "Meal", expense_id=f"e{i}"))
+        other.save_expense(Expense(20, "Food", "Snack", expense_id="from-b-0"))
+        for i in range(8):
+            storage.delete_expense(f"e{i}")
+
+        other.save_expense(Expense(20, "Food", "Snack", expense_id="from-b-1"))
+        assert other.delete_expense("e9")
+        other.close()
+
+        fresh = LogExpenseStorage(temp_dir)
+        assert sorted(e.id for e in fresh.load_all_expenses()) == ["e8", "from-b-0", "from-b-1"]
+        assert sorted(e.id for e in storage.load_all_expenses()) == ["e8", "from-b-0", "from-b-1"]
+
+    def test_corrupted_line_handling(self, storage, temp_dir):
+        """Test that a truncated line is skipped with a warning."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_valid"))
+        storage.close()
+        with open(storage.get_segment_files()[0], 'a') as f:
+            f.write('{"op": "put", "exp')
+
+        expenses = LogExpenseStorage(temp_dir).load_all_expenses()
+
+        assert [e.id for e in expenses] == ["exp_valid"]
+
+    def test_storage_persistence(self, storage, temp_dir):
+        """Test that data persists across storage instances."""
+        storage.save_expense(Expense(100, "Shopping", "Groceries", expense_id="exp_persist"))
+        storage.close()
+
+        reopened = LogExpenseStorage(temp_dir)
+
+        assert reopened.delete_expense("exp_persist") is True
+        assert reopened.load_all_expenses() == []
+
+    def test_load_expense_batch(self, storage):
+        """Test that the batch reflects puts and deletes in the log."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Transport", "Bus", expense_id="exp_2"))
+        storage.delete_expense("exp_1")
+
+        batch = storage.load_expense_batch()
+
+        assert list(batch.ids) == ["exp_2"]
+        assert batch.category_totals() == {"Transport": (1, 20.0)}
+
+    def test_load_newest_expenses(self, storage):
+        """Test that the newest live expenses are returned first."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(3)]
+        for expense in expenses:
+            storage.save_expense(expense)
+        storage.delete_expense(expenses[2].id)
+
+        assert [e.id for e in storage.load_newest_expenses(5)] == [expenses[1].id, expenses[0].id]
+        assert [e.id for e in storage.load_newest_expenses(1, offset=1)] == [expenses[0].id]
+
+    def test_cents_records(self, temp_dir):
+        """Test that cents mode writes integer cents and replays both formats."""
+        LogExpenseStorage(temp_dir, background=False).save_expense(Expense(0.1, "Food", "Old"))
+        storage = LogExpenseStorage(temp_dir, background=False, cents=True)
+        storage.save_expense(Expense(0.2, "Food", "New"))
+        storage.close()
+
+        lines = (Path(temp_dir) / "seg_000001.jsonl").read_text().splitlines()
+        assert json.loads(lines[-1])["expense"]["amount_cents"] == 20
+        assert sorted(e.amount for e in storage.load_all_expenses()) == [0.1, 0.2]
+
+
+class TestCreateStorage:
+    def test_create_log_storage(self, temp_dir):
+        """Test selecting the log backend by name."""
+        assert isinstance(create_storage("log", temp_dir), LogExpenseStorage)
+
+    def test_unknown_backend(self, temp_dir):
+        """Test that an unknown backend name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown storage backend"):
+            create_storage("nope", temp_dir)
+
+
+class TestLogIterExpenses:
+    def test_iter_expenses_filters_live_records(self, storage):
+        """Test that iter_expenses skips deleted and non-matching records."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Snack", expense_id="exp_2"))
+        storage.save_expense(Expense(20, "Transport", "Bus", expense_id="exp_3"))
+        storage.delete_expense("exp_1")
+
+        assert [e.id for e in storage.iter_expenses(category="Food")] == ["exp_2"]
+
+    def test_save_expenses_single_write(self, storage):
+        """Test that a batch is appended and fsynced once."""
+        expenses = [Expense(10, "Food", "Meal", expense_id=f"exp_{i}") for i in range(3)]
+        expenses.append(Expense(10, "Food", object(), expense_id="exp_bad"))
+
+        with patch('src.storage.log_storage.os.fsync') as mock_fsync:
+            result = storage.save_expenses(expenses)
+
+        assert mock_fsync.call_count == 1
+        assert result.saved == ["exp_0", "exp_1", "exp_2"]
+        assert [expense_id for expense_id, _ in result.failed] == ["exp_bad"]
+        assert len(storage.load_all_expenses()) == 3
+
+    def test_get_category_summary(self, storage):
+        """Test per-category statistics computed from the replayed log."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Dinner", date="2025-01-12", expense_id="exp_2"))
+        storage.delete_expense("exp_2")
+
+        summary = storage.get_category_summary()
+
+        assert summary["Food"]["count"] == 1
+        assert summary["Food"]["max"] == 10.0
+
+    def test_get_spending_rollup(self, storage):
+        """Test per-month spending computed from the replayed log."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Dinner", date="2025-02-12", expense_id="exp_2"))
+
+        rollup = storage.get_spending_rollup(start_date="2025-02-01")
+
+        assert list(rollup) == ["2025-02"]
+        assert rollup["2025-02"]["Food"]["total"] == 30.0
+
+    def test_budget_status(self, storage):
+        """Test month-to-date budget spending computed from the replayed log."""
+        storage.set_budget("Food", 50)
+        storage.save_expense(Expense(60, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Dinner", date="2025-02-12", expense_id="exp_2"))
+
+        assert storage.get_budget_status("2025-01")["Food"]["remaining"] == -10.0
+        assert storage.get_budget_status("2025-02")["Food"]["over"] is False
+        assert LogExpenseStorage(storage.data_dir).get_budgets() == {"Food": 50.0}
+
+    def test_load_expenses_by_date_range(self, storage):
+        """Test an inclusive date range, newest date first."""
+        for day in (5, 1, 10):
+            storage.save_expense(Expense(day, "Food", "Meal", date=f"2025-01-{day:02d}", expense_id=f"exp_{day:02d}"))
+
+        assert [e.id for e in storage.load_expenses_by_date_range("2025-01-02")] == ["exp_10", "exp_05"]
+
+    def test_search_expenses(self, storage):
+        """Test word and prefix search over the replayed log."""
+        storage.save_expense(Expense(25, "Transport", "Uber to airport", expense_id="exp_1"))
+        storage.save_expense(Expense(12, "Food", "Uber Eats lunch", expense_id="exp_2"))
+
+        assert [e.id for e in storage.search_expenses("uber")] == ["exp_2", "exp_1"]
+        assert [e.id for e in storage.search_expenses("air* transport", limit=5)] == ["exp_1"]
@@ -7,7 +7,9 @@ from src.ui.menu import ExpenseTrackerMenu
 @pytest.fixture
 def mock_storage():
     """Create a mock storage instance."""
-    return Mock()
+    storage = Mock()
+    storage.get_budget_status.return_value = {}
+    return storage
 
 
 @pytest.fixture
@@ -36,7 +38,10 @@ class TestExpenseTrackerMenu:
                 assert '2. List All Expenses' in output
                 assert '3. View Expenses by Category' in output
                 assert '4. Delete Expense' in output
-                assert '5. Exit' in output
+                assert '5. Spending Report' in output
+                assert '6. Search Expenses' in output
+                assert '7. Budgets' in output
+                assert '8. Exit' in output
 
     def test_get_user_choice(self, menu):
         """Test getting user choice."""
@@ -44,9 +49,15 @@ class TestExpenseTrackerMenu:
             choice = menu.get_user_choice()
             assert choice == '2'
 
+    def test_get_user_choice_prompt_covers_every_option(self, menu):
+        """Test that the prompt offers the same range as the menu."""
+        with patch('builtins.input', return_value='8') as mock_input:
+            menu.get_user_choice()
+        mock_input.assert_called_once_with("\nEnter your choice (1-8): ")
+
     def test_list_expenses_empty(self, menu, mock_storage):
         """Test listing with no expenses."""
-        mock_storage.load_all_expenses.return_value = []
+        mock_storage.load_newest_expenses.return_value = []
 
         with patch('builtins.print') as mock_print:
             menu.list_expenses()
@@ -59,12 +70,16 @@ class TestExpenseTrackerMenu:
         """Test listing with expenses."""
         expense1 = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
         expense2 = Expense(30, "Transport", "Taxi", expense_id="exp_2", created_at="2025-12-21T13:00:00")
-        mock_storage.load_all_expenses.return_value = [expense1, expense2]
+        mock_storage.load_newest_expenses.return_value = [expense2, expense1]
+        mock_storage.get_category_summary.return_value = {
+            "Food": {"count": 1, "total_cents": 5000, "total": 50.0},
+            "Transport": {"count": 1, "total_cents": 3000, "total": 30.0},
+        }
 
         with patch('builtins.print') as mock_print:
             menu.list_expenses()
 
-            mock_storage.load_all_expenses.assert_called_once()
+            mock_storage.load_newest_expenses.assert_called_once_with(21, offset=0)
 
             all_calls = [call[0][0] if call[0] else '' for call in mock_print.call_args_list]
             output = ' '.join([str(item) for item in all_calls])
@@ -73,6 +88,24 @@ class TestExpenseTrackerMenu:
             assert '80' in output or '80.00' in output
             assert mock_print.call_count >= 5
 
+    def test_list_expenses_pages(self, mock_storage):
+        """Test that listing loads one page at a time and moves forward on 'n'."""
+        menu = ExpenseTrackerMenu(mock_storage, page_size=2)
+        expenses = [Expense(10 + i, "Food", f"Meal {i}", expense_id=f"exp_{i}") for i in range(3)]
+        mock_storage.load_newest_expenses.side_effect = [expenses[:3], expenses[2:]]
+        mock_storage.get_category_summary.return_value = {"Food": {"count": 3, "total_cents": 3300, "total": 33.0}}
+
+        with patch('builtins.input', side_effect=['n', '']):
+            with patch('builtins.print') as mock_print:
+                menu.list_expenses()
+
+        assert mock_storage.load_newest_expenses.call_args_list == [call(3, offset=0), call(3, offset=2)]
+        mock_storage.load_ordered_indexes.assert_called_once_with()
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Page 1 of 2' in output
+        assert 'Page 2 of 2' in output
+        assert output.count('Meal 0') == output.count('Meal 1') == output.count('Meal 2') == 1
+
     def test_add_expense_flow(self, menu, mock_storage):
         """Mock user input and verify expense saved."""
         with patch('src.ui.menu.get_valid_input') as mock_input:
@@ -97,12 +130,93 @@ class TestExpenseTrackerMenu:
                 output = ''.join(calls)
                 assert 'Error' in output or 'Invalid' in output
 
+    def test_add_expense_warns_over_budget(self, menu, mock_storage):
+        """Test that an add pushing its category over budget prints a warning."""
+        mock_storage.get_budget_status.return_value = {
+            "Food": {"over": True, "limit": 100.0, "spent": 110.0, "remaining": -10.0}}
+
+        with patch('src.ui.menu.get_valid_input', side_effect=[60, 'Food']):
+            with patch('builtins.input', side_effect=['Dinner', '2025-01-06']):
+                with patch('builtins.print') as mock_print:
+                    menu.add_expense()
+
+        mock_storage.get_budget_status.assert_called_once_with('2025-01')
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Warning: Food is $10.00 over its 2025-01 budget ($110.00 of $100.00)' in output
+
+    def test_add_expense_survives_budget_check_failure(self, menu, mock_storage):
+        """Test that a failed budget lookup is a warning, not an error, after the save."""
+        mock_storage.get_budget_status.side_effect = ValueError("bad month")
+
+        with patch('src.ui.menu.get_valid_input', side_effect=[60, 'Food']):
+            with patch('builtins.input', side_effect=['Dinner', '2025-01-06']):
+                with patch('builtins.print') as mock_print:
+                    menu.add_expense()
+
+        mock_storage.save_expense.assert_called_once()
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'added successfully' in output
+        assert 'Could not check the 2025-01 budget: bad month' in output
+        assert '✗ Error' not in output
+
+    def test_add_expense_shows_remaining_budget(self, menu, mock_storage):
+        """Test that an add within budget shows what is left."""
+        mock_storage.get_budget_status.return_value = {
+            "Food": {"over": False, "limit": 100.0, "spent": 60.0, "remaining": 40.0}}
+
+        with patch('src.ui.menu.get_valid_input', side_effect=[60, 'Food']):
+            with patch('builtins.input', side_effect=['Dinner', '2025-01-06']):
+                with patch('builtins.print') as mock_print:
+                    menu.add_expense()
+
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Budget: $40.00 left of $100.00 for Food in 2025-01' in output
+        assert 'Warning' not in output
+
+    def test_list_expenses_shows_budgets(self, menu, mock_storage):
+        """Test that the list screen ends with this month's budgets."""
+        mock_storage.load_newest_expenses.return_value = [Expense(60, "Food", "Dinner", expense_id="exp_1")]
+        mock_storage.get_category_summary.return_value = {"Food": {"count": 1, "total_cents": 6000}}
+        mock_storage.get_budget_status.return_value = {
+            "Food": {"over": False, "limit": 100.0, "spent": 60.0, "remaining": 40.0},
+            "Fun": {"over": True, "limit": 20.0, "spent": 25.0, "remaining": -5.0}}
+
+        with patch('builtins.print') as mock_print:
+            menu.list_expenses()
+
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Food            | $    60.00 of $   100.00 | $40.00 left' in output
+        assert 'Fun             | $    25.00 of $    20.00 | $5.00 OVER' in output
+
+    def test_manage_budgets(self, menu, mock_storage):
+        """Test setting, removing and rejecting budgets."""
+        mock_storage.remove_budget.return_value = True
+
+        with patch('builtins.input', side_effect=['food', '300', 'Food', '', 'Food', 'abc', '']):
+            with patch('builtins.print') as mock_print:
+                for _ in range(4):
+                    menu.manage_budgets()
+
+        mock_storage.set_budget.assert_called_once_with('Food', 300.0)
+        mock_storage.remove_budget.assert_called_once_with('Food')
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'No budgets set' in output
+        assert 'Budget set: Food $300.00 per month' in output
+        assert 'Budget for Food removed' in output
+        assert 'Error' in output
+
     def test_view_expenses_by_category(self, menu, mock_storage):
         """Test viewing expenses grouped by category."""
         expense1 = Expense(50, "Food", "Lunch", expense_id="exp_1")
         expense2 = Expense(30, "Food", "Dinner", expense_id="exp_2")
         expense3 = Expense(20, "Transport", "Taxi", expense_id="exp_3")
-        mock_storage.load_all_expenses.return_value = [expense1, expense2, expense3]
+        mock_storage.load_expenses_by_date_range.return_value = [expense1, expense2, expense3]
+        mock_storage.get_category_summary.return_value = {
+            "Food": {"count": 2, "total_cents": 8000, "total": 80.0, "min": 30.0, "max": 50.0,
+                     "latest_date": expense1.date},
+            "Transport": {"count": 1, "total_cents": 2000, "total": 20.0, "min": 20.0, "max": 20.0,
+                          "latest_date": expense3.date},
+        }
 
         with patch('builtins.print') as mock_print:
             menu.view_expenses_by_category()
@@ -112,13 +226,136 @@ class TestExpenseTrackerMenu:
 
             assert 'Food' in output
             assert 'Transport' in output
-            assert 'Subtotal' in output
-            assert 'GRAND TOTAL' in output
+            assert 'Subtotal (2 expenses, min $30.00, max $50.00)' in output
+            assert 'GRAND TOTAL: $100.00' in output
+
+    def test_spending_report(self, menu, mock_storage):
+        """Test the report lists each month and the range totals by category."""
+        mock_storage.get_spending_rollup.return_value = {
+            "2025-01": {"Food": {"count": 2, "total_cents": 3000, "total": 30.0},
+                        "Transport": {"count": 1, "total_cents": 500, "total": 5.0}},
+            "2025-02": {"Food": {"count": 1, "total_cents": 1000, "total": 10.0}},
+        }
+
+        with patch('builtins.input', side_effect=['2025-01-01', '2025-03-31', '']):
+            with patch('builtins.print') as mock_print:
+                menu.spending_report()
+
+        mock_storage.get_spending_rollup.assert_called_once_with("2025-01-01", "2025-03-31", "month")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert '2025-02      | Food            | $    10.00 | 1' in output
+        assert '             | Food            | $    40.00 | 3' in output
+        assert 'TOTAL 2025-01-01 to 2025-03-31: $45.00' in output
+
+    def test_spending_report_invalid_granularity(self, menu, mock_storage):
+        """Test that a storage error is reported instead of raised."""
+        mock_storage.get_spending_rollup.side_effect = ValueError("Granularity must be one of: day, month")
+
+        with patch('builtins.input', side_effect=['', '', 'week']):
+            with patch('builtins.print') as mock_print:
+                menu.spending_report()
+
+        assert 'Granularity' in str(mock_print.call_args_list)
+
+    def test_spending_report_empty(self, menu, mock_storage):
+        """Test the report with no expenses in range."""
+        mock_storage.get_spending_rollup.return_value = {}
+
+        with patch('builtins.input', side_effect=['', '', 'day']):
+            with patch('builtins.print') as mock_print:
+                menu.spending_report()
+
+        args = mock_storage.get_spending_rollup.call_args[0]
+        assert args[0] is None and args[2] == "day"
+        assert 'No expenses found' in str(mock_print.call_args_list)
+
+    def test_list_rows_written_in_one_call(self, menu, mock_storage):
+        """Test that a page of rows reaches print() as a single string."""
+        expenses = [Expense(10, "Food", f"Meal {i}", expense_id=f"exp_{i}", date="2025-01-01") for i in range(3)]
+        mock_storage.load_newest_expenses.return_value = expenses
+        mock_storage.get_category_summary.return_value = {"Food": {"count": 3, "total_cents": 3000, "total": 30.0}}
+
+        with patch('builtins.print') as mock_print:
+            menu.list_expenses()
+
+        rows = "\n".join(str(e) for e in expenses)
+        assert call(rows, file=None, flush=False) in mock_print.call_args_list
+
+    def test_search_expenses(self, menu, mock_storage):
+        """Test searching lists the matching expenses."""
+        expense = Expense(25, "Transport", "Uber to airport", expense_id="exp_1", date="2025-01-01")
+        mock_storage.search_expenses.return_value = [expense]
+
+        with patch('builtins.input', return_value='uber'):
+            with patch('builtins.print') as mock_print:
+                menu.search_expenses()
+
+        mock_storage.search_expenses.assert_called_once_with('uber', limit=21)
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Uber to airport' in output
+        assert '1 matching expense(s)' in output
+
+    def test_search_expenses_truncated(self, mock_storage):
+        """Test that only one page of matches is shown."""
+        menu = ExpenseTrackerMenu(mock_storage, page_size=1)
+        mock_storage.search_expenses.return_value = [
+            Expense(10, "Food", f"Lunch {i}", expense_id=f"exp_{i}") for i in range(2)]
+
+        with patch('builtins.input', return_value='lunch'):
+            with patch('builtins.print') as mock_print:
+                menu.search_expenses()
+
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Lunch 0' in output and 'Lunch 1' not in output
+        assert 'Showing the newest 1 matches' in output
+
+    def test_search_expenses_errors(self, menu, mock_storage):
+        """Test empty input, no matches and invalid queries."""
+        mock_storage.search_expenses.side_effect = [[], ValueError("Search query must contain a letter or digit")]
+
+        with patch('builtins.input', side_effect=['', 'nothing', '***']):
+            with patch('builtins.print') as mock_print:
+                menu.search_expenses()
+                menu.search_expenses()
+                menu.search_expenses()
+
+        output = ''.join(str(c) for c in mock_print.call_args_list)
+        assert 'Search cancelled' in output
+        assert 'No matching expenses found' in output
+        assert 'Search query must contain' in output
+
+    def test_cents_mode_totals_are_exact(self, mock_storage):
+        """Test that cents mode adds amounts without float drift."""
+        menu = ExpenseTrackerMenu(mock_storage, cents=True)
+        mock_storage.load_all_expenses.return_value = [
+            Expense(0.1, "Food", f"Gum {i}", expense_id=f"exp_{i}") for i in range(3)
+        ]
+        mock_storage.get_category_summary.return_value = {"Food": {"count": 3, "total_cents": 30, "total": 0.3}}
+        mock_storage.load_newest_expenses.return_value = mock_storage.load_all_expenses()
+
+        assert menu._sum_amounts(mock_storage.load_all_expenses()) == 0.3
+        with patch('builtins.print') as mock_print:
+            menu.list_expenses()
+
+        assert '$     0.30 |' in str(mock_print.call_args_list)
+
+    def test_add_expense_cents_mode(self, mock_storage):
+        """Test that cents mode validates amounts to whole cents."""
+        menu = ExpenseTrackerMenu(mock_storage, cents=True)
+        with patch('src.ui.menu.get_valid_input') as mock_input:
+            with patch('builtins.input', side_effect=['Test lunch', '']):
+                mock_input.side_effect = [5099, 'Food']
+
+                with patch('builtins.print'):
+                    menu.add_expense()
+
+        assert mock_input.call_args_list[0][0][1].__name__ == "validate_amount_cents"
+        assert mock_storage.save_expense.call_args[0][0].amount == 50.99
 
     def test_delete_expense_success(self, menu, mock_storage):
         """Test successful expense deletion."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
         mock_storage.delete_expense.return_value = True
 
         with patch('builtins.input', side_effect=['1', 'y']):
@@ -133,7 +370,7 @@ class TestExpenseTrackerMenu:
     def test_delete_expense_cancelled(self, menu, mock_storage):
         """Test cancelled deletion with 'n' response."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
 
         with patch('builtins.input', side_effect=['1', 'n']):
             with patch('builtins.print') as mock_print:
@@ -147,7 +384,7 @@ class TestExpenseTrackerMenu:
     def test_delete_expense_cancelled_empty_input(self, menu, mock_storage):
         """Test cancelled deletion by pressing Enter."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
 
         with patch('builtins.input', return_value=''):
             with patch('builtins.print') as mock_print:
@@ -160,7 +397,7 @@ class TestExpenseTrackerMenu:
 
     def test_delete_expense_empty_list(self, menu, mock_storage):
         """Test delete when no expenses exist."""
-        mock_storage.load_all_expenses.return_value = []
+        mock_storage.load_newest_expenses.return_value = []
 
         with patch('builtins.print') as mock_print:
             menu.delete_expense()
@@ -172,7 +409,7 @@ class TestExpenseTrackerMenu:
     def test_run_exit(self, menu):
         """Test exiting the menu."""
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', return_value='5'):
+            with patch.object(menu, 'get_user_choice', return_value='8'):
                 with patch('builtins.print') as mock_print:
                     menu.run()
 
@@ -182,15 +419,15 @@ class TestExpenseTrackerMenu:
 
     def test_run_menu_loop(self, menu, mock_storage):
         """Test menu loop with multiple choices."""
-        mock_storage.load_all_expenses.return_value = []
+        mock_storage.load_newest_expenses.return_value = []
 
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', side_effect=['2', '5']):
+            with patch.object(menu, 'get_user_choice', side_effect=['2', '8']):
                 with patch('builtins.input', return_value=''):
                     with patch('builtins.print'):
                         menu.run()
 
-                        assert mock_storage.load_all_expenses.called
+                        assert mock_storage.load_newest_expenses.called
 
     def test_clear_screen(self, menu):
         """Test clear screen functionality."""
@@ -201,7 +438,7 @@ class TestExpenseTrackerMenu:
     def test_run_with_add_expense(self, menu, mock_storage):
         """Test menu loop with add expense choice."""
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', side_effect=['1', '5']):
+            with patch.object(menu, 'get_user_choice', side_effect=['1', '8']):
                 with patch.object(menu, 'add_expense') as mock_add:
                     with patch('builtins.input', return_value=''):
                         with patch('builtins.print'):
@@ -210,28 +447,28 @@ class TestExpenseTrackerMenu:
 
     def test_run_with_view_by_category(self, menu, mock_storage):
         """Test menu loop with view by category choice."""
-        mock_storage.load_all_expenses.return_value = []
+        mock_storage.load_expenses_by_date_range.return_value = []
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', side_effect=['3', '5']):
+            with patch.object(menu, 'get_user_choice', side_effect=['3', '8']):
                 with patch('builtins.input', return_value=''):
                     with patch('builtins.print'):
                         menu.run()
-                        mock_storage.load_all_expenses.assert_called()
+                        mock_storage.load_expenses_by_date_range.assert_called()
 
     def test_run_with_delete_expense(self, menu, mock_storage):
         """Test menu loop with delete expense choice."""
-        mock_storage.load_all_expenses.return_value = []
+        mock_storage.load_newest_expenses.return_value = []
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', side_effect=['4', '5']):
+            with patch.object(menu, 'get_user_choice', side_effect=['4', '8']):
                 with patch('builtins.input', return_value=''):
                     with patch('builtins.print'):
                         menu.run()
-                        mock_storage.load_all_expenses.assert_called()
+                        mock_storage.load_newest_expenses.assert_called()
 
     def test_run_with_invalid_choice(self, menu):
         """Test menu with invalid choice."""
         with patch.object(menu, 'display_menu'):
-            with patch.object(menu, 'get_user_choice', side_effect=['99', '5']):
+            with patch.object(menu, 'get_user_choice', side_effect=['99', '8']):
                 with patch('builtins.print') as mock_print:
                     menu.run()
                     calls = [str(call) for call in mock_print.call_args_list]
@@ -250,7 +487,7 @@ class TestExpenseTrackerMenu:
     def test_delete_expense_invalid_number(self, menu, mock_storage):
         """Test delete with invalid number input."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
 
         with patch('builtins.input', return_value='abc'):
             with patch('builtins.print') as mock_print:
@@ -262,7 +499,7 @@ class TestExpenseTrackerMenu:
     def test_delete_expense_out_of_range(self, menu, mock_storage):
         """Test delete with out of range number."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
 
         with patch('builtins.input', side_effect=['99', '']):
             with patch('builtins.print') as mock_print:
@@ -271,10 +508,23 @@ class TestExpenseTrackerMenu:
                 output = ''.join(calls)
                 assert 'Invalid' in output or 'invalid' in output
 
+    def test_delete_expense_on_second_page(self, mock_storage):
+        """Test that delete numbers refer to rows on the current page."""
+        menu = ExpenseTrackerMenu(mock_storage, page_size=2)
+        expenses = [Expense(10 + i, "Food", f"Meal {i}", expense_id=f"exp_{i}") for i in range(3)]
+        mock_storage.load_newest_expenses.side_effect = [expenses[:3], expenses[2:]]
+        mock_storage.delete_expense.return_value = True
+
+        with patch('builtins.input', side_effect=['n', '1', 'y']):
+            with patch('builtins.print'):
+                menu.delete_expense()
+
+        mock_storage.delete_expense.assert_called_once_with('exp_2')
+
     def test_delete_expense_keyboard_interrupt(self, menu, mock_storage):
         """Test delete with keyboard interrupt."""
         expense = Expense(50, "Food", "Lunch", expense_id="exp_1", created_at="2025-12-21T12:00:00")
-        mock_storage.load_all_expenses.return_value = [expense]
+        mock_storage.load_newest_expenses.return_value = [expense]
 
         with patch('builtins.input', side_effect=KeyboardInterrupt()):
             with patch('builtins.print') as mock_print:
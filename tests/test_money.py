@@ -0,0 +1,39 @@
+import pytest
+from src.models.money import to_cents, from_cents, amount_from_dict
+
+
+class TestMoney:
+    def test_to_cents_is_exact_for_floats(self):
+        """Test that float amounts convert to the cents they print as."""
+        assert to_cents(0.29) == 29
+        assert to_cents(50.99) == 5099
+        assert to_cents(0.1 + 0.2) == 30
+        assert to_cents(100) == 10000
+
+    def test_to_cents_rounds_half_up(self):
+        """Test rounding of sub-cent amounts."""
+        assert to_cents("10.005") == 1001
+        assert to_cents("10.004") == 1000
+
+    def test_to_cents_invalid(self):
+        """Test that non-numbers raise ValueError."""
+        with pytest.raises(ValueError, match="Amount must be a valid number"):
+            to_cents("abc")
+
+    def test_from_cents(self):
+        """Test converting cents back to a float amount."""
+        assert from_cents(5099) == 50.99
+
+    def test_cent_sums_do_not_drift(self):
+        """Test that summing cents is exact where summing floats is not."""
+        amounts = [0.1] * 10
+
+        assert sum(amounts) != 1.0
+        assert from_cents(sum(to_cents(a) for a in amounts)) == 1.0
+
+    def test_amount_from_dict_reads_both_formats(self):
+        """Test reading float and integer-cents dictionaries."""
+        assert amount_from_dict({"amount": 12.5}) == 12.5
+        assert amount_from_dict({"amount_cents": 1250}) == 12.5
+        with pytest.raises(KeyError):
+            amount_from_dict({})
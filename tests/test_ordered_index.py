@@ -0,0 +1,48 @@
+from src.models.expense import Expense
+from src.storage.ordered_index import OrderedIndex
+
+
+def make(expense_id, date):
+    return Expense(10, "Food", "Test", date=date, expense_id=expense_id)
+
+
+class TestOrderedIndex:
+    def test_build_orders_by_value_then_id(self):
+        """Test that ties on the field are broken by ID."""
+        index = OrderedIndex("date")
+        index.build([make("exp_3", "2025-01-02"), make("exp_2", "2025-01-01"), make("exp_1", "2025-01-02")])
+
+        assert list(index) == ["exp_2", "exp_1", "exp_3"]
+        assert len(index) == 3
+
+    def test_range_is_inclusive(self):
+        """Test range bounds include both end values."""
+        index = OrderedIndex("date")
+        index.build([make(f"exp_{day}", f"2025-01-{day:02d}") for day in range(1, 11)])
+
+        assert index.range("2025-01-03", "2025-01-05") == ["exp_3", "exp_4", "exp_5"]
+        assert index.range(high="2025-01-02", reverse=True) == ["exp_2", "exp_1"]
+        assert index.range("2025-02-01") == []
+
+    def test_last_pages_from_the_end(self):
+        """Test newest-first slicing with an offset."""
+        index = OrderedIndex("date")
+        index.build([make(f"exp_{day}", f"2025-01-{day:02d}") for day in range(1, 6)])
+
+        assert index.last(2) == ["exp_5", "exp_4"]
+        assert index.last(2, offset=4) == ["exp_1"]
+        assert index.last(2, offset=9) == []
+
+    def test_add_replaces_and_remove(self):
+        """Test incremental updates keep the order and drop stale entries."""
+        index = OrderedIndex("date")
+        expense = make("exp_1", "2025-01-05")
+        index.build([expense, make("exp_2", "2025-01-03")])
+
+        expense.date = "2025-01-01"
+        index.add(expense)
+
+        assert list(index) == ["exp_1", "exp_2"]
+        assert index.remove("exp_1") is True
+        assert index.remove("exp_1") is False
+        assert list(index) == ["exp_2"]
@@ -0,0 +1,93 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.imports.readers import read_csv, read_ofx
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+SGML_OFX = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX>
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250115120000
+<TRNAMT>-12.50
+<NAME>Coffee Shop
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250116
+<TRNAMT>100.00
+<MEMO>Refund
+</STMTTRN>
+</BANKTRANLIST>
+</OFX>
+"""
+
+
+class TestReadCsv:
+    def test_maps_columns_and_strips_bom(self, temp_dir):
+        """Test header lookup, explicit mapping and a UTF-8 BOM."""
+        path = Path(temp_dir) / "statement.csv"
+        path.write_bytes("\ufeffDate,Amount,Payee\n2025-01-02,12.50,\"Shop, Inc\"\n".encode("utf-8"))
+
+        rows = [row for row, _ in read_csv(path, {"description": "payee"})]
+
+        assert rows == [{"amount": "12.50", "category": None,
+                         "description": "Shop, Inc", "date": "2025-01-02"}]
+
+    def test_resume_from_offset(self, temp_dir):
+        """Test that a yielded offset resumes right after that row."""
+        path = Path(temp_dir) / "statement.csv"
+        path.write_text("amount,category\n1,Food\n2,\"Multi\nline\"\n3,Food\n")
+
+        offsets = [offset for _, offset in read_csv(path)]
+        resumed = [row["amount"] for row, _ in read_csv(path, offset=offsets[0])]
+
+        assert resumed == ["2", "3"]
+        assert offsets[-1] == path.stat().st_size
+
+    def test_unknown_mapping(self, temp_dir):
+        """Test that mapping a missing column or unknown field raises ValueError."""
+        path = Path(temp_dir) / "statement.csv"
+        path.write_text("amount\n1\n")
+
+        with pytest.raises(ValueError, match="not in the CSV header"):
+            list(read_csv(path, {"date": "Posted"}))
+        with pytest.raises(ValueError, match="Unknown expense field"):
+            list(read_csv(path, {"payee": "amount"}))
+
+
+class TestReadOfx:
+    def test_sgml_transactions(self, temp_dir):
+        """Test parsing unclosed SGML leaf tags."""
+        path = Path(temp_dir) / "statement.ofx"
+        path.write_text(SGML_OFX)
+
+        rows = [row for row, _ in read_ofx(path)]
+
+        assert rows == [
+            {"amount": "-12.50", "category": None, "description": "Coffee Shop", "date": "2025-01-15"},
+            {"amount": "100.00", "category": None, "description": "Refund", "date": "2025-01-16"},
+        ]
+
+    def test_single_line_xml_resume(self, temp_dir):
+        """Test resuming between transactions that share one line."""
+        path = Path(temp_dir) / "statement.ofx"
+        path.write_text("<OFX><STMTTRN><DTPOSTED>20250101</DTPOSTED><TRNAMT>-1</TRNAMT></STMTTRN>"
+                        "<STMTTRN><DTPOSTED>20250102</DTPOSTED><TRNAMT>-2</TRNAMT></STMTTRN></OFX>")
+
+        first_offset = next(read_ofx(path))[1]
+        resumed = [row["amount"] for row, _ in read_ofx(path, offset=first_offset)]
+
+        assert resumed == ["-2"]
@@ -0,0 +1,56 @@
+import io
+from unittest.mock import Mock
+from src.models.expense import Expense
+from src.ui.renderer import TableRenderer, render_expenses
+
+
+def make_expenses(count):
+    return [Expense(10 + i, "Food", f"Meal {i}", date="2025-01-01", expense_id=f"exp_{i}")
+            for i in range(count)]
+
+
+class TestTableRenderer:
+    def test_expense_rows_match_str(self):
+        """Test that rows are formatted exactly like Expense.__str__."""
+        expenses = make_expenses(2) + [Expense(5, "VeryLongCategoryName", "Bus", date="2025-01-02")]
+        renderer = TableRenderer()
+
+        assert list(renderer.expense_rows(expenses)) == [str(e) for e in expenses]
+        assert list(renderer.expense_rows(expenses[:1], numbered=True, start=7)) == [f"  7 | {expenses[0]}"]
+
+    def test_category_cells_are_cached(self):
+        """Test that each category is padded once."""
+        renderer = TableRenderer()
+        list(renderer.expense_rows(make_expenses(5)))
+
+        assert renderer._categories == {"Food": "Food           "}
+
+    def test_write_batches(self):
+        """Test that rows are written in one call per batch."""
+        output = Mock()
+        renderer = TableRenderer(output, batch_size=2)
+
+        written = renderer.write(renderer.expense_rows(make_expenses(5)))
+
+        assert written == 5
+        text = "".join(c[0][0] for c in output.write.call_args_list)
+        assert text == "".join(f"{e}\n" for e in make_expenses(5))
+        assert len([c for c in output.write.call_args_list if c[0][0] != "\n"]) == 3
+
+    def test_stream_flushes_and_stops_on_closed_pipe(self):
+        """Test that streaming flushes each batch and ends quietly on a broken pipe."""
+        output = Mock()
+        output.write.side_effect = [None, None, BrokenPipeError()]
+        renderer = TableRenderer(output, batch_size=2, stream=True)
+
+        written = renderer.write(renderer.expense_rows(make_expenses(5)))
+
+        assert written == 2
+        output.flush.assert_called()
+
+    def test_render_expenses(self):
+        """Test the one-call helper."""
+        output = io.StringIO()
+
+        assert render_expenses(make_expenses(3), file=output) == 3
+        assert output.getvalue().count("\n") == 3
@@ -0,0 +1,88 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.storage.rollups import ExpenseRollups, diff_rollups
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def rollups(temp_dir):
+    """Create rollups over a few months of expenses."""
+    rollups = ExpenseRollups(Path(temp_dir) / "rollups.json")
+    rollups.rebuild([
+        {"amount": 10, "category": "Food", "date": "2025-01-05"},
+        {"amount": 20, "category": "Food", "date": "2025-01-20"},
+        {"amount": 5, "category": "Transport", "date": "2025-02-14"},
+        {"amount_cents": 1550, "category": "Food", "date": "2025-03-31"},
+        {"amount": 99, "category": "Food", "date": "2025-04-01"},
+    ])
+    return rollups
+
+
+def totals(result):
+    return {key: {category: entry["total"] for category, entry in bucket.items()}
+            for key, bucket in result.items()}
+
+
+class TestExpenseRollups:
+    def test_month_query(self, rollups):
+        """Test per-month totals over the whole history."""
+        assert totals(rollups.query()) == {
+            "2025-01": {"Food": 30.0},
+            "2025-02": {"Transport": 5.0},
+            "2025-03": {"Food": 15.5},
+            "2025-04": {"Food": 99.0},
+        }
+        assert rollups.query()["2025-01"]["Food"]["count"] == 2
+
+    def test_quarter_uses_whole_months(self, rollups):
+        """Test a quarter range excludes the month after it."""
+        result = rollups.query("2025-01-01", "2025-03-31")
+
+        assert list(result) == ["2025-01", "2025-02", "2025-03"]
+
+    def test_partial_months_use_day_buckets(self, rollups):
+        """Test that months cut by the range only count the days inside it."""
+        assert totals(rollups.query("2025-01-10", "2025-02-10")) == {"2025-01": {"Food": 20.0}}
+
+    def test_day_query(self, rollups):
+        """Test per-day totals in a range."""
+        assert list(rollups.query("2025-01-01", "2025-02-28", granularity="day")) == [
+            "2025-01-05", "2025-01-20", "2025-02-14"]
+
+    def test_invalid_granularity(self, rollups):
+        """Test that unsupported granularities are rejected."""
+        with pytest.raises(ValueError, match="Granularity"):
+            rollups.query(granularity="week")
+
+    def test_remove_drops_empty_buckets(self, rollups):
+        """Test that removing the only expense of a day removes its buckets."""
+        rollups.remove({"amount": 5, "category": "Transport", "date": "2025-02-14"})
+
+        assert "2025-02" not in rollups.query()
+        assert "2025-02-14" not in rollups.days
+
+    def test_save_load_and_diff(self, rollups):
+        """Test that saved rollups load back and diff against a rebuild."""
+        rollups.save()
+        loaded = ExpenseRollups(rollups.path)
+
+        assert loaded.load() is True
+        assert diff_rollups(rollups, loaded) == []
+
+        loaded.add({"amount": 1, "category": "Rent", "date": "2025-01-05"})
+        assert diff_rollups(rollups, loaded) == ["Rent"]
+
+    def test_load_corrupted_file(self, rollups):
+        """Test that an unreadable file asks for a rebuild."""
+        rollups.path.write_text("[]")
+
+        assert ExpenseRollups(rollups.path).load() is False
@@ -0,0 +1,130 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.storage.search_index import SearchIndex, matches, parse_query, tokenize
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def index(temp_dir):
+    """Create a search index over a few expenses."""
+    index = SearchIndex(Path(temp_dir) / "search.jsonl")
+    index.rebuild([
+        {"id": "exp_1", "description": "Uber to airport", "category": "Transport"},
+        {"id": "exp_2", "description": "Lunch with team", "category": "Food"},
+        {"id": "exp_3", "description": "Uber Eats lunch", "category": "Food"},
+    ])
+    return index
+
+
+class TestTokenize:
+    def test_tokenize(self):
+        """Test lowercase alphanumeric tokens without duplicates."""
+        assert tokenize("Uber-Eats: lunch, LUNCH!", "Food") == ["uber", "eats", "lunch", "food"]
+
+    def test_parse_query(self):
+        """Test exact and prefix terms."""
+        assert parse_query("Uber lun*") == [("uber", False), ("lun", True)]
+        with pytest.raises(ValueError, match="letter or digit"):
+            parse_query("  * ")
+
+    def test_tokenize_non_ascii(self):
+        """Test that letters of any script are kept and case-folded."""
+        assert tokenize("Café STRASSE Straße", "東京") == ["café", "strasse", "東京"]
+        assert tokenize("snake_case") == ["snake", "case"]
+        assert parse_query("東京 CAF*") == [("東京", False), ("caf", True)]
+        assert matches(parse_query("café"), "CAFÉ au lait", "Food")
+
+    def test_matches(self):
+        """Test unindexed matching follows the same rules."""
+        assert matches(parse_query("uber lun*"), "Uber Eats lunch", "Food")
+        assert not matches(parse_query("lun"), "Uber Eats lunch", "Food")
+
+
+class TestSearchIndex:
+    def test_exact_and_category_terms(self, index):
+        """Test single-word lookups across description and category."""
+        assert index.search("uber") == ["exp_3", "exp_1"]
+        assert index.search("FOOD") == ["exp_3", "exp_2"]
+        assert index.search("ube") == []
+
+    def test_and_and_prefix(self, index):
+        """Test that every term must match and '*' expands prefixes."""
+        assert index.search("uber lunch") == ["exp_3"]
+        assert index.search("lun* t*") == ["exp_2"]
+        assert index.search("air* food") == []
+
+    def test_limit_keeps_newest(self, index):
+        """Test that a limit returns the newest matches."""
+        assert index.search("food", limit=1) == ["exp_3"]
+
+    def test_incremental_updates_survive_reload(self, index):
+        """Test that puts and removes are journaled and replayed."""
+        index.put_many([{"id": "exp_2", "description": "Dinner", "category": "Food"},
+                        {"id": "exp_4", "description": "Uber home", "category": "Transport"}])
+        index.remove("exp_1")
+
+        assert index.search("uber") == ["exp_4", "exp_3"]
+        assert index.search("lunch") == ["exp_3"]
+
+        reloaded = SearchIndex(index.path)
+        assert reloaded.load() is True
+        assert reloaded.search("uber") == ["exp_4", "exp_3"]
+        assert reloaded.search("din*") == ["exp_2"]
+        assert len(reloaded) == 3
+
+    def test_unloaded_index_only_appends(self, index):
+        """Test that writes through an unloaded index reach the journal."""
+        writer = SearchIndex(index.path)
+        writer.put_many([{"id": "exp_5", "description": "Taxi", "category": "Transport"}])
+
+        reader = SearchIndex(index.path)
+        reader.load()
+        assert reader.search("taxi") == ["exp_5"]
+
+    def test_missing_journal_is_not_created_by_writes(self, temp_dir):
+        """Test that an index that was never built stays absent."""
+        index = SearchIndex(Path(temp_dir) / "search.jsonl")
+        index.put_many([{"id": "exp_1", "description": "Taxi", "category": "Transport"}])
+
+        assert index.exists is False
+        assert index.load() is False
+
+    def test_load_compacts_journal(self, index):
+        """Test that a journal full of overwrites is compacted on load."""
+        for _ in range(5):
+            index.put_many([{"id": "exp_1", "description": "Uber", "category": "Transport"}])
+
+        reloaded = SearchIndex(index.path)
+        reloaded.load()
+
+        assert len(index.path.read_text().splitlines()) == 1 + 3
+
+    def test_non_ascii_terms(self, index):
+        """Test that non-ASCII words are indexed whole."""
+        index.put_many([{"id": "exp_4", "description": "Café in 東京", "category": "Food"}])
+
+        assert index.search("CAFÉ") == ["exp_4"]
+        assert index.search("東京") == ["exp_4"]
+        assert index.search("caf") == []
+
+    def test_journal_from_older_tokenizer_is_rebuilt(self, index):
+        """Test that a journal without the version line asks for a rebuild."""
+        lines = index.path.read_text().splitlines()
+        index.path.write_text("\n".join(lines[1:]) + "\n")
+
+        assert SearchIndex(index.path).load() is False
+
+    def test_corrupted_journal(self, index):
+        """Test that an unreadable journal asks for a rebuild."""
+        index.path.write_text("{not json")
+
+        assert SearchIndex(index.path).load() is False
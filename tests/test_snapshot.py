@@ -0,0 +1,96 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.models.expense import Expense
+from src.storage.expense_storage import ExpenseStorage
+from src.storage.snapshot import ExpenseSnapshot, write_snapshot
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def expenses():
+    """Create a small set of expenses across categories and dates."""
+    return [
+        Expense(50, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"),
+        Expense(30.5, "Food", "Café ☕", date="2025-02-10", expense_id="exp_2"),
+        Expense(20, "Transport", "Taxi", date="2025-01-15", expense_id="exp_3"),
+    ]
+
+
+class TestExpenseSnapshot:
+    def test_round_trip_columns(self, temp_dir, expenses):
+        """Test that every column reads back from the mapped file."""
+        path = Path(temp_dir) / "snap.bin"
+        write_snapshot(expenses, path, source_count=3, source_mtime_ns=42)
+
+        with ExpenseSnapshot(path) as snapshot:
+            assert len(snapshot) == 3
+            assert list(snapshot.amounts) == [50.0, 30.5, 20.0]
+            assert [snapshot.category(i) for i in range(3)] == ["Food", "Food", "Transport"]
+            assert [snapshot.date(i) for i in range(3)] == ["2025-01-10", "2025-02-10", "2025-01-15"]
+            assert snapshot.description(1) == "Café ☕"
+            assert (snapshot.source_count, snapshot.source_mtime_ns) == (3, 42)
+
+    def test_aggregates(self, temp_dir, expenses):
+        """Test totals computed from the packed columns."""
+        path = Path(temp_dir) / "snap.bin"
+        write_snapshot(expenses, path)
+
+        with ExpenseSnapshot(path) as snapshot:
+            assert snapshot.total() == 100.5
+            assert snapshot.category_totals() == {"Food": (2, 80.5), "Transport": (1, 20.0)}
+            assert snapshot.category_totals("2025-01-01", "2025-01-31") == {
+                "Food": (1, 50.0), "Transport": (1, 20.0)
+            }
+
+    def test_empty_snapshot(self, temp_dir):
+        """Test writing and reading a snapshot with no rows."""
+        path = Path(temp_dir) / "snap.bin"
+        write_snapshot([], path)
+
+        with ExpenseSnapshot(path) as snapshot:
+            assert len(snapshot) == 0
+            assert snapshot.category_totals() == {}
+
+    def test_rejects_foreign_file(self, temp_dir):
+        """Test that a file without the snapshot header is refused."""
+        path = Path(temp_dir) / "snap.bin"
+        path.write_bytes(b"not a snapshot at all" * 10)
+
+        with pytest.raises(ValueError):
+            ExpenseSnapshot(path)
+
+
+class TestStorageSnapshot:
+    def test_category_totals_from_snapshot(self, temp_dir, expenses):
+        """Test that storage aggregates come from the snapshot."""
+        storage = ExpenseStorage(temp_dir)
+        storage.save_expenses(expenses)
+
+        assert storage.get_category_totals() == {"Food": (2, 80.5), "Transport": (1, 20.0)}
+        assert storage.snapshot_path.exists()
+        assert storage.snapshot_is_stale() is False
+
+    def test_regenerate_only_when_stale(self, temp_dir, expenses):
+        """Test that the snapshot is rebuilt after files change."""
+        storage = ExpenseStorage(temp_dir)
+        storage.save_expenses(expenses)
+
+        assert storage.regenerate_snapshot() is True
+        assert storage.regenerate_snapshot() is False
+
+        storage.delete_expense("exp_3")
+        assert storage.snapshot_is_stale() is True
+        assert storage.get_category_totals() == {"Food": (2, 80.5)}
+
+        storage.save_expense(Expense(5, "Misc", "Pen", expense_id="exp_4"))
+        assert storage.get_category_totals()["Misc"] == (1, 5.0)
+        assert storage.regenerate_snapshot(force=True) is True
@@ -0,0 +1,251 @@
+import pytest
+import tempfile
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from src.models.expense import Expense
+from src.storage.expense_storage import ExpenseStorage
+from src.storage.sqlite_storage import SQLiteExpenseStorage, import_json_directory
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Create SQLiteExpenseStorage instance with temporary directory."""
+    storage = SQLiteExpenseStorage(temp_dir)
+    yield storage
+    storage.close()
+
+
+class TestSQLiteExpenseStorage:
+    def test_ensure_data_directory(self, temp_dir):
+        """Test that data directory and database are created."""
+        data_dir = Path(temp_dir) / "test_data"
+        storage = SQLiteExpenseStorage(str(data_dir))
+
+        assert data_dir.is_dir()
+        assert storage.db_path.exists()
+        storage.close()
+
+    def test_wal_mode(self, storage):
+        """Test that the database runs in WAL mode."""
+        mode = storage.connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_indexes_created(self, storage):
+        """Test that secondary indexes exist for date, category and created_at."""
+        names = {row[0] for row in storage.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'expenses'"
+        )}
+
+        assert {"idx_expenses_date", "idx_expenses_category", "idx_expenses_created_at"} <= names
+
+    def test_load_all_expenses(self, storage):
+        """Test loading multiple expenses."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+        storage.save_expense(Expense(100, "Entertainment", "Concert", expense_id="exp_3"))
+
+        expense_ids = sorted(e.id for e in storage.load_all_expenses())
+
+        assert expense_ids == ["exp_1", "exp_2", "exp_3"]
+
+    def test_load_empty_directory(self, storage):
+        """Test loading when no expenses exist."""
+        assert storage.load_all_expenses() == []
+
+    def test_delete_expense(self, storage):
+        """Test deleting expense row."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_to_delete"))
+
+        assert storage.delete_expense("exp_to_delete") is True
+        assert storage.load_all_expenses() == []
+
+    def test_delete_nonexistent_expense(self, storage):
+        """Test deleting expense that doesn't exist."""
+        assert storage.delete_expense("nonexistent_id") is False
+
+    def test_storage_persistence(self, storage, temp_dir):
+        """Test that data persists across storage instances."""
+        storage.save_expense(Expense(100, "Shopping", "Groceries", expense_id="exp_persist"))
+
+        other = SQLiteExpenseStorage(temp_dir)
+        expenses = other.load_all_expenses()
+        other.close()
+
+        assert len(expenses) == 1
+        assert expenses[0].id == "exp_persist"
+        assert expenses[0].amount == 100.0
+
+    def test_load_expenses_by_date_range(self, storage):
+        """Test indexed date-range listing."""
+        storage.save_expense(Expense(10, "Food", "Old", date="2025-01-05", expense_id="exp_1"))
+        storage.save_expense(Expense(20, "Food", "Mid", date="2025-02-10", expense_id="exp_2"))
+        storage.save_expense(Expense(30, "Food", "New", date="2025-03-15", expense_id="exp_3"))
+
+        expenses = storage.load_expenses_by_date_range("2025-02-01", "2025-03-31")
+
+        assert [e.id for e in expenses] == ["exp_3", "exp_2"]
+
+    def test_category_queries(self, storage):
+        """Test category listing and grouped totals."""
+        storage.save_expense(Expense(50, "Food", "Lunch", date="2025-01-01", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Dinner", date="2025-01-02", expense_id="exp_2"))
+        storage.save_expense(Expense(20, "Transport", "Taxi", expense_id="exp_3"))
+
+        food = storage.load_expenses_by_category("Food")
+        totals = storage.get_category_totals()
+
+        assert [e.id for e in food] == ["exp_2", "exp_1"]
+        assert totals == {"Food": (2, 80.0), "Transport": (1, 20.0)}
+
+    def test_iter_expenses_filters(self, storage):
+        """Test that iter_expenses pushes filters into the query."""
+        storage.save_expense(Expense(50, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(5, "Food", "Gum", date="2025-01-11", expense_id="exp_2"))
+        storage.save_expense(Expense(30, "Transport", "Taxi", date="2025-01-12", expense_id="exp_3"))
+
+        expenses = storage.iter_expenses(category="Food", min_amount=10, end_date="2025-01-31")
+
+        assert [e.id for e in expenses] == ["exp_1"]
+
+    def test_save_expenses_reports_failures(self, storage):
+        """Test that a bad row is reported while the rest is committed."""
+        expenses = [Expense(10, "Food", "Meal", expense_id=f"exp_{i}") for i in range(2)]
+        expenses.append(Expense(10, "Food", None, expense_id="exp_bad"))
+
+        result = storage.save_expenses(expenses)
+
+        assert result.saved == ["exp_0", "exp_1"]
+        assert [expense_id for expense_id, _ in result.failed] == ["exp_bad"]
+        assert len(storage.load_all_expenses()) == 2
+
+    def test_delete_uses_primary_key(self, storage):
+        """Test that deletes are answered by an index lookup."""
+        plan = storage.connection.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM expenses WHERE id = ?", ("exp_1",)
+        ).fetchall()
+
+        assert any("USING" in row[-1] and "SCAN" not in row[-1] for row in plan)
+
+    def test_load_expense_batch(self, storage):
+        """Test that the batch holds every row in the database."""
+        storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1", date="2025-01-10"))
+        storage.save_expense(Expense(20, "Food", "Snack", expense_id="exp_2", date="2025-01-11"))
+
+        batch = storage.load_expense_batch()
+
+        assert sorted(batch.ids) == ["exp_1", "exp_2"]
+        assert batch.category_totals() == {"Food": (2, 70.0)}
+
+    def test_load_newest_expenses(self, storage):
+        """Test that the newest expenses come from the primary key order."""
+        expenses = [Expense(10 + i, "Food", f"Meal {i}") for i in range(3)]
+        storage.save_expenses(reversed(expenses))
+
+        assert [e.id for e in storage.load_newest_expenses(2)] == [expenses[2].id, expenses[1].id]
+        assert [e.id for e in storage.load_newest_expenses(2, offset=2)] == [expenses[0].id]
+
+
+class TestImportJsonDirectory:
+    def test_import_json_directory(self, storage, temp_dir):
+        """Test importing the per-file JSON layout into SQLite."""
+        source = Path(temp_dir) / "json"
+        json_storage = ExpenseStorage(str(source))
+        json_storage.save_expense(Expense(50, "Food", "Lunch", expense_id="exp_1"))
+        json_storage.save_expense(Expense(30, "Transport", "Taxi", expense_id="exp_2"))
+        with open(source / "exp_corrupted.json", 'w') as f:
+            f.write("{invalid json")
+        with open(source / "exp_list.json", 'w') as f:
+            f.write("[50, \"Food\"]")
+
+        count = import_json_directory(storage, str(source))
+
+        assert count == 2
+        assert sorted(e.id for e in storage.load_all_expenses()) == ["exp_1", "exp_2"]
+
+    def test_import_sharded_json_directory(self, storage, temp_dir):
+        """Test that expenses in YYYY/MM shards are imported too."""
+        source = Path(temp_dir) / "json"
+        json_storage = ExpenseStorage(str(source), layout="sharded")
+        json_storage.save_expense(Expense(50, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        json_storage.save_expense(Expense(30, "Transport", "Taxi", date="2025-02-11", expense_id="exp_2"))
+
+        count = import_json_directory(storage, str(source))
+
+        assert count == 2
+        assert sorted(e.id for e in storage.load_all_expenses()) == ["exp_1", "exp_2"]
+
+    def test_import_leaves_json_backend_unloaded(self):
+        """Test that the SQLite backend loads without the JSON backend module."""
+        code = ("import sys; import src.storage.sqlite_storage; "
+                "print('src.storage.expense_storage' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent.parent)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+    def test_get_category_summary(self, storage):
+        """Test per-category statistics from one grouped query."""
+        storage.save_expense(Expense(0.1, "Food", "Gum", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(0.2, "Food", "Gum", date="2025-01-12", expense_id="exp_2"))
+
+        assert storage.get_category_summary() == {
+            "Food": {"count": 2, "total_cents": 30, "total": 0.3, "min": 0.1, "max": 0.2,
+                     "latest_date": "2025-01-12"},
+        }
+
+    def test_get_spending_rollup(self, storage):
+        """Test per-month spending from one grouped query."""
+        storage.save_expense(Expense(10, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(0.5, "Food", "Gum", date="2025-01-20", expense_id="exp_2"))
+        storage.save_expense(Expense(5, "Transport", "Bus", date="2025-04-01", expense_id="exp_3"))
+
+        assert storage.get_spending_rollup("2025-01-01", "2025-03-31") == {
+            "2025-01": {"Food": {"count": 2, "total_cents": 1050, "total": 10.5}},
+        }
+        assert list(storage.get_spending_rollup(granularity="day")) == [
+            "2025-01-10", "2025-01-20", "2025-04-01"]
+
+    def test_budget_status(self, storage):
+        """Test budgets stored in their own table and joined with one month's rows."""
+        storage.set_budget("Food", 50)
+        storage.set_budget("Bills", 80)
+        storage.save_expense(Expense(60, "Food", "Lunch", date="2025-01-10", expense_id="exp_1"))
+        storage.save_expense(Expense(30, "Food", "Dinner", date="2025-02-12", expense_id="exp_2"))
+
+        status = storage.get_budget_status("2025-01")
+
+        assert list(status) == ["Bills", "Food"]
+        assert status["Food"]["remaining"] == -10.0 and status["Food"]["over"] is True
+        assert status["Bills"]["spent"] == 0.0
+        assert storage.remove_budget("Bills") is True
+        assert storage.get_budgets() == {"Food": 50.0}
+
+    def test_search_expenses(self, storage):
+        """Test that LIKE candidates are narrowed to whole-word matches."""
+        storage.save_expense(Expense(25, "Transport", "Uber to airport", expense_id="exp_1"))
+        storage.save_expense(Expense(12, "Food", "Suber lunch", expense_id="exp_2"))
+        storage.save_expense(Expense(8, "Food", "Uber Eats", expense_id="exp_3"))
+
+        assert [e.id for e in storage.search_expenses("uber")] == ["exp_3", "exp_1"]
+        assert [e.id for e in storage.search_expenses("uber", limit=1)] == ["exp_3"]
+        assert [e.id for e in storage.search_expenses("su* food")] == ["exp_2"]
+
+    def test_search_non_ascii_words(self, storage):
+        """Test that words LIKE cannot case-fold are still matched."""
+        storage.save_expense(Expense(4, "Food", "CAFÉ crème", expense_id="exp_1"))
+        storage.save_expense(Expense(9, "Travel", "Train to 東京", expense_id="exp_2"))
+
+        assert [e.id for e in storage.search_expenses("café")] == ["exp_1"]
+        assert [e.id for e in storage.search_expenses("東京 train")] == ["exp_2"]
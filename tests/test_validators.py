@@ -1,7 +1,9 @@
 import pytest
 from datetime import datetime
 from unittest.mock import patch
-from src.utils.validators import validate_amount, validate_category, validate_date, get_valid_input
+from src.utils.validators import (validate_amount, validate_amount_cents, validate_category,
+                                  validate_date, get_valid_input, validate_amounts,
+                                  validate_categories, validate_dates, validate_expense_rows)
 
 
 class TestValidateAmount:
@@ -35,6 +37,34 @@ class TestValidateAmount:
         with pytest.raises(ValueError, match="Amount must be a valid number"):
             validate_amount("")
 
+    def test_validate_amount_non_finite(self):
+        """Test that NaN and infinity are rejected like in validate_amounts."""
+        for value in ("nan", "inf", "-inf", "1e400"):
+            with pytest.raises(ValueError, match="Amount must be a valid number"):
+                validate_amount(value)
+
+
+class TestValidateAmountCents:
+    def test_validate_amount_cents_valid(self):
+        """Test that amounts convert to exact cents."""
+        assert validate_amount_cents("50.99") == 5099
+        assert validate_amount_cents("100") == 10000
+        assert validate_amount_cents("0.29") == 29
+        assert validate_amount_cents("1.500") == 150
+
+    def test_validate_amount_cents_rejects_fractional_cents(self):
+        """Test that amounts more precise than a cent are rejected."""
+        with pytest.raises(ValueError, match="two decimal places"):
+            validate_amount_cents("1.005")
+
+    def test_validate_amount_cents_invalid(self):
+        """Test invalid, zero and non-finite amounts."""
+        for value in ("abc", "", "nan", "inf"):
+            with pytest.raises(ValueError, match="Amount must be a valid number"):
+                validate_amount_cents(value)
+        with pytest.raises(ValueError, match="Amount must be greater than zero"):
+            validate_amount_cents("0")
+
 
 class TestValidateCategory:
     def test_validate_category_valid(self):
@@ -85,6 +115,13 @@ class TestValidateDate:
         with pytest.raises(ValueError, match="Date must be in YYYY-MM-DD format"):
             validate_date("not a date")
 
+    def test_validate_date_requires_zero_padding(self):
+        """Test that dates must be zero-padded, as stored dates are sliced by position."""
+        for value in ("2025-1-05", "2025-01-5", "2025-1-5"):
+            with pytest.raises(ValueError, match="Date must be in YYYY-MM-DD format"):
+                validate_date(value)
+        assert validate_dates(["2025-1-5"]).errors == [(0, "date", "Date must be in YYYY-MM-DD format")]
+
     def test_validate_date_none(self):
         """Test that None defaults to today."""
         today = datetime.now().strftime("%Y-%m-%d")
@@ -126,3 +163,56 @@ class TestGetValidInput:
             with patch('builtins.print'):
                 result = get_valid_input("Enter category: ", validate_category)
                 assert result == "Food"
+
+
+class TestBatchValidators:
+    def test_validate_amounts_reports_every_bad_row(self):
+        """Test that a column is validated without stopping at the first error."""
+        report = validate_amounts(["10.50", "abc", "0", "nan", "3"])
+
+        assert report.values == [10.5, None, None, None, 3.0]
+        assert report.errors == [
+            (1, "amount", "Amount must be a valid number"),
+            (2, "amount", "Amount must be greater than zero"),
+            (3, "amount", "Amount must be a valid number"),
+        ]
+        assert not report.ok
+
+    def test_validate_amounts_cents(self):
+        """Test validating a column straight to cents."""
+        report = validate_amounts(["0.29", "1.005"], cents=True)
+
+        assert report.values == [29, None]
+        assert report.errors[0][0] == 1
+
+    def test_validate_categories(self):
+        """Test normalization and empty categories."""
+        report = validate_categories([" food ", "FOOD", "", None])
+
+        assert report.values == ["Food", "Food", None, None]
+        assert [error[0] for error in report.errors] == [2, 3]
+
+    def test_validate_dates(self):
+        """Test the compiled pattern, calendar checks and empty defaults."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        report = validate_dates(["2025-02-28", "2025-02-30", "12/25/2025", "", "2025-02-28"])
+
+        assert report.values == ["2025-02-28", None, None, today, "2025-02-28"]
+        assert [error[0] for error in report.errors] == [1, 2]
+        assert report.errors[0][2] == "Date must be in YYYY-MM-DD format"
+
+    def test_validate_expense_rows(self):
+        """Test that rows collect every field error and valid rows are normalized."""
+        rows = [
+            {"amount": "12.5", "category": "food", "description": " Lunch ", "date": "2025-01-02"},
+            {"amount": "-1", "category": "", "date": "2025-13-01"},
+        ]
+
+        report = validate_expense_rows(rows)
+
+        assert report.values[0] == {"amount": 12.5, "category": "Food",
+                                    "description": "Lunch", "date": "2025-01-02"}
+        assert report.values[1] is None
+        assert [(row, field) for row, field, _ in report.errors] == [
+            (1, "amount"), (1, "category"), (1, "date")
+        ]